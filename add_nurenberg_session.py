@@ -5,6 +5,8 @@ Script to add the missing David Nurenberg session to schedule.json
 import json
 import sys
 
+import json_stream
+
 def add_session_to_schedule():
     try:
         # Load the schedule.json file
@@ -48,7 +50,7 @@ def add_session_to_schedule():
         
         # Save the updated schedule.json
         with open('schedule.json', 'w', encoding='utf-8') as f:
-            json.dump(schedule, f, indent=2, ensure_ascii=False)
+            json_stream.dump(schedule, f, ensure_ascii=False)
         
         print("Successfully updated schedule.json")
         return True
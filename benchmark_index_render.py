@@ -0,0 +1,126 @@
+"""
+Benchmark the index.html card rendering of update_index_from_json.py
+
+Tiles the regular sessions of sessions.json up to each requested size and
+times the template renderer (card_renderer.write_cards) against the
+BeautifulSoup version it replaced, which is kept below as render_with_soup().
+Both render into a copy of index.html in a temporary directory. When both
+run, the card markup they produce is compared as well. BeautifulSoup (bs4) is
+only needed for its half of the table.
+
+Usage:
+    python3 benchmark_index_render.py
+    python3 benchmark_index_render.py --sizes 100 1000 10000 --repeat 3
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import card_renderer
+from session_model import load_sessions
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+def make_sessions(regular_sessions, n_sessions):
+    """Tile the regular sessions to n_sessions entries"""
+    repeats = -(-n_sessions // len(regular_sessions))  # ceiling division
+    return (regular_sessions * repeats)[:n_sessions]
+
+def render_with_soup(page_path, sessions):
+    """The BeautifulSoup rendering update_index_from_json.py used before card_renderer"""
+    with open(page_path, 'r', encoding='utf-8') as f:
+        soup = BeautifulSoup(f.read(), 'html.parser')
+    cards_container = soup.find('div', id='sessions-container')
+    cards_container.clear()
+    for session in sessions:
+        card = soup.new_tag('div', attrs={
+            'class': f"session-card {session.get('strand', '')}",
+            'data-strand': session.get('strand', ''),
+            'data-type': session.get('type', '')
+        })
+        title_div = soup.new_tag('div', attrs={'class': 'session-title'})
+        title_div.string = session.get('title', '')
+        card.append(title_div)
+        presenter = session.get('presenter', '')
+        if presenter:
+            presenter_div = soup.new_tag('div', attrs={'class': 'session-presenter'})
+            presenter_div.string = presenter
+            card.append(presenter_div)
+        preview = session.get('preview', '')
+        if preview:
+            preview_div = soup.new_tag('div', attrs={'class': 'session-preview'})
+            preview_div.string = preview
+            card.append(preview_div)
+        time_block = session.get('timeBlock', '')
+        location = session.get('location', '')
+        if time_block and location:
+            time_room_div = soup.new_tag('div', attrs={'class': 'session-time-room'})
+            time_room_div.string = f"{time_block} | {location}"
+            card.append(time_room_div)
+        tags = session.get('tags', [])
+        if tags:
+            tags_div = soup.new_tag('div', attrs={'class': 'session-tags'})
+            for tag in tags:
+                tag_span = soup.new_tag('span', attrs={'class': 'tag'})
+                tag_span.string = tag
+                tags_div.append(tag_span)
+            card.append(tags_div)
+        cards_container.append(card)
+    with open(page_path, 'w', encoding='utf-8') as f:
+        f.write(str(soup))
+
+def soup_cards(page_path):
+    """The card markup inside #sessions-container, as BeautifulSoup writes it"""
+    with open(page_path, 'r', encoding='utf-8') as f:
+        container = BeautifulSoup(f.read(), 'html.parser').find('div', id='sessions-container')
+    return ''.join(str(card) for card in container.find_all('div', class_='session-card', recursive=False))
+
+def best_time(render, page_path, sessions, repeat):
+    """Fastest of repeat runs, each on a fresh copy of index.html"""
+    best = None
+    for _ in range(repeat):
+        shutil.copyfile('index.html', page_path)
+        start = time.perf_counter()
+        render(page_path, sessions)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the index.html card rendering")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000],
+                        help="number of session cards to render for each run")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per size; the fastest is reported")
+    args = parser.parse_args(argv)
+
+    regular_sessions = [s for s in load_sessions('sessions.json') if not s.get('isSpecialEvent', False)]
+    if BeautifulSoup is None:
+        print("Note: bs4 is not installed, so only the template renderer is timed (pip install beautifulsoup4)\n")
+
+    print(f"{'cards':>8}  {'path':<9} {'seconds':>9} {'us/card':>8} {'speedup':>8} {'same cards':>10}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        template_page = os.path.join(tmp_dir, 'template.html')
+        soup_page = os.path.join(tmp_dir, 'soup.html')
+        for n_sessions in args.sizes:
+            sessions = make_sessions(regular_sessions, n_sessions)
+
+            template_time = best_time(card_renderer.write_cards, template_page, sessions, args.repeat)
+            print(f"{n_sessions:>8}  {'template':<9} {template_time:>9.4f} "
+                  f"{template_time / n_sessions * 1e6:>8.1f}")
+
+            if BeautifulSoup is not None:
+                soup_time = best_time(render_with_soup, soup_page, sessions, args.repeat)
+                same = soup_cards(soup_page) == ''.join(card_renderer.render_cards(sessions))
+                print(f"{n_sessions:>8}  {'bs4':<9} {soup_time:>9.4f} {soup_time / n_sessions * 1e6:>8.1f} "
+                      f"{soup_time / template_time:>7.1f}x {'yes' if same else 'NO':>10}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
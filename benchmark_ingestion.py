@@ -0,0 +1,83 @@
+"""
+Benchmark the sessions.csv ingestion paths of generate_master_sessions.py
+
+Builds synthetic exports by tiling the rows of sessions.csv (with fresh
+sessionIDs) up to each requested size, then times the columnar ingestion and,
+for the smaller sizes, the original per-row loop. Prints the time per row so
+the scaling can be read directly: a flat us/row column means linear scaling.
+
+Usage:
+    python3 benchmark_ingestion.py
+    python3 benchmark_ingestion.py --sizes 1000 10000 100000 --rows-limit 10000
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+
+import pandas as pd
+
+import generate_master_sessions as gms
+from text_encoding import read_csv_decoded
+
+def make_export(sessions_csv, n_rows):
+    """Tile sessions.csv to n_rows rows, giving every row a unique sessionID"""
+    repeats = -(-n_rows // len(sessions_csv))  # ceiling division
+    export = pd.concat([sessions_csv] * repeats, ignore_index=True).iloc[:n_rows].copy()
+    export['sessionID'] = range(1, n_rows + 1)
+    return export
+
+def make_schedule(n_rows, rooms=40, scheduled_fraction=0.5):
+    """Schedule roughly half the synthetic sessions, spread over a fixed set of rooms"""
+    session_schedule = {}
+    for session_id in range(1, int(n_rows * scheduled_fraction) + 1):
+        session_schedule[session_id] = [{
+            'location': f"Room {session_id % rooms}",
+            'timeBlock': gms.get_time_for_slot("Slot 1 (10:15-11:15)")
+        }]
+    return session_schedule
+
+def time_build(build, export, session_schedule, tags_col):
+    """Run one ingestion path with its console output suppressed; return seconds"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        sessions_json, _, _ = build(export, session_schedule, tags_col)
+        elapsed = time.perf_counter() - start
+    return elapsed, len(sessions_json)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark generate_master_sessions ingestion")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="number of submission rows to synthesize for each run")
+    parser.add_argument('--rows-limit', type=int, default=10000,
+                        help="largest size to also run through the per-row loop (it is slow)")
+    args = parser.parse_args(argv)
+
+    sessions_csv = read_csv_decoded('sessions.csv', on_bad_lines='warn')
+    with contextlib.redirect_stdout(io.StringIO()):
+        tags_col = gms.find_tags_column(sessions_csv)
+
+    print(f"{'rows':>8}  {'path':<9} {'seconds':>9} {'us/row':>8} {'emitted':>8}")
+    columnar_per_row = []
+    for n_rows in args.sizes:
+        export = make_export(sessions_csv, n_rows)
+        session_schedule = make_schedule(n_rows)
+
+        elapsed, emitted = time_build(gms.build_sessions_columnar, export, session_schedule, tags_col)
+        columnar_per_row.append(elapsed / n_rows)
+        print(f"{n_rows:>8}  {'columnar':<9} {elapsed:>9.3f} {elapsed / n_rows * 1e6:>8.1f} {emitted:>8}")
+
+        if n_rows <= args.rows_limit:
+            elapsed, emitted = time_build(gms.build_sessions_rowwise, export, session_schedule, tags_col)
+            print(f"{n_rows:>8}  {'rows':<9} {elapsed:>9.3f} {elapsed / n_rows * 1e6:>8.1f} {emitted:>8}")
+
+    if len(columnar_per_row) > 1:
+        growth = columnar_per_row[-1] / columnar_per_row[0]
+        print(f"\nColumnar cost per row at {args.sizes[-1]} rows is {growth:.2f}x the cost at "
+              f"{args.sizes[0]} rows (1.0 = perfectly linear)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Room and presenter double-booking detector
+
+Nothing checked that two occurrences in the same room don't overlap, or that
+a presenter isn't in two rooms at once. Repeat sessions, such as the ones held
+in both Slot 1 and Slot 2, make that easy to get wrong in the Excel grid.
+find_conflicts() reads every placement's numeric interval from the
+startMinutes, endMinutes and day the build writes (see time_slots), groups
+the placements by day and room and by day and presenter, and sorts and
+sweeps each group with integer comparisons: placements in start order, with
+the ones still running kept in a heap by end time. That costs O(n log n) plus
+one step per conflict found. Intervals that only touch (one ends at 11:15, the
+next starts at 11:15) do not conflict.
+
+Special events take part in the room check. The presenter check only looks
+at regular sessions, and only reports a presenter booked in two different
+rooms; two overlapping placements in the same room already show up as a room
+conflict.
+
+Usage:
+    python3 booking_conflicts.py [sessions.json]
+"""
+
+import heapq
+import sys
+from collections import defaultdict, namedtuple
+
+from session_model import load_sessions
+from session_repository import person_key, placements, split_presenters
+
+ROOM = 'room'
+PRESENTER = 'presenter'
+
+Booking = namedtuple('Booking', ['day', 'start', 'end', 'session', 'placement'])
+Conflict = namedtuple('Conflict', ['kind', 'key', 'first', 'second'])
+
+def bookings(sessions):
+    """
+    Booking for every placement with start minutes and a location.
+
+    Returns (bookings, unparsed), unparsed being the (session, placement)
+    pairs without startMinutes, i.e. whose time block is not a time range
+    (TBD and the like).
+    """
+    booked, unparsed = [], []
+    for session in sessions:
+        for placement in placements(session):
+            if not placement.get('location'):
+                continue
+            start = placement.get('startMinutes')
+            if start is None:
+                unparsed.append((session, placement))
+            else:
+                booked.append(Booking(placement.get('day'), start, placement['endMinutes'], session, placement))
+    return booked, unparsed
+
+def overlaps(group):
+    """Overlapping pairs of bookings in group, by sort and sweep; each pair in start order"""
+    running = []        # heap of (end, position, booking) still going at the current start
+    pairs = []
+    for position, booking in enumerate(sorted(group, key=lambda booking: (booking.start, booking.end))):
+        while running and running[0][0] <= booking.start:
+            heapq.heappop(running)
+        pairs.extend((earlier, booking) for _, _, earlier in sorted(running, key=lambda item: item[1]))
+        heapq.heappush(running, (booking.end, position, booking))
+    return pairs
+
+def room_key(location):
+    return ' '.join(location.split()).casefold()
+
+def find_conflicts(sessions):
+    """
+    Room and presenter conflicts of sessions, rooms first; returns (conflicts, unparsed placements).
+    Only placements on the same day can conflict.
+    """
+    booked, unparsed = bookings(sessions)
+    by_room = defaultdict(list)
+    by_presenter = defaultdict(list)
+    names = {}          # presenter key -> the name as first written
+    for booking in booked:
+        by_room[booking.day, room_key(booking.placement['location'])].append(booking)
+        if booking.session.get('isSpecialEvent'):
+            continue
+        keys = {}
+        for name in split_presenters(booking.session.get('presenter')):
+            keys.setdefault(person_key(name), name)
+        for key, name in keys.items():
+            if key:
+                names.setdefault(key, name)
+                by_presenter[booking.day, key].append(booking)
+
+    conflicts = []
+    for (_, key), group in by_room.items():
+        conflicts.extend(Conflict(ROOM, key, first, second) for first, second in overlaps(group))
+    for (_, key), group in by_presenter.items():
+        conflicts.extend(Conflict(PRESENTER, names[key], first, second) for first, second in overlaps(group)
+                         if room_key(first.placement['location']) != room_key(second.placement['location']))
+    return conflicts, unparsed
+
+def describe(booking):
+    session = booking.session
+    return (f"ID {session.get('id', '?')} '{(session.get('title') or '')[:50]}' "
+            f"({booking.placement.get('timeBlock')} in {booking.placement.get('location')})")
+
+def conflict_message(conflict):
+    if conflict.kind == ROOM:
+        where = f"Room {conflict.first.placement['location']}"
+    else:
+        where = f"Presenter {conflict.key}"
+    return f"{where}: {describe(conflict.first)} overlaps {describe(conflict.second)}"
+
+def print_conflicts(conflicts, unparsed):
+    for session, placement in unparsed:
+        print(f"INFO: ID {session.get('id', '?')} has no time range to check "
+              f"({placement.get('timeBlock')!r} in {placement.get('location')})")
+    if not conflicts:
+        print("OK: No room or presenter is booked twice at the same time")
+        return
+    rooms = sum(1 for conflict in conflicts if conflict.kind == ROOM)
+    print(f"ISSUE: Found {rooms} room conflicts and {len(conflicts) - rooms} presenter conflicts:")
+    for conflict in conflicts:
+        print(f"  - {conflict_message(conflict)}")
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else 'sessions.json'
+    conflicts, unparsed = find_conflicts(load_sessions(path))
+    print_conflicts(conflicts, unparsed)
+    return 1 if conflicts else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Build the minified and precompressed copies of the data files the pages fetch
+
+index.html, schedule.html, calendar.html and resources.html all load the
+session data on page open, usually on phones over the venue Wi-Fi at the same
+moment. sessions.json stays the pretty-printed file the scripts read and
+people diff; next to it this writes
+
+- sessions.min.json: no whitespace, keys sorted, which the pages fetch first
+- sessions.min.json.gz: gzip -9 with no timestamp or file name in the header
+- sessions.min.json.br: brotli quality 11, when the brotli module is installed
+
+for web servers that serve precompressed files (nginx gzip_static/brotli_static,
+Caddy precompressed, ...). Sorted keys and a fixed gzip header make the output
+depend on the data only, so an unchanged sessions.json gives identical bytes
+and the compressed sizes are comparable from build to build. A size report
+is printed for every artifact.
+
+The listing pages only need the full descriptions when a card is expanded or
+a modal opens, so sessions.json is also split into
+
+- sessions.index.json (+ .gz/.br): every entry without its description, plus
+  the detailShard that holds it; this is what the pages load first
+- session_details/<shard>.json: {id: {description}} for the entries of one
+  id bucket (SHARD_SIZE consecutive session ids; special events share one)
+- sessions.facets.json (+ .gz/.br): the strand, time block and tag bitmaps
+  index.html filters with (see facet_index.py)
+- sessions.search.json (+ .gz/.br): the full-text index index.html loads on
+  the first search (see search_index.py); the report gives its term count
+  and build time
+
+Usage:
+    python3 build_artifacts.py                  # sessions.json
+    python3 build_artifacts.py sessions.json schedule.json
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+import json_stream
+from facet_index import build_facets
+from search_index import build_search_index
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_SOURCES = ['sessions.json']
+
+LISTING_SOURCE = 'sessions.json'
+LISTING_PATH = 'sessions.index.json'
+FACETS_PATH = 'sessions.facets.json'
+SEARCH_PATH = 'sessions.search.json'
+DETAILS_DIR = 'session_details'
+
+# Fields that are left out of the listing and fetched from the shard on demand
+DETAIL_FIELDS = ('description',)
+
+# Session ids per detail shard
+SHARD_SIZE = 25
+
+BLOCK_SIZE = 1 << 16
+
+def minified_path(path):
+    stem, extension = os.path.splitext(path)
+    return f"{stem}.min{extension}"
+
+def write_minified(source, target):
+    """Write source's JSON to target with no whitespace and sorted keys"""
+    with open(source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    json_stream.write_json(target, data, indent=None, ensure_ascii=False, sort_keys=True)
+
+def _replace_with(target, write):
+    tmp_path = f"{target}.tmp"
+    with open(tmp_path, 'wb') as out:
+        write(out)
+    os.replace(tmp_path, target)
+
+def write_gzip(source, target):
+    """gzip -9 source into target with an empty file name and a zero timestamp"""
+    def write(out):
+        with open(source, 'rb') as f, gzip.GzipFile(filename='', mode='wb', fileobj=out,
+                                                    compresslevel=9, mtime=0) as compressed:
+            for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+                compressed.write(block)
+    _replace_with(target, write)
+
+def write_brotli(source, target):
+    """brotli (quality 11, text mode) source into target"""
+    def write(out):
+        compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=11)
+        with open(source, 'rb') as f:
+            for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+                out.write(compressor.process(block))
+        out.write(compressor.finish())
+    _replace_with(target, write)
+
+def detail_shard(session_id):
+    """Name of the detail shard that holds an entry's details"""
+    if isinstance(session_id, int) and not isinstance(session_id, bool):
+        return str(session_id // SHARD_SIZE)
+    return 'special'
+
+def compress(path):
+    """Write path's .gz (and .br) variants; returns their paths"""
+    written = [f"{path}.gz"]
+    write_gzip(path, written[0])
+    if brotli is not None:
+        written.append(f"{path}.br")
+        write_brotli(path, written[-1])
+    elif os.path.exists(f"{path}.br"):
+        # A .br left from an older build would be served with stale data
+        os.remove(f"{path}.br")
+    return written
+
+def build_listing(source=LISTING_SOURCE, listing_path=LISTING_PATH, details_dir=DETAILS_DIR,
+                  facets_path=FACETS_PATH, search_path=SEARCH_PATH):
+    """
+    Split source into the listing index and the detail shards, and write its
+    facet bitmaps and search index.
+
+    Returns [(path, size in bytes)]: the listing and its compressed variants,
+    one line for all the shards together, then the facets and the search
+    index, each followed by its variants.
+    """
+    with open(source, 'r', encoding='utf-8') as f:
+        sessions = json.load(f)
+
+    listing, shards = [], {}
+    for session in sessions:
+        shard = detail_shard(session.get('id'))
+        details = {field: session[field] for field in DETAIL_FIELDS if field in session}
+        entry = {key: value for key, value in session.items() if key not in DETAIL_FIELDS}
+        if details:
+            entry['detailShard'] = shard
+            shards.setdefault(shard, {})[str(session.get('id'))] = details
+        listing.append(entry)
+
+    json_stream.write_json(listing_path, listing, indent=None, ensure_ascii=False, sort_keys=True)
+    os.makedirs(details_dir, exist_ok=True)
+    shard_bytes = 0
+    for shard, details in shards.items():
+        path = os.path.join(details_dir, f"{shard}.json")
+        json_stream.write_json(path, details, indent=None, ensure_ascii=False, sort_keys=True)
+        shard_bytes += os.path.getsize(path)
+    # Shards of ids that are no longer in the data
+    for name in os.listdir(details_dir):
+        if name.endswith('.json') and name[:-len('.json')] not in shards:
+            os.remove(os.path.join(details_dir, name))
+
+    sizes = [(path, os.path.getsize(path)) for path in [listing_path] + compress(listing_path)]
+    sizes.append((f"{details_dir}/ ({len(shards)} shards)", shard_bytes))
+
+    json_stream.write_json(facets_path, build_facets(sessions), indent=None, ensure_ascii=False)
+    sizes.extend((path, os.path.getsize(path)) for path in [facets_path] + compress(facets_path))
+
+    started = time.perf_counter()
+    search_index = build_search_index(sessions)
+    json_stream.write_json(search_path, search_index, indent=None, ensure_ascii=False)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    sizes.append((f"{search_path} ({len(search_index['terms']):,} terms, {elapsed_ms:.0f} ms)",
+                  os.path.getsize(search_path)))
+    sizes.extend((path, os.path.getsize(path)) for path in compress(search_path))
+    return sizes
+
+def build(source):
+    """Write the artifacts for one source file; returns [(path, size in bytes)], source first"""
+    minified = minified_path(source)
+    write_minified(source, minified)
+    artifacts = [source, minified]
+
+    artifacts.extend(compress(minified))
+    sizes = [(path, os.path.getsize(path)) for path in artifacts]
+    if os.path.normpath(source) == LISTING_SOURCE:
+        sizes.extend(build_listing(source))
+    return sizes
+
+def print_report(sizes):
+    source_size = sizes[0][1]
+    width = max(len(path) for path, _ in sizes)
+    for path, size in sizes:
+        share = f"{size / source_size:6.1%}" if source_size else "     -"
+        print(f"  {path:<{width}} {size:>10,} bytes  {share} of {sizes[0][0]}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write minified and precompressed copies of the page data files")
+    parser.add_argument('sources', nargs='*', default=DEFAULT_SOURCES,
+                        help="JSON files to process (default: sessions.json)")
+    args = parser.parse_args(argv)
+
+    print("Build artifacts:")
+    for source in args.sources:
+        try:
+            sizes = build(source)
+        except (OSError, ValueError) as e:
+            print(f"Error building artifacts for {source}: {e}")
+            return 1
+        print_report(sizes)
+    if brotli is None:
+        print("Note: the brotli module is not installed, so no .br files were written (pip install brotli)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
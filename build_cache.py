@@ -0,0 +1,102 @@
+"""
+Build cache for incremental generate_master_sessions.py runs
+
+An incremental build (generate_master_sessions.py --incremental) keeps
+.sessions_build_cache.json next to its inputs, holding:
+
+- a SHA-256 digest of each input file, of the generator's own code and of
+  the sessions.json it wrote; when none of them changed sessions.json is not
+  rebuilt (the generator still rewrites the artifacts derived from it, which
+  the cache doesn't track)
+- a fingerprint of every CSV row, keyed by sessionID, with the cleaned text
+  fields of that row; rows whose fingerprint is unchanged are not cleaned again
+- a fingerprint of each session's schedule cells, to report which sessions
+  moved rooms or time slots
+
+The row cache is only used when the CSV columns are the ones it was built
+from; anything else (a new column, different code) means a full rebuild.
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+CACHE_PATH = '.sessions_build_cache.json'
+
+# Changing any of these changes what the generator emits
+CODE_FILES = ['generate_master_sessions.py', 'text_cleaning.py', 'text_encoding.py', 'schedule_grid.py',
+              'session_model.py', 'input_cache.py', 'json_stream.py', 'build_artifacts.py', 'facet_index.py',
+              'search_index.py', 'time_slots.py', 'build_cache.py']
+
+def file_digest(path):
+    """SHA-256 of a file's bytes, or None if it doesn't exist"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+def row_fingerprints(frame):
+    """One stable fingerprint per DataFrame row, computed over all of its values"""
+    return [f"{value:016x}" for value in pd.util.hash_pandas_object(frame, index=False).tolist()]
+
+def schedule_fingerprints(session_schedule):
+    """Fingerprint of each session's schedule cells (its occurrences), keyed by str(session id)"""
+    return {str(session_id): hashlib.sha1(json.dumps(occurrences, sort_keys=True).encode('utf-8')).hexdigest()
+            for session_id, occurrences in session_schedule.items()}
+
+class BuildCache:
+    """Load, check and save the incremental build state"""
+
+    def __init__(self, input_paths, output_path, path=CACHE_PATH):
+        self.input_paths = list(input_paths) + CODE_FILES
+        self.output_path = output_path
+        self.path = path
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+        self.digests = {p: file_digest(p) for p in self.input_paths}
+
+    def up_to_date(self):
+        """True when no input or code file changed and the output is the one last written"""
+        return (bool(self.data)
+                and self.data.get('inputs') == self.digests
+                and self.data.get('output') == file_digest(self.output_path))
+
+    def text_cache(self, columns):
+        """The per-row cache of cleaned text fields, or an empty one if the schema changed"""
+        if self.data.get('columns') != list(columns) or self.data.get('code') != self._code_digests():
+            return {}
+        return self.data.get('rows', {})
+
+    def changed_schedule(self, session_schedule):
+        """Session ids (as strings) whose schedule cells differ from the last build"""
+        previous = self.data.get('schedule', {})
+        current = schedule_fingerprints(session_schedule)
+        return {session_id for session_id in set(previous) | set(current)
+                if previous.get(session_id) != current.get(session_id)}
+
+    def save(self, columns, text_cache, session_schedule):
+        """Record the state of a successful build (call after writing the output)"""
+        self.data = {
+            'inputs': self.digests,
+            'output': file_digest(self.output_path),
+            'code': self._code_digests(),
+            'columns': list(columns),
+            'rows': text_cache,
+            'schedule': schedule_fingerprints(session_schedule),
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def _code_digests(self):
+        return {p: self.digests[p] for p in CODE_FILES}
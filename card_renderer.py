@@ -0,0 +1,122 @@
+"""
+Static session cards for index.html
+
+update_index_from_json.py used to parse the whole page with BeautifulSoup,
+build each card one tag at a time and serialize the page again, which also
+rewrote markup outside the cards. The card markup is fixed, so here it is a
+handful of templates, split once into literal fragments and named slots. A
+card is the fragments joined with the escaped field values, and
+write_cards() streams the cards between the CARDS_START and CARDS_END
+comments of the page, leaving every other byte as it was. write_region() and
+Template are also used for the prerendered grids (see grid_prerender.py).
+
+The markup and escaping are the same as the BeautifulSoup version wrote
+(html.parser, minimal formatter): &, < and > are escaped in text and
+attribute values, and an attribute value containing a double quote is
+single-quoted, or has its double quotes escaped if it contains both kinds.
+"""
+
+import os
+import string
+
+CARDS_START = '<!-- session-cards:start -->'
+CARDS_END = '<!-- session-cards:end -->'
+
+def escape_text(value):
+    return str(value).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+def quote_attribute(value):
+    value = escape_text(value)
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    return '"' + value.replace('"', '&quot;') + '"'
+
+ESCAPERS = {'text': escape_text, 'attr': quote_attribute}
+
+class Template:
+    """
+    A str.format-style template compiled into fragments.
+
+    Each slot names its escaping: '{title:text}' escapes text content,
+    '{strand:attr}' produces a quoted attribute value.
+    """
+
+    def __init__(self, text):
+        self.fragments = []     # (literal, field name or None, escaper)
+        for literal, field, spec, _ in string.Formatter().parse(text):
+            self.fragments.append((literal, field, ESCAPERS[spec] if field is not None else None))
+
+    def render(self, values):
+        pieces = []
+        for literal, field, escape in self.fragments:
+            pieces.append(literal)
+            if field is not None:
+                pieces.append(escape(values[field]))
+        return ''.join(pieces)
+
+CARD_OPEN = Template('<div class={card_class:attr} data-strand={strand:attr} data-type={type:attr}>')
+TITLE = Template('<div class="session-title">{title:text}</div>')
+PRESENTER = Template('<div class="session-presenter">{presenter:text}</div>')
+PREVIEW = Template('<div class="session-preview">{preview:text}</div>')
+TIME_ROOM = Template('<div class="session-time-room">{time_block:text} | {location:text}</div>')
+TAG = Template('<span class="tag">{tag:text}</span>')
+TAGS_OPEN = '<div class="session-tags">'
+TAGS_CLOSE = '</div>'
+CARD_CLOSE = '</div>'
+
+def render_card(session):
+    strand = session.get('strand', '')
+    pieces = [
+        CARD_OPEN.render({'card_class': f"session-card {strand}", 'strand': strand,
+                          'type': session.get('type', '')}),
+        TITLE.render({'title': session.get('title', '')}),
+    ]
+    if session.get('presenter', ''):
+        pieces.append(PRESENTER.render({'presenter': session['presenter']}))
+    if session.get('preview', ''):
+        pieces.append(PREVIEW.render({'preview': session['preview']}))
+    time_block, location = session.get('timeBlock', ''), session.get('location', '')
+    if time_block and location:
+        pieces.append(TIME_ROOM.render({'time_block': time_block, 'location': location}))
+    tags = session.get('tags', [])
+    if tags:
+        pieces.append(TAGS_OPEN)
+        pieces.extend(TAG.render({'tag': tag}) for tag in tags)
+        pieces.append(TAGS_CLOSE)
+    pieces.append(CARD_CLOSE)
+    return ''.join(pieces)
+
+def render_cards(sessions):
+    """Yield the card HTML of each session"""
+    for session in sessions:
+        yield render_card(session)
+
+def split_page(html, start_marker=CARDS_START, end_marker=CARDS_END):
+    """(text up to and including start_marker, text from end_marker on); ValueError if a marker is missing"""
+    start = html.find(start_marker)
+    end = html.find(end_marker, start)
+    if start < 0 or end < 0:
+        raise ValueError(f"the page has no {start_marker} ... {end_marker} region")
+    return html[:start + len(start_marker)], html[end:]
+
+def write_region(page_path, pieces, start_marker=CARDS_START, end_marker=CARDS_END):
+    """Replace the text between the markers of page_path with pieces; returns how many pieces were written"""
+    with open(page_path, 'r', encoding='utf-8') as f:
+        head, tail = split_page(f.read(), start_marker, end_marker)
+
+    count = 0
+    tmp_path = f"{page_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as out:
+        out.write(head)
+        for piece in pieces:
+            out.write(piece)
+            count += 1
+        out.write(tail)
+    os.replace(tmp_path, page_path)
+    return count
+
+def write_cards(page_path, sessions):
+    """Replace the cards region of page_path with the cards of sessions; returns how many were written"""
+    return write_region(page_path, render_cards(sessions))
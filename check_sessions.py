@@ -1,8 +1,12 @@
 import pandas as pd
-import json
 import re
 
-df = pd.read_excel('session_schedule_by_slot.xlsx')
+import input_cache
+from presenter_index import PresenterIndex
+from schedule_grid import split_presenter_prefix
+from session_repository import SessionRepository
+
+df = input_cache.read_excel('session_schedule_by_slot.xlsx')
 print('Looking for session "Student Buy-In and Ungrading" in Excel:')
 for _, row in df.iterrows():
     for col in df.columns[1:]:
@@ -20,43 +24,45 @@ for _, row in df.iterrows():
 
 # Check the title matching function
 print('\nChecking the title matching function against sessions.json:')
-with open('sessions.json', 'r') as f:
-    sessions = json.load(f)
+def normalize_quotes(title):
+    """Normalize quotes - replace different types of quotes with simple double quotes"""
+    return title.replace('"', '"').replace('"', '"').replace('&quot;', '"')
 
-def find_session_by_title(sessions, title):
-    """Find a session in the sessions list by title (or partial title match)"""
-    # Remove any presenter or custom notation from the title
-    clean_title = re.sub(r'(.+?):\s*', '', title).strip()
+repository = SessionRepository.load('sessions.json', normalize=normalize_quotes)
+title_index = repository.title_index
+presenter_index = PresenterIndex(repository.sessions, normalize=normalize_quotes)
+
+# Print all titles from sessions for debugging
+print("Available session titles:")
+for session, normalized_title in zip(title_index.items, title_index.titles):
+    print(f"  - '{session.get('title', '')}' normalized to '{normalized_title}'")
+
+def find_session_by_title(title_index, title, presenter_index=None):
+    """Find a session by presenter surname and title, or by title (or partial title match) alone"""
+    # "Lastname: Title" cells: the surname narrows the search to that presenter's sessions
+    presenter, cell_title = split_presenter_prefix(title)
+    if presenter and presenter_index is not None:
+        session = presenter_index.match(presenter, normalize_quotes(cell_title))
+        if session is not None:
+            print(f"Found by presenter '{presenter}': {session.get('title', '')}")
+            return session
     
-    # Normalize quotes - replace different types of quotes with simple double quotes
-    clean_title = clean_title.replace('"', '"').replace('"', '"').replace('&quot;', '"')
+    # Remove any presenter or custom notation from the title
+    clean_title = normalize_quotes(re.sub(r'(.+?):\s*', '', title).strip())
     
     print(f"Looking for title: '{title}', cleaned to: '{clean_title}'")
     
-    # Print all titles from sessions for debugging
-    print("Available session titles:")
-    for session in sessions:
-        session_title = session.get('title', '')
-        normalized_title = session_title.replace('"', '"').replace('"', '"').replace('&quot;', '"')
-        print(f"  - '{session_title}' normalized to '{normalized_title}'")
-    
     # First try exact match with normalized quotes
-    for session in sessions:
-        session_title = session.get('title', '')
-        normalized_title = session_title.replace('"', '"').replace('"', '"').replace('&quot;', '"')
-        
-        if normalized_title == clean_title:
-            print(f"Found exact match: {session_title}")
-            return session
+    session = title_index.exact(clean_title)
+    if session is not None:
+        print(f"Found exact match: {session.get('title', '')}")
+        return session
     
     # Then try partial match (title might be truncated in Excel)
-    for session in sessions:
-        session_title = session.get('title', '')
-        normalized_title = session_title.replace('"', '"').replace('"', '"').replace('&quot;', '"')
-        
-        if clean_title and normalized_title and (clean_title in normalized_title or normalized_title in clean_title):
-            print(f"Found partial match: {session_title}")
-            return session
+    session = title_index.substring(clean_title)
+    if session is not None:
+        print(f"Found partial match: {session.get('title', '')}")
+        return session
     
     print("No match found")
     return None
@@ -68,7 +74,7 @@ titles_to_test = [
 ]
 
 for title in titles_to_test:
-    session = find_session_by_title(sessions, title)
+    session = find_session_by_title(title_index, title, presenter_index)
     if session:
         print(f"Found session: {session.get('title')} by {session.get('presenter')}")
     else:
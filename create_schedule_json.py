@@ -2,16 +2,32 @@
 Create schedule.json from sessions.json for backward compatibility
 """
 
-import json
 import sys
+import json_stream
+from session_model import load_sessions
+
+def schedule_entry(session):
+    """The schedule.json entry for a regular session"""
+    return {
+        'id': session.get('id', ''),
+        'title': session.get('title', ''),
+        'presenter': session.get('presenter', ''),
+        'description': session.get('description', ''),
+        'timeSlot': session.get('timeBlock', ''),
+        'room': session.get('location', ''),
+        'strand': session.get('strand', ''),
+        'strandName': session.get('strandName', ''),
+        'type': session.get('type', ''),
+        'typeName': session.get('typeName', ''),
+        'tags': session.get('tags', [])
+    }
 
 def main():
     print("Creating schedule.json from sessions.json for backward compatibility...")
     
     try:
         # Load sessions.json
-        with open('sessions.json', 'r', encoding='utf-8') as f:
-            sessions = json.load(f)
+        sessions = load_sessions('sessions.json')
             
         # Extract unique time slots
         time_slots = set()
@@ -25,6 +41,8 @@ def main():
             if location:
                 rooms.add(location)
         
+        regular_sessions = [session for session in sessions if not session.get('isSpecialEvent', False)]
+        
         # Convert to the schedule.json format
         schedule_data = {
             'timeSlots': [
@@ -32,32 +50,14 @@ def main():
                 for time_slot in sorted(list(time_slots))
             ],
             'rooms': sorted(list(rooms)),
-            'sessions': []
+            'sessions': (schedule_entry(session) for session in regular_sessions)
         }
         
-        # Add sessions
-        for session in sessions:
-            if not session.get('isSpecialEvent', False):
-                schedule_session = {
-                    'id': session.get('id', ''),
-                    'title': session.get('title', ''),
-                    'presenter': session.get('presenter', ''),
-                    'description': session.get('description', ''),
-                    'timeSlot': session.get('timeBlock', ''),
-                    'room': session.get('location', ''),
-                    'strand': session.get('strand', ''),
-                    'strandName': session.get('strandName', ''),
-                    'type': session.get('type', ''),
-                    'typeName': session.get('typeName', ''),
-                    'tags': session.get('tags', [])
-                }
-                schedule_data['sessions'].append(schedule_session)
-        
-        # Write schedule.json
+        # Write schedule.json, one session at a time
         with open('schedule.json', 'w', encoding='utf-8') as f:
-            json.dump(schedule_data, f, ensure_ascii=False, indent=2)
+            json_stream.dump(schedule_data, f, ensure_ascii=False)
             
-        print(f"Successfully created schedule.json with {len(schedule_data['sessions'])} sessions")
+        print(f"Successfully created schedule.json with {len(regular_sessions)} sessions")
         
     except Exception as e:
         print(f"Error: {e}")
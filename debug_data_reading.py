@@ -2,29 +2,29 @@
 Simplified script to debug data processing issues
 """
 
-import pandas as pd
 import json
 import sys
 
+import input_cache
+from text_encoding import detect_encoding, read_csv_decoded
+
 def main():
     print("Starting debug script...")
     
-    # Try different encoding options for CSV
-    csv_encodings = ['utf-8', 'latin1', 'cp1252', 'ISO-8859-1']
-    
-    for encoding in csv_encodings:
-        try:
-            print(f"Trying to read CSV with encoding: {encoding}")
-            sessions_csv = pd.read_csv('sessions.csv', encoding=encoding)
-            print(f"  Success! Read {len(sessions_csv)} rows with encoding {encoding}")
-            print(f"  CSV columns: {sessions_csv.columns.tolist()}")
-            break
-        except Exception as e:
-            print(f"  Failed with encoding {encoding}: {str(e)}")
+    # Detect the encoding from the raw bytes instead of trying encodings one by one
+    try:
+        with open('sessions.csv', 'rb') as f:
+            raw = f.read()
+        print(f"Detected sessions.csv encoding: {detect_encoding(raw)}")
+        sessions_csv = read_csv_decoded('sessions.csv')
+        print(f"  Success! Read {len(sessions_csv)} rows")
+        print(f"  CSV columns: {sessions_csv.columns.tolist()}")
+    except Exception as e:
+        print(f"  Failed to read CSV: {str(e)}")
     
     try:
         print("\nReading Excel file...")
-        schedule_excel = pd.read_excel('schedule_by_id.xlsx')
+        schedule_excel = input_cache.read_excel('schedule_by_id.xlsx')
         print(f"  Success! Read {len(schedule_excel)} rows")
         print(f"  Excel columns: {schedule_excel.columns.tolist()}")
     except Exception as e:
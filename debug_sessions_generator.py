@@ -6,17 +6,20 @@ import pandas as pd
 import json
 import sys
 
+import input_cache
+from text_encoding import read_csv_decoded
+
 def main():
     print("Starting simplified debug script...")
     
     try:
         # Step 1: Read the files
         print("Reading sessions.csv...")
-        sessions_csv = pd.read_csv('sessions.csv', encoding='utf-8')
+        sessions_csv = read_csv_decoded('sessions.csv')
         print(f"Successfully read {len(sessions_csv)} sessions")
         
         print("\nReading schedule_by_id.xlsx...")
-        schedule_excel = pd.read_excel('schedule_by_id.xlsx')
+        schedule_excel = input_cache.read_excel('schedule_by_id.xlsx')
         print(f"Successfully read {len(schedule_excel)} rows from schedule Excel")
         
         # Step 2: Process session IDs from Excel
@@ -5,13 +5,18 @@ This script reads the session_schedule_by_slot.xlsx file and converts it to a JS
 that can be used for a calendar view of the conference schedule.
 """
 
-import pandas as pd
-import json
 import os
 import re
 
-def find_session_by_title(sessions, title):
-    """Find a session in the sessions list by title (or partial title match)"""
+import input_cache
+import json_stream
+from presenter_index import PresenterIndex
+from schedule_grid import melt_schedule_grid, grid_rooms, grid_slots, split_presenter_prefix
+from title_index import TitleIndex
+from session_model import load_sessions
+
+def find_session_by_title(title_index, title, presenter_index=None):
+    """Find a session by presenter surname and title, or by title (or partial title match) alone"""
     # For special events like arrival, keynote, closing
     if "arrival" in title.lower() or "keynote" in title.lower() or "closing" in title.lower():
         # Create a special session object for these events
@@ -26,19 +31,20 @@ def find_session_by_title(sessions, title):
             "tags": ["Required"]
         }
         
+    # "Lastname: Title" cells: the surname narrows the search to that presenter's sessions
+    presenter, cell_title = split_presenter_prefix(title)
+    if presenter and presenter_index is not None:
+        session = presenter_index.match(presenter, cell_title)
+        if session is not None:
+            return session
+    
     # Remove any presenter or custom notation from the title
     clean_title = re.sub(r'(.+?):\s*', '', title).strip()
     
-    # First try exact match
-    for session in sessions:
-        if session.get('title') == clean_title:
-            return session
-    
-    # Then try partial match (title might be truncated in Excel)
-    for session in sessions:
-        session_title = session.get('title', '')
-        if clean_title and session_title and (clean_title in session_title or session_title in clean_title):
-            return session
+    # Exact match first, then partial match (title might be truncated in Excel)
+    session = title_index.find(clean_title)
+    if session is not None:
+        return session
     
     # If no match, return a placeholder
     return {
@@ -51,6 +57,64 @@ def find_session_by_title(sessions, title):
         "tags": []
     }
 
+def build_schedule(df, sessions_data):
+    """
+    Build the calendar schedule from a slot x room grid and the sessions it refers to
+    
+    Args:
+        df: the schedule grid, as read from session_schedule_by_slot.xlsx
+        sessions_data: the sessions from sessions.json, for detailed info
+    """
+    title_index = TitleIndex(sessions_data)
+    presenter_index = PresenterIndex(sessions_data)
+    
+    # Create schedule structure
+    schedule = {
+        "timeSlots": [],
+        "rooms": grid_rooms(df),  # Skip the first column (Time Slot)
+        "sessions": []
+    }
+    
+    # Process each row (time slot)
+    for time_slot in grid_slots(df):
+        # Extract time range from slot name
+        # Check if it already is in a time format like "8:00-9:00"
+        if re.match(r'\d+:\d+-\d+:\d+', time_slot):
+            time_range = time_slot  # Already in the right format
+        else:
+            # For traditional format like "Slot 1 (10:15-11:15)" -> "10:15-11:15"
+            time_range = re.search(r'\((.*?)\)', time_slot)
+            time_range = time_range.group(1) if time_range else time_slot
+        
+        # Add time slot to list
+        schedule["timeSlots"].append({
+            "name": time_slot,
+            "timeRange": time_range
+        })
+    
+    # Process every filled cell, slot by slot and room by room
+    cells = melt_schedule_grid(df)
+    for time_slot, room, session_title in zip(cells['slot'], cells['room'], cells['payload']):
+        # Find session details
+        session_details = find_session_by_title(title_index, session_title, presenter_index)
+        
+        # Add session to schedule (tags copied: the schedule must not share lists with sessions_data)
+        schedule["sessions"].append({
+            "timeSlot": time_slot,
+            "room": room,
+            "sessionId": session_details.get("id", ""),
+            "title": session_details.get("title", session_title),
+            "presenter": session_details.get("presenter", ""),
+            "description": session_details.get("description", ""),
+            "strand": session_details.get("strand", ""),
+            "strandName": session_details.get("strandName", ""),
+            "type": session_details.get("type", ""),
+            "typeName": session_details.get("typeName", ""),
+            "tags": list(session_details.get("tags", []))
+        })
+    
+    return schedule
+
 def excel_to_schedule_json(excel_file, sessions_json_file, output_file='schedule.json'):
     """
     Convert Excel schedule to JSON for calendar view
@@ -62,67 +126,16 @@ def excel_to_schedule_json(excel_file, sessions_json_file, output_file='schedule
     """
     try:
         # Load Excel file
-        df = pd.read_excel(excel_file)
+        df = input_cache.read_excel(excel_file)
         
         # Load sessions data
-        with open(sessions_json_file, 'r') as f:
-            sessions_data = json.load(f)
-        
-        # Create schedule structure
-        schedule = {
-            "timeSlots": [],
-            "rooms": df.columns[1:].tolist(),  # Skip the first column (Time Slot)
-            "sessions": []
-        }
+        sessions_data = load_sessions(sessions_json_file)
         
-        # Process each row (time slot)
-        for _, row in df.iterrows():
-            time_slot = row['Time Slot']
-            
-            # Extract time range from slot name
-            # Check if it already is in a time format like "8:00-9:00"
-            if re.match(r'\d+:\d+-\d+:\d+', time_slot):
-                time_range = time_slot  # Already in the right format
-            else:
-                # For traditional format like "Slot 1 (10:15-11:15)" -> "10:15-11:15"
-                time_range = re.search(r'\((.*?)\)', time_slot)
-                time_range = time_range.group(1) if time_range else time_slot
-            
-            # Add time slot to list
-            schedule["timeSlots"].append({
-                "name": time_slot,
-                "timeRange": time_range
-            })
-            
-            # Process sessions in this time slot
-            for room in df.columns[1:]:  # Skip the first column (Time Slot)
-                session_title = row[room]
-                
-                # Skip empty cells
-                if pd.isna(session_title) or session_title == '':
-                    continue
-                
-                # Find session details
-                session_details = find_session_by_title(sessions_data, session_title)
-                
-                # Add session to schedule
-                schedule["sessions"].append({
-                    "timeSlot": time_slot,
-                    "room": room,
-                    "sessionId": session_details.get("id", ""),
-                    "title": session_details.get("title", session_title),
-                    "presenter": session_details.get("presenter", ""),
-                    "description": session_details.get("description", ""),
-                    "strand": session_details.get("strand", ""),
-                    "strandName": session_details.get("strandName", ""),
-                    "type": session_details.get("type", ""),
-                    "typeName": session_details.get("typeName", ""),
-                    "tags": session_details.get("tags", [])
-                })
+        schedule = build_schedule(df, sessions_data)
         
         # Write schedule to JSON file
         with open(output_file, 'w') as f:
-            json.dump(schedule, f, indent=2)
+            json_stream.dump(schedule, f, ensure_ascii=True)
         
         print(f"Schedule successfully converted to {output_file}")
         return True
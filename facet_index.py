@@ -0,0 +1,86 @@
+"""
+Facet bitmaps for the index.html filters
+
+index.html filters the listing by strand, time block and tag. Doing that in
+the browser means walking every session and its occurrences and tags on each
+click. This precomputes one bitmap per facet value instead. Bit i is set when
+the i-th entry of sessions.json has that value, so the page can filter by
+OR-ing the bitmaps of the selected values within a group and AND-ing the
+groups, one 32-bit word at a time.
+
+The facet values match what index.html computes itself:
+
+- strand: 'strand<N>' for a strand field starting with '<N>:'
+- timeblock: the trimmed timeBlock of a special event, or of each occurrence
+  of a regular session
+- tag: each tag trimmed and lowercased; labels keeps the text to show for it
+
+A bitmap is stored as base64 of little-endian 32-bit words, ceil(count / 32)
+words long.
+"""
+
+import base64
+import re
+from collections import defaultdict
+
+FACETS = ('strand', 'timeblock', 'tag')
+
+WORD_BITS = 32
+
+_STRAND_PREFIX = re.compile(r'\s*(\d+):')
+
+def strand_key(strand):
+    """Filter key of a strand field ('1: AI in the Classroom' -> 'strand1'), or None"""
+    match = _STRAND_PREFIX.match(str(strand or ''))
+    return f"strand{match.group(1)}" if match else None
+
+def time_blocks(session):
+    if session.get('isSpecialEvent'):
+        blocks = [session.get('timeBlock')]
+    else:
+        blocks = [occurrence.get('timeBlock') for occurrence in session.get('occurrences') or []]
+    return [str(block).strip() for block in blocks if block]
+
+def facet_values(session):
+    """{facet: set of values} for one session"""
+    key = strand_key(session.get('strand'))
+    tags = session.get('tags') if isinstance(session.get('tags'), list) else []
+    return {
+        'strand': {key} if key else set(),
+        'timeblock': set(time_blocks(session)),
+        'tag': {str(tag).strip().lower() for tag in tags if str(tag).strip()},
+    }
+
+def encode(bits, count):
+    """A Python int bitset as base64 of ceil(count / 32) little-endian 32-bit words"""
+    words = -(-count // WORD_BITS)
+    return base64.b64encode(bits.to_bytes(words * 4, 'little')).decode('ascii')
+
+def build_facets(sessions):
+    """
+    The facet document for a list of sessions.
+
+    Returns {'count', 'wordBits', 'facets': {facet: {value: bitmap}},
+    'labels': {'tag': {value: display text}}}.
+    """
+    bitsets = {facet: defaultdict(int) for facet in FACETS}
+    tag_labels = {}
+    for ordinal, session in enumerate(sessions):
+        bit = 1 << ordinal
+        for facet, values in facet_values(session).items():
+            for value in values:
+                bitsets[facet][value] |= bit
+        for tag in session.get('tags') if isinstance(session.get('tags'), list) else []:
+            text = str(tag).strip()
+            value = text.lower()
+            if text and (value not in tag_labels or text < tag_labels[value]):
+                tag_labels[value] = text
+
+    count = len(sessions)
+    return {
+        'count': count,
+        'wordBits': WORD_BITS,
+        'facets': {facet: {value: encode(bits, count) for value, bits in sorted(values.items())}
+                   for facet, values in bitsets.items()},
+        'labels': {'tag': dict(sorted(tag_labels.items()))},
+    }
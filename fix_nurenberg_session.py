@@ -5,6 +5,96 @@ to ensure proper consistency between the two files.
 """
 import json
 import sys
+import json_stream
+from session_model import load_sessions, dump_sessions
+from session_repository import SessionRepository
+
+def fix_nurenberg_data(sessions, schedule):
+    """
+    Complete David Nurenberg's session in sessions and add it to the schedule if it is missing
+
+    Returns False if the session isn't in sessions.
+    """
+    # Find David Nurenberg's session in sessions.json and fix it
+    repository = SessionRepository(sessions)
+    candidates = repository.by_presenter('David Nurenberg') + [
+        session for session in repository.titles_containing('Dangerous') if 'Mind' in session.get('title', '')]
+    matches = repository.in_order(candidates)
+    if not matches:
+        print("Could not find David Nurenberg's session in sessions.json")
+        return False
+    
+    session = fixed_nurenberg_session = matches[0]
+    print(f"Found David Nurenberg's session at index {repository.ordinal(session)}")
+    
+    # Ensure all fields are present
+    if 'strand' not in session:
+        session['strand'] = 'strand1'
+        print("Added missing 'strand' field")
+    
+    if 'strandName' not in session:
+        session['strandName'] = "1: AI in the Classroom"
+        print("Added missing 'strandName' field")
+    
+    if 'type' not in session:
+        session['type'] = 'type-presentation'
+        print("Added missing 'type' field")
+    
+    if 'typeName' not in session:
+        session['typeName'] = "Presentation and Q&A"
+        print("Added missing 'typeName' field")
+    
+    if 'title' not in session:
+        session['title'] = "Dangerous (Artificial) Minds: Engaging student critical thinking and analysis in their interactions with AI"
+        print("Added missing 'title' field")
+    
+    # Update time block and location from schedule
+    session['timeBlock'] = "Slot 2 (11:30-12:30)"
+    session['location'] = "Brush 203"
+    print("Updated timeBlock and location")
+    
+    # Find or add David Nurenberg's session in schedule.json
+    nurenberg_schedule_found = False
+    
+    for session in schedule.get('sessions', []):
+        if 'David Nurenberg' in session.get('presenter', ''):
+            nurenberg_schedule_found = True
+            print("Found David Nurenberg's session in schedule.json")
+            break
+    
+    if not nurenberg_schedule_found:
+        # Add it to schedule.json based on our fixed session
+        new_schedule_session = {
+            "timeSlot": fixed_nurenberg_session['timeBlock'],
+            "room": fixed_nurenberg_session['location'],
+            "sessionId": "",
+            "title": fixed_nurenberg_session['title'],
+            "presenter": fixed_nurenberg_session['presenter'],
+            "description": fixed_nurenberg_session['description'],
+            "strand": fixed_nurenberg_session['strand'],
+            "strandName": fixed_nurenberg_session['strandName'],
+            "type": fixed_nurenberg_session['type'],
+            "typeName": fixed_nurenberg_session['typeName'],
+            "tags": list(fixed_nurenberg_session['tags'])
+        }
+        
+        # Find where to insert - after Brush 202 session for Slot 2
+        inserted = False
+        for i, session in enumerate(schedule['sessions']):
+            if (session['timeSlot'] == "Slot 2 (11:30-12:30)" and 
+                session['room'] == "Brush 202"):
+                # Insert the new session after this one
+                schedule['sessions'].insert(i + 1, new_schedule_session)
+                inserted = True
+                print(f"Added David Nurenberg's session to schedule.json after Brush 202 session")
+                break
+        
+        if not inserted:
+            # If we couldn't find a good position, just append it
+            schedule['sessions'].append(new_schedule_session)
+            print(f"Added David Nurenberg's session to schedule.json at the end")
+    
+    return True
 
 def fix_nurenberg_session():
     print("Starting to fix David Nurenberg's session...")
@@ -34,104 +124,20 @@ def fix_nurenberg_session():
                     print("Fixed JSON formatting in sessions.json")
         
         # Now load the fixed JSON files
-        with open('sessions.json', 'r', encoding='utf-8') as f:
-            sessions = json.load(f)
+        sessions = load_sessions('sessions.json')
         
         # Load schedule.json
         with open('schedule.json', 'r', encoding='utf-8') as f:
             schedule = json.load(f)
             
-        # Find David Nurenberg's session in sessions.json and fix it
-        nurenberg_session_found = False
-        fixed_nurenberg_session = None
-        
-        for i, session in enumerate(sessions):
-            presenter = session.get('presenter', '')
-            title = session.get('title', '')
-            if 'David Nurenberg' in presenter or ('Dangerous' in title and 'Mind' in title):
-                nurenberg_session_found = True
-                print(f"Found David Nurenberg's session at index {i}")
-                
-                # Ensure all fields are present
-                if 'strand' not in session:
-                    session['strand'] = 'strand1'
-                    print("Added missing 'strand' field")
-                
-                if 'strandName' not in session:
-                    session['strandName'] = "1: AI in the Classroom"
-                    print("Added missing 'strandName' field")
-                
-                if 'type' not in session:
-                    session['type'] = 'type-presentation'
-                    print("Added missing 'type' field")
-                
-                if 'typeName' not in session:
-                    session['typeName'] = "Presentation and Q&A"
-                    print("Added missing 'typeName' field")
-                
-                if 'title' not in session:
-                    session['title'] = "Dangerous (Artificial) Minds: Engaging student critical thinking and analysis in their interactions with AI"
-                    print("Added missing 'title' field")
-                
-                # Update time block and location from schedule
-                session['timeBlock'] = "Slot 2 (11:30-12:30)"
-                session['location'] = "Brush 203"
-                print("Updated timeBlock and location")
-                
-                fixed_nurenberg_session = session
-                break
-                
-        if not nurenberg_session_found:
-            print("Could not find David Nurenberg's session in sessions.json")
+        if not fix_nurenberg_data(sessions, schedule):
             return False
         
-        # Find or add David Nurenberg's session in schedule.json
-        nurenberg_schedule_found = False
-        
-        for session in schedule.get('sessions', []):
-            if 'David Nurenberg' in session.get('presenter', ''):
-                nurenberg_schedule_found = True
-                print("Found David Nurenberg's session in schedule.json")
-                break
-        
-        if not nurenberg_schedule_found:
-            # Add it to schedule.json based on our fixed session
-            new_schedule_session = {
-                "timeSlot": fixed_nurenberg_session['timeBlock'],
-                "room": fixed_nurenberg_session['location'],
-                "sessionId": "",
-                "title": fixed_nurenberg_session['title'],
-                "presenter": fixed_nurenberg_session['presenter'],
-                "description": fixed_nurenberg_session['description'],
-                "strand": fixed_nurenberg_session['strand'],
-                "strandName": fixed_nurenberg_session['strandName'],
-                "type": fixed_nurenberg_session['type'],
-                "typeName": fixed_nurenberg_session['typeName'],
-                "tags": fixed_nurenberg_session['tags']
-            }
-            
-            # Find where to insert - after Brush 202 session for Slot 2
-            inserted = False
-            for i, session in enumerate(schedule['sessions']):
-                if (session['timeSlot'] == "Slot 2 (11:30-12:30)" and 
-                    session['room'] == "Brush 202"):
-                    # Insert the new session after this one
-                    schedule['sessions'].insert(i + 1, new_schedule_session)
-                    inserted = True
-                    print(f"Added David Nurenberg's session to schedule.json after Brush 202 session")
-                    break
-            
-            if not inserted:
-                # If we couldn't find a good position, just append it
-                schedule['sessions'].append(new_schedule_session)
-                print(f"Added David Nurenberg's session to schedule.json at the end")
-        
         # Save the updated files
-        with open('sessions.json', 'w', encoding='utf-8') as f:
-            json.dump(sessions, f, indent=2, ensure_ascii=False)
+        dump_sessions(sessions, 'sessions.json')
         
         with open('schedule.json', 'w', encoding='utf-8') as f:
-            json.dump(schedule, f, indent=2, ensure_ascii=False)
+            json_stream.dump(schedule, f, ensure_ascii=False)
         
         print("Successfully updated both files")
         return True
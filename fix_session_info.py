@@ -2,8 +2,8 @@
 """
 Fix missing or incorrect time blocks and locations in sessions.json
 """
-import json
 import os
+from session_model import load_sessions, dump_sessions
 
 # Dictionary mapping presenter names to their correct room and time slot
 SESSION_UPDATES = {
@@ -39,8 +39,7 @@ SESSION_UPDATES = {
 
 def fix_sessions():
     # Load sessions from file
-    with open('sessions.json', 'r', encoding='utf-8') as file:
-        sessions = json.load(file)
+    sessions = load_sessions('sessions.json')
     
     updates_made = 0
     
@@ -71,8 +70,7 @@ def fix_sessions():
                 break
     
     # Save the updated sessions back to the file
-    with open('sessions.json', 'w', encoding='utf-8') as file:
-        json.dump(sessions, file, indent=2, ensure_ascii=False)
+    dump_sessions(sessions, 'sessions.json')
     
     print(f"\nCompleted session fixes: {updates_made} sessions updated.")
 
@@ -7,9 +7,16 @@ Comprehensive fix for session information issues:
 """
 import json
 import csv
+import io
 import os
 import re
 
+import json_stream
+from presenter_index import PresenterIndex
+from text_encoding import read_text
+from schedule_grid import read_schedule_grid, melt_schedule_grid, grid_slots, PRESENTER_TITLE, PRESENTER_TITLE_GRID
+from session_model import load_sessions, dump_sessions
+
 def clean_title(title):
     """Remove any presenter prefix and normalize quotes"""
     # Remove prefix like "Cotton: "
@@ -22,7 +29,7 @@ def load_csv_sessions():
     """Load sessions from CSV file to get email/presenter mapping"""
     email_presenter_map = {}
     try:
-        with open('sessions.csv', 'r', encoding='utf-8') as file:
+        with io.StringIO(read_text('sessions.csv')) as file:
             reader = csv.reader(file)
             header = next(reader)  # Skip header
             
@@ -50,59 +57,45 @@ def load_csv_sessions():
         print(f"Error loading CSV: {e}")
         return {}
 
-def load_schedule_assignments():
-    """Load room and time assignments from schedule_temp.csv"""
+def load_schedule_assignments(sessions=None):
+    """
+    Load room and time assignments from schedule_temp.csv
+
+    With sessions, each "Lastname: Title" cell is resolved to a session through
+    its presenter's surname (typos included) and stored under that session's
+    cleaned title, so update_schedule_info finds it even when the cell's title
+    differs from sessions.json. Unresolved cells keep their own title.
+    """
     session_assignments = {}
+    presenter_index = PresenterIndex(sessions, normalize=clean_title) if sessions else None
     
     try:
-        with open('schedule_temp.csv', 'r', encoding='utf-8') as file:
-            reader = csv.reader(file)
-            headers = next(reader)  # Get room names from header
+        grid = read_schedule_grid('schedule_temp.csv')
+        time_slots = grid_slots(grid)
+        cells = melt_schedule_grid(grid, grid_format=PRESENTER_TITLE_GRID)
+        
+        # Skip non-session time slots like arrival, keynote, closing, and cells
+        # without a "Lastname: Title" prefix
+        cells = cells[cells['slot'].str.startswith("Slot") & (cells['kind'] == PRESENTER_TITLE)]
+        
+        for time_slot, room, presenter_last_name, title in zip(cells['slot'], cells['room'],
+                                                               cells['presenter'], cells['title']):
+            clean_session_title = clean_title(title)
+            if presenter_index is not None:
+                session = presenter_index.match(presenter_last_name, clean_session_title)
+                if session is not None:
+                    clean_session_title = clean_title(session.get('title', ''))
             
-            # Skip headers for arrival, keynote
-            time_slots = []
-            for row in reader:
-                if not row or not row[0]:  # Skip empty rows
-                    continue
-                
-                time_slot = row[0].strip()
-                time_slots.append(time_slot)
-                
-                # Skip non-session time slots like arrival, keynote, closing
-                if not time_slot.startswith("Slot"):
-                    continue
-                
-                # Process each room's session
-                for i in range(1, len(row)):
-                    if i >= len(headers) or not row[i]:  # Skip empty cells
-                        continue
-                    
-                    room = headers[i].strip()
-                    cell_content = row[i].strip()
-                    
-                    # Skip empty cells
-                    if not cell_content:
-                        continue
-                    
-                    # Extract presenter and title
-                    parts = cell_content.split(':', 1)
-                    if len(parts) != 2:
-                        continue  # Invalid format
-                    
-                    presenter_last_name = parts[0].strip()
-                    title = parts[1].strip()
-                    clean_session_title = clean_title(title)
-                    
-                    # Store by title for easy lookup
-                    if clean_session_title not in session_assignments:
-                        session_assignments[clean_session_title] = []
-                    
-                    # Add this occurrence
-                    session_assignments[clean_session_title].append({
-                        'timeBlock': time_slot,
-                        'location': room,
-                        'presenter_last_name': presenter_last_name
-                    })
+            # Store by title for easy lookup
+            if clean_session_title not in session_assignments:
+                session_assignments[clean_session_title] = []
+            
+            # Add this occurrence
+            session_assignments[clean_session_title].append({
+                'timeBlock': time_slot,
+                'location': room,
+                'presenter_last_name': presenter_last_name
+            })
         
         return session_assignments, time_slots
     except Exception as e:
@@ -197,42 +190,63 @@ def update_schedule_info(sessions, schedule_assignments):
     
     return updates_made
 
+def update_schedule_presenters(sessions_data, schedule_data):
+    """Update presenter information in the schedule.json data for consistency"""
+    # Create a lookup dictionary for quick access
+    session_lookup = {}
+    for session in sessions_data:
+        title = session.get('title', '')
+        if title:
+            session_lookup[title] = session
+    
+    schedule_updates = 0
+    # Update sessions in schedule.json
+    for session in schedule_data.get('sessions', []):
+        title = session.get('title', '')
+        if title in session_lookup:
+            original_session = session_lookup[title]
+            if session.get('presenter', '') != original_session.get('presenter', ''):
+                print(f"Updating schedule.json presenter for '{title[:50]}...': '{session.get('presenter', 'None')}' → '{original_session.get('presenter', '')}'")
+                session['presenter'] = original_session.get('presenter', '')
+                schedule_updates += 1
+    
+    print(f"\nUpdated {schedule_updates} presenter entries in schedule.json")
+    return schedule_updates
+
 def update_schedule_json(sessions_data, schedule_path='schedule.json'):
     """Update presenter information in schedule.json for consistency"""
     try:
-        # Create a lookup dictionary for quick access
-        session_lookup = {}
-        for session in sessions_data:
-            title = session.get('title', '')
-            if title:
-                session_lookup[title] = session
-        
         # Load schedule.json
         with open(schedule_path, 'r', encoding='utf-8') as file:
             schedule_data = json.load(file)
         
-        schedule_updates = 0
-        # Update sessions in schedule.json
-        for session in schedule_data.get('sessions', []):
-            title = session.get('title', '')
-            if title in session_lookup:
-                original_session = session_lookup[title]
-                if session.get('presenter', '') != original_session.get('presenter', ''):
-                    print(f"Updating schedule.json presenter for '{title[:50]}...': '{session.get('presenter', 'None')}' → '{original_session.get('presenter', '')}'")
-                    session['presenter'] = original_session.get('presenter', '')
-                    schedule_updates += 1
+        schedule_updates = update_schedule_presenters(sessions_data, schedule_data)
         
         # Write back to schedule.json
         with open(schedule_path, 'w', encoding='utf-8') as file:
-            json.dump(schedule_data, file, indent=2, ensure_ascii=False)
+            json_stream.dump(schedule_data, file, ensure_ascii=False)
         
-        print(f"\nUpdated {schedule_updates} presenter entries in schedule.json")
         return schedule_updates
     
     except Exception as e:
         print(f"Error updating schedule.json: {e}")
         return 0
 
+def fix_session_info(sessions_data, email_presenter_map, schedule_assignments, time_slots):
+    """Fix presenter names, time blocks and locations in sessions_data"""
+    print(f"Loaded {len(schedule_assignments)} session assignments from schedule CSV")
+    print(f"Time slots found: {', '.join(time_slots)}")
+    
+    print(f"\nProcessing {len(sessions_data)} sessions...")
+    
+    # Update presenter names
+    presenter_updates = update_presenter_names(sessions_data, email_presenter_map)
+    print(f"Updated {presenter_updates} presenter names")
+    
+    # Update schedule info
+    schedule_updates = update_schedule_info(sessions_data, schedule_assignments)
+    print(f"Updated {schedule_updates} schedule entries (time blocks and locations)")
+
 def main():
     print("Starting comprehensive session information fix...")
     
@@ -240,29 +254,16 @@ def main():
     email_presenter_map = load_csv_sessions()
     print(f"Loaded {len(email_presenter_map)} email-to-presenter mappings from CSV")
     
-    # Load schedule assignments from schedule_temp.csv
-    schedule_assignments, time_slots = load_schedule_assignments()
-    print(f"Loaded {len(schedule_assignments)} session assignments from schedule CSV")
-    print(f"Time slots found: {', '.join(time_slots)}")
-    
     try:
         # Load sessions.json
-        with open('sessions.json', 'r', encoding='utf-8') as file:
-            sessions_data = json.load(file)
-        
-        print(f"\nProcessing {len(sessions_data)} sessions...")
-        
-        # Update presenter names
-        presenter_updates = update_presenter_names(sessions_data, email_presenter_map)
-        print(f"Updated {presenter_updates} presenter names")
+        sessions_data = load_sessions('sessions.json')
         
-        # Update schedule info
-        schedule_updates = update_schedule_info(sessions_data, schedule_assignments)
-        print(f"Updated {schedule_updates} schedule entries (time blocks and locations)")
+        # Load schedule assignments from schedule_temp.csv
+        schedule_assignments, time_slots = load_schedule_assignments(sessions_data)
+        fix_session_info(sessions_data, email_presenter_map, schedule_assignments, time_slots)
         
         # Save updated sessions.json
-        with open('sessions.json', 'w', encoding='utf-8') as file:
-            json.dump(sessions_data, file, indent=2, ensure_ascii=False)
+        dump_sessions(sessions_data, 'sessions.json')
         
         print(f"\nSaved updated sessions.json")
         
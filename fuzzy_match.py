@@ -0,0 +1,239 @@
+"""
+Blocked fuzzy title matching
+
+sync_session_data compares titles with difflib.SequenceMatcher.ratio(), and
+used to do so for every (session, schedule entry) pair, three times over.
+TitleAssignment matches the two title lists at once, and only computes the
+full ratio for pairs that survive three cheap filters:
+
+1. Length: ratio() <= 2 * min(len) / (len(a) + len(b)), so only titles in a
+   length window around each other can reach the threshold.
+2. Shared trigrams: a ratio of t needs M >= t * L / 2 matching characters
+   (L = len(a) + len(b)) in at most U + 1 blocks, where U = L - 2M. The
+   blocks then contain at least M - 2 * (U + 1) trigram positions that
+   occur in both strings, and the dot product of the two trigram count
+   vectors is at least that many. Both bounds are evaluated for every pair
+   in one NumPy matrix product.
+3. Characters in common regardless of order (quick_ratio()).
+
+The filters are bounds, not heuristics: the pairs they drop could not have
+reached the threshold. The pairs that clear it are assigned one-to-one
+(highest total similarity), so two sessions can't claim the same schedule
+entry and lookups in either direction agree.
+"""
+
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+
+import numpy as np
+
+GRAM = 3
+
+# Stored with remembered matches (match_memo); change it whenever the matching rules change
+MATCHER_VERSION = 'trigram-ratio-1'
+
+def _gram_counts(text):
+    return Counter(text[i:i + GRAM] for i in range(len(text) - GRAM + 1))
+
+def _required_shared(total, threshold):
+    """Fewest shared trigram positions two titles of combined length total need to reach threshold"""
+    return threshold * total / 2 - (GRAM - 1) * ((1 - threshold) * total + 1) - 1e-9
+
+# Global one-to-one assignment
+
+BLOCK_ROWS = 1024  # rows per block of the similarity matrix, to bound memory
+
+def _gram_matrix(grams, vocabulary):
+    """Dense trigram count vectors (float32, for BLAS) over a shared vocabulary"""
+    matrix = np.zeros((len(grams), len(vocabulary)), dtype=np.float32)
+    for row, counts in enumerate(grams):
+        for gram, count in counts.items():
+            column = vocabulary.get(gram)
+            if column is not None:
+                matrix[row, column] = count
+    return matrix
+
+def candidate_pairs(left, right, threshold=0.85):
+    """
+    Return the (i, j) pairs of left and right titles that may reach ratio >= threshold.
+
+    The length and shared-trigram bounds (see the module docstring), applied to
+    every pair at once. The dot product of two trigram count vectors is at least the
+    number of trigram positions they share, so pairs whose dot product is below
+    the required count can be dropped without computing a single ratio().
+    """
+    left_grams = [_gram_counts(title) for title in left]
+    right_grams = [_gram_counts(title) for title in right]
+    shared_vocabulary = set().union(*left_grams) & set().union(*right_grams) if left and right else set()
+    vocabulary = {gram: column for column, gram in enumerate(sorted(shared_vocabulary))}
+    left_lengths = np.array([len(title) for title in left], dtype=np.float64)
+    right_lengths = np.array([len(title) for title in right], dtype=np.float64)
+
+    pairs = []
+    for top in range(0, len(left), BLOCK_ROWS):
+        block = slice(top, top + BLOCK_ROWS)
+        left_block = _gram_matrix(left_grams[block], vocabulary)
+        for start in range(0, len(right), BLOCK_ROWS):
+            columns = slice(start, start + BLOCK_ROWS)
+            dot = left_block @ _gram_matrix(right_grams[columns], vocabulary).T
+            a = left_lengths[block][:, None]
+            b = right_lengths[columns][None, :]
+            total = a + b
+            # 2 * min / total is SequenceMatcher.real_quick_ratio(); empty pairs score 1.0
+            length_bound = np.divide(2 * np.minimum(a, b), total, out=np.ones_like(total), where=total > 0)
+            possible = ((length_bound >= threshold - 1e-9)
+                        & (dot >= _required_shared(total, threshold)))
+            rows, cols = np.nonzero(possible)
+            pairs.extend(zip((rows + top).tolist(), (cols + start).tolist()))
+    return pairs
+
+def _max_weight_assignment(weights):
+    """
+    Maximum-weight one-to-one assignment for a small dense weight matrix.
+
+    The Hungarian algorithm (Kuhn-Munkres with potentials) on the negated
+    weights, with the inner loop over columns vectorized. Zero-weight cells
+    stand for "no match" and are left out of the result. Returns (row, column) pairs.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    transposed = weights.shape[0] > weights.shape[1]
+    if transposed:
+        weights = weights.T
+    n, m = weights.shape
+    cost = -weights
+
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=int)  # owner[j]: row (1-based) assigned to column j, 0 if free
+    way = np.zeros(m + 1, dtype=int)
+    for row in range(1, n + 1):
+        owner[0] = row
+        j0 = 0
+        min_slack = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            free = ~used[1:]
+            slack = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (slack < min_slack[1:])
+            min_slack[1:][better] = slack[better]
+            way[1:][better] = j0
+            masked = np.where(free, min_slack[1:], np.inf)
+            j1 = int(np.argmin(masked)) + 1
+            delta = masked[j1 - 1]
+            used_columns = np.nonzero(used)[0]
+            u[owner[used_columns]] += delta
+            v[used_columns] -= delta
+            min_slack[1:][free] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+
+    pairs = []
+    for column in range(1, m + 1):
+        row = owner[column] - 1
+        if row >= 0 and weights[row, column - 1] > 0:
+            pairs.append((column - 1, row) if transposed else (row, column - 1))
+    return pairs
+
+class TitleAssignment:
+    """
+    One-to-one matching between two lists of normalized titles.
+
+    Matching is done on distinct non-empty titles, so rows that share a title
+    (a session scheduled in several slots) share its match. forward maps a left
+    row to the first right row carrying its matched title, backward maps a
+    right row to the first such left row, and scores holds the ratio for each
+    left row that was matched. pairs lists the matched (left title, right
+    title, score) triples.
+
+    pinned maps a left title to a (right title, score) pair remembered from an
+    earlier run (see match_memo). Such pairs are taken as they are, without
+    any comparison, as long as the right title is present and unclaimed.
+    """
+
+    def __init__(self, left, right, threshold=0.85, pinned=None):
+        self.threshold = threshold
+        left_keys, left_rows = self._distinct(left)
+        right_keys, right_rows = self._distinct(right)
+        self.comparisons = 0
+
+        # Identical titles always pair up; the rest compete for what's left
+        right_position = {title: position for position, title in enumerate(right_keys)}
+        matched = {}
+        for position, title in enumerate(left_keys):
+            if title in right_position:
+                matched[position] = (right_position[title], 1.0)
+        taken = {r for r, _ in matched.values()}
+        for position, title in enumerate(left_keys):
+            target, score = (pinned or {}).get(title, (None, None))
+            r = right_position.get(target)
+            if position not in matched and r is not None and r not in taken:
+                matched[position] = (r, score)
+                taken.add(r)
+        open_left = [p for p in range(len(left_keys)) if p not in matched]
+        open_right = [p for p in range(len(right_keys)) if p not in taken]
+
+        edges = {}
+        pairs = candidate_pairs([left_keys[p] for p in open_left], [right_keys[p] for p in open_right], threshold)
+        for i, j in pairs:
+            l, r = open_left[i], open_right[j]
+            matcher = SequenceMatcher(None, left_keys[l], right_keys[r])
+            if matcher.quick_ratio() < threshold:
+                continue
+            self.comparisons += 1
+            score = matcher.ratio()
+            if score >= threshold:
+                edges[l, r] = score
+
+        for component_left, component_right in self._components(edges):
+            weights = [[edges.get((l, r), 0.0) for r in component_right] for l in component_left]
+            for i, j in _max_weight_assignment(weights):
+                matched[component_left[i]] = (component_right[j], weights[i][j])
+
+        self.forward, self.backward, self.scores = {}, {}, {}
+        self.pairs = [(left_keys[l], right_keys[r], score) for l, (r, score) in sorted(matched.items())]
+        for l, (r, score) in matched.items():
+            first_right = right_rows[r][0]
+            for row in left_rows[l]:
+                self.forward[row] = first_right
+                self.scores[row] = score
+            for row in right_rows[r]:
+                self.backward[row] = left_rows[l][0]
+
+    @staticmethod
+    def _distinct(titles):
+        """Distinct non-empty titles in first-seen order, and the rows carrying each"""
+        keys, rows, position = [], [], {}
+        for row, title in enumerate(titles):
+            if not title:
+                continue
+            if title not in position:
+                position[title] = len(keys)
+                keys.append(title)
+                rows.append([])
+            rows[position[title]].append(row)
+        return keys, rows
+
+    @staticmethod
+    def _components(edges):
+        """Split the candidate graph into connected components, each as (left, right) sorted lists"""
+        parent = {}
+        def find(node):
+            while parent.setdefault(node, node) != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+        for l, r in edges:
+            parent[find(('l', l))] = find(('r', r))
+        groups = defaultdict(lambda: ([], []))
+        for node in list(parent):
+            side, position = node
+            groups[find(node)][0 if side == 'l' else 1].append(position)
+        return [(sorted(left), sorted(right)) for left, right in
+                sorted(groups.values(), key=lambda group: (min(group[0]), min(group[1])))]
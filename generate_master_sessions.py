@@ -7,43 +7,32 @@ from schedule_by_id.xlsx to create a comprehensive sessions.json file.
 
 import pandas as pd
 import numpy as np
-import json
+import argparse
 import html
 import re
 import os
 import sys
 
+import build_artifacts
+import input_cache
+from build_cache import BuildCache, row_fingerprints
+from schedule_grid import melt_schedule_grid, ID_GRID, SESSION_ID
+from session_model import Session, SpecialEvent, SessionsWriter, dump_sessions
+from text_encoding import open_decoded, read_csv_decoded, looks_mojibaked
+from text_cleaning import MOJIBAKE_REPLACEMENTS, TextCleaner
+from time_slots import resolve_slot, time_fields
+
 def fix_common_mojibake(text):
-    """Fix common mojibake patterns in text."""
-    if not isinstance(text, str):
+    """Fix common mojibake patterns in text.
+
+    sessions.csv is decoded (and double-encoding repaired) once when it is read,
+    so this only does work on the rare strings that still look suspicious.
+    """
+    if not looks_mojibaked(text):
         return text
 
-    # Order of replacements can matter if one mojibake is a substring of another,
-    # but for these specific patterns, it should be fine.
-    # More complex (double-encoded) mojibakes first
-    text = text.replace("Ã¢â¬â¢", "’")  # U+2019 RIGHT SINGLE QUOTATION MARK
-    text = text.replace("Ã¢â¬Ëœ", "‘")  # U+2018 LEFT SINGLE QUOTATION MARK
-    text = text.replace("Ã¢â¬Â", "”")  # U+201D RIGHT DOUBLE QUOTATION MARK (corrected from Âť)
-    text = text.replace("Ã¢â¬Å“", "“")  # U+201C LEFT DOUBLE QUOTATION MARK
-    text = text.replace("Ã¢â¬â", "–")  # U+2013 EN DASH
-    text = text.replace("Ã¢â¬â", "—")  # U+2014 EM DASH
-    text = text.replace("Ã¢â¬Â¦", "…")  # U+2026 HORIZONTAL ELLIPSIS
-    
-    # Simpler mojibakes (UTF-8 bytes misread as single-byte encoding)
-    text = text.replace("â€™", "’")
-    text = text.replace("â€˜", "‘")
-    text = text.replace("â€", "”") # Common for right double quote
-    text = text.replace("â€ś", "“") # Common for left double quote
-    text = text.replace("â€“", "–")
-    text = text.replace("â€”", "—")
-    text = text.replace("â€¦", "…")
-    text = text.replace("â‚¬", "€") # Euro sign, just in case
-
-    # Special case for "Ő" and "Ń" from user's calendar.html example if they appear mangled
-    # Example: If "Ő" (U+0150) became "Å" (UTF-8 bytes C5 90 misread as latin1/cp1252)
-    text = text.replace("Å", "Ő") 
-    # Example: If "Ń" (U+0143) became "Å" (UTF-8 bytes C5 83 misread as latin1/cp1252)
-    text = text.replace("Å", "Ń")
+    for mojibake, replacement in MOJIBAKE_REPLACEMENTS:
+        text = text.replace(mojibake, replacement)
 
     return text
 
@@ -109,16 +98,7 @@ def extract_tags(text):
 
 def get_time_for_slot(slot_name):
     """Convert slot name to actual time range"""
-    slot_map = {
-        "Slot 1 (10:15-11:15)": "10:15 - 11:15",
-        "Slot 2 (11:30-12:30)": "11:30 - 12:30",
-        "Slot 3 (1:30-2:30)": "1:30 - 2:30",
-        "Slot 4 (2:45-3:45)": "2:45 - 3:45",
-        "8:00-9:00": "8:00 - 9:00",
-        "9:00-10:00": "9:00 - 10:00",
-        "3:45-4:30": "3:45 - 4:30"
-    }
-    return slot_map.get(slot_name, slot_name)
+    return resolve_slot(slot_name).label
 
 def get_strand_name(strand_number):
     """Get the full strand name based on the strand number"""
@@ -176,230 +156,540 @@ def get_preview(description, max_length=150):
     
     return text_to_preview
 
-def main():
-    print("Processing session data...")
+STRAND_COLUMN = 'Which strand will your presentation be in?'
+FORMAT_COLUMN = 'What is the format of your session?'
+INCLUDED_STRANDS = ['1', '2']
+
+def find_tags_column(sessions_csv):
+    """Return the actual name of the Tags column (the export adds a trailing newline), or None"""
+    for col_name in sessions_csv.columns:
+        if col_name.strip() == 'Tags': # .strip() handles potential leading/trailing whitespace/newlines
+            print(f"INFO: Identified tags column as: '{col_name}' (original pandas name: '{col_name}')")
+            return col_name # Use the original column name as found in sessions_csv.columns
+
+    print(f"WARNING: 'Tags' column not found after checking all CSV columns: {sessions_csv.columns.tolist()}")
+    # Tags will be empty for all sessions if not found.
+    return None
+
+def parse_schedule_grid(schedule_excel):
+    """
+    Read the session-ID grid from schedule_by_id.xlsx.
+
+    Returns (session_schedule, special_events): a dict of session ID -> list of
+    occurrences, and a list of the non-numeric cells (registration, keynote, ...).
+    """
+    cells = melt_schedule_grid(schedule_excel, grid_format=ID_GRID)
+    # Each slot is resolved once; its start/end minutes and day go next to the label
+    slots = {slot: resolve_slot(slot) for slot in cells['slot'].unique()}
+
+    session_schedule = {}
     
-    try:
-        sessions_csv = pd.read_csv('sessions.csv', encoding='utf-8', on_bad_lines='warn')
-        schedule_excel = pd.read_excel('schedule_by_id.xlsx')
+    # Create a list to store special events (non-session entries)
+    special_events = []
+
+    for kind, slot, room, session_id, title in zip(cells['kind'], cells['slot'], cells['room'],
+                                                   cells['session_id'], cells['title']):
+        if kind == SESSION_ID:
+            session_schedule.setdefault(int(session_id), []).append({
+                'location': room,
+                'timeBlock': slots[slot].label,
+                **time_fields(slots[slot])
+            })
+        else:
+            # This is a special event, not a session ID
+            special_events.append({
+                'title': title,
+                'location': room,
+                'timeBlock': slots[slot].label,
+                **time_fields(slots[slot]),
+                'isSpecialEvent': True
+            })
+
+    return session_schedule, special_events
+
+def build_sessions_rowwise(sessions_csv, session_schedule, identified_tags_col):
+    """
+    Build the regular session entries one CSV row at a time.
+
+    This is the original ingestion loop, kept for debugging individual rows
+    (it prints a trace for every row). Returns (sessions_json, valid_strand_session_ids, stats).
+    """
+    sessions_json = []
+    processed_session_ids = []
+    skipped_due_to_id = 0
+    skipped_due_to_strand = 0
+
+    for idx, row in sessions_csv.iterrows():
+        session_id_val = row.get('sessionID')
+        # Skip header rows or empty rows or non-numeric session IDs
+        if pd.isna(session_id_val) or not str(session_id_val).isdigit():
+            print(f"DEBUG: Skipping CSV row {idx+2} due to sessionID: '{session_id_val}' (type: {type(session_id_val)})")
+            skipped_due_to_id += 1
+            continue
+            
+        session_id = int(session_id_val)
+        session = {} # Initialize session dictionary HERE
+        session['id'] = session_id
+        session['isSpecialEvent'] = False # Default for CSV sessions
+
+        # Get strand number from "Which strand will your presentation be in?" column
+        raw_strand_column_value = row.get(STRAND_COLUMN)
+        print(f"DEBUG: Row {idx+2}, ID {session_id}: Raw value from '{STRAND_COLUMN}' column: '{raw_strand_column_value}' (type: {type(raw_strand_column_value)})")
+
+        strand_text_raw = str(raw_strand_column_value) if pd.notna(raw_strand_column_value) else ''
+        strand_text = strand_text_raw.strip() # Apply strip()
+        strand_number = '0' # Default if not found
         
-        print(f"CSV Columns as read by pandas: {sessions_csv.columns.tolist()}")
-        print(f"Read {len(sessions_csv)} sessions from CSV")
-        print(f"Read {len(schedule_excel)} schedule rows from Excel")
+        # Enhanced Debugging for strand processing
+        print(f"DEBUG: Row {idx+2}, ID {session_id}: Raw strand_text='{strand_text_raw}', Stripped strand_text='{strand_text}'")
+
+        if isinstance(strand_text, str) and strand_text.startswith('Strand'): # Check if it starts with 'Strand'
+            match = re.search(r'Strand\s*(\d+)', strand_text) # CORRECTED REGEX
+            if match:
+                strand_number = match.group(1)
+                print(f"DEBUG: Row {idx+2}, ID {session_id}: Regex MATCHED. strand_number='{strand_number}'")
+            else:
+                print(f"DEBUG: Row {idx+2}, ID {session_id}: Regex NO MATCH on '{strand_text}'.")
+        else:
+            print(f"DEBUG: Row {idx+2}, ID {session_id}: strand_text ('{strand_text}') not string or not starts with 'Strand'.")
 
-        # Determine the actual tags column name
-        identified_tags_col = None
-        for col_name in sessions_csv.columns:
-            if col_name.strip() == 'Tags': # .strip() handles potential leading/trailing whitespace/newlines
-                identified_tags_col = col_name # Use the original column name as found in sessions_csv.columns
-                print(f"INFO: Identified tags column as: '{identified_tags_col}' (original pandas name: '{col_name}')")
-                break
-        
-        if not identified_tags_col:
-            print(f"WARNING: 'Tags' column not found after checking all CSV columns: {sessions_csv.columns.tolist()}")
-            # Tags will be empty for all sessions if not found.
+        session['strand'] = get_strand_name(strand_number) # Store full strand name
+        session['strand_number_debug'] = strand_number # Store raw extracted number for debugging
 
-        session_schedule = {}
+        # Extract session type
+        _raw_session_type_for_type = row.get(FORMAT_COLUMN)
+        session['type'] = normalize_session_type(_raw_session_type_for_type)
         
-        # Create a list to store special events (non-session entries)
-        special_events = []
+        _raw_session_type_for_typeName = row.get(FORMAT_COLUMN, 'Workshop')
+        session['typeName'] = get_type_name(str(_raw_session_type_for_typeName) if pd.notna(_raw_session_type_for_typeName) else 'Workshop')
+
+        # Title
+        _title_val = row.get('Session Title')
+        _title_val = fix_common_mojibake(str(_title_val)) if pd.notna(_title_val) else None
+        session['title'] = None if _title_val is None or str(_title_val).strip() == "" else html_encode_but_preserve_quotes(_title_val)
+
+        # Presenter
+        _presenter_val = row.get('Name2')
+        _presenter_val = fix_common_mojibake(str(_presenter_val)) if pd.notna(_presenter_val) else None
+        session['presenter'] = None if _presenter_val is None or str(_presenter_val).strip() == "" else html_encode_but_preserve_quotes(_presenter_val)
+
+        # Organization
+        _organization_val = row.get('School or Organization')
+        _organization_val = fix_common_mojibake(str(_organization_val)) if pd.notna(_organization_val) else None
+        session['organization'] = None if _organization_val is None or str(_organization_val).strip() == "" else html_encode_but_preserve_quotes(_organization_val)
+
+        # Description
+        _description_val = row.get('Session Description')
+        _description_val = fix_common_mojibake(str(_description_val)) if pd.notna(_description_val) else None
+        session['description'] = None if _description_val is None or str(_description_val).strip() == "" else html_encode_but_preserve_quotes(_description_val)
         
-        # Process the schedule Excel file
-        for _, row in schedule_excel.iterrows():
-            time_slot = row['Time Slot']
-            
-            # Skip rows without a time slot
-            if pd.isna(time_slot):
-                continue
-                
-            # Process each room column
-            for room in schedule_excel.columns[1:]:  # Skip the Time Slot column
-                cell_value = row[room]
-                
-                # Skip empty cells
-                if pd.isna(cell_value):
-                    continue
-                    
-                # Try to convert to integer if it's a session ID
-                try:
-                    session_id = int(cell_value)
-                    if session_id not in session_schedule:
-                        session_schedule[session_id] = []
-                    
-                    session_schedule[session_id].append({
-                        'location': room,
-                        'timeBlock': get_time_for_slot(time_slot)
-                    })
-                except (ValueError, TypeError):
-                    # This is a special event, not a session ID
-                    special_events.append({
-                        'title': str(cell_value),
-                        'location': room,
-                        'timeBlock': get_time_for_slot(time_slot),
-                        'isSpecialEvent': True
-                    })
-        
-        # Create the sessions JSON structure
-        sessions_json = []
+        session['descriptionPreview'] = get_preview(session['description'])
+
+        # Tags
+        if identified_tags_col: # Check if the tags column was found
+            tags_text = row.get(identified_tags_col, '') # Use the identified column name
+            session['tags'] = extract_tags(fix_common_mojibake(str(tags_text)) if pd.notna(tags_text) else '')
+        else:
+            session['tags'] = [] # Default to empty list if tags column wasn\'t found
+            print(f"DEBUG: Row {idx+2}, ID {session_id}: No identified_tags_col. Tags set to [].")
+
+        # Schedule information (location and time)
+        if session_id in session_schedule:
+            session['occurrences'] = session_schedule[session_id]
+            # For simplicity, take the first occurrence\'s time and location for top-level fields
+            # These might be overridden or handled differently in the JS rendering logic
+            session['location'] = session_schedule[session_id][0]['location']
+            session['timeBlock'] = session_schedule[session_id][0]['timeBlock']
+        else:
+            session['occurrences'] = []
+            session['location'] = "TBD"
+            session['timeBlock'] = "TBD"
+            print(f"WARNING: Session ID {session_id} from CSV not found in schedule_excel. Setting TBD.")
+
+        # MODIFICATION: Filter for Strand 1 and Strand 2 only - MOVED HERE
+        if strand_number not in INCLUDED_STRANDS:
+            print(f"DEBUG: Row {idx+2}, ID {session_id}, Title '{session.get('title', 'N/A')}': SKIPPING due to final strand_number='{strand_number}' (after session object creation)")
+            skipped_due_to_strand += 1
+            continue
         
-        # First, process regular sessions from CSV
-        processed_session_ids = []
-        skipped_due_to_id = 0
-        skipped_due_to_strand = 0
-
-        for idx, row in sessions_csv.iterrows():
-            session_id_val = row.get('sessionID')
-            # Skip header rows or empty rows or non-numeric session IDs
-            if pd.isna(session_id_val) or not str(session_id_val).isdigit():
-                print(f"DEBUG: Skipping CSV row {idx+2} due to sessionID: '{session_id_val}' (type: {type(session_id_val)})")
-                skipped_due_to_id += 1
-                continue
-                
-            session_id = int(session_id_val)
-            session = {} # Initialize session dictionary HERE
-            session['id'] = session_id
-            session['isSpecialEvent'] = False # Default for CSV sessions
-
-            # Get strand number from "Which strand will your presentation be in?" column
-            raw_strand_column_value = row.get('Which strand will your presentation be in?')
-            print(f"DEBUG: Row {idx+2}, ID {session_id}: Raw value from 'Which strand will your presentation be in?' column: '{raw_strand_column_value}' (type: {type(raw_strand_column_value)})")
-
-            strand_text_raw = str(raw_strand_column_value) if pd.notna(raw_strand_column_value) else ''
-            strand_text = strand_text_raw.strip() # Apply strip()
-            strand_number = '0' # Default if not found
-            
-            # Enhanced Debugging for strand processing
-            print(f"DEBUG: Row {idx+2}, ID {session_id}: Raw strand_text='{strand_text_raw}', Stripped strand_text='{strand_text}'")
-
-            if isinstance(strand_text, str) and strand_text.startswith('Strand'): # Check if it starts with 'Strand'
-                match = re.search(r'Strand\s*(\d+)', strand_text) # CORRECTED REGEX
-                if match:
-                    strand_number = match.group(1)
-                    print(f"DEBUG: Row {idx+2}, ID {session_id}: Regex MATCHED. strand_number='{strand_number}'")
-                else:
-                    print(f"DEBUG: Row {idx+2}, ID {session_id}: Regex NO MATCH on '{strand_text}'.")
+        sessions_json.append(Session.from_dict(session))
+        processed_session_ids.append(session_id) # Keep track of processed IDs
+
+    # REVERT valid_strand_session_ids TO ORIGINAL LOGIC
+    valid_strand_session_ids = set()
+    for _, r_csv in sessions_csv.iterrows(): # Use r_csv to avoid conflict with outer 'row'
+        if pd.notna(r_csv.get('sessionID')) and str(r_csv.get('sessionID')).isdigit():
+            s_text = r_csv.get(STRAND_COLUMN, '') # s_text for strand_text
+            s_number = '0' # s_number for strand_number
+            if isinstance(s_text, str) and 'Strand' in s_text:
+                m = re.search(r'Strand\s+(\d+)', s_text) # Changed to raw string
+                if m:
+                    s_number = m.group(1)
+            if s_number in INCLUDED_STRANDS:
+                valid_strand_session_ids.add(int(r_csv['sessionID']))
+
+    stats = {
+        'processed_session_ids': processed_session_ids,
+        'skipped_due_to_id': skipped_due_to_id,
+        'skipped_due_to_strand': skipped_due_to_strand,
+    }
+    return sessions_json, valid_strand_session_ids, stats
+
+def _csv_column(sessions_csv, name):
+    """Return a CSV column, or an all-missing column when it is absent (the columnar row.get)"""
+    if name in sessions_csv.columns:
+        return sessions_csv[name]
+    return pd.Series(np.nan, index=sessions_csv.index, dtype=object)
+
+def build_sessions_columnar(sessions_csv, session_schedule, identified_tags_col, cleaner=None,
+                            text_cache=None):
+    """
+    Build the regular session entries with whole-column operations.
+
+    Produces the same entries as build_sessions_rowwise, but strand and type are
+    derived once per column, rows outside the included strands are dropped before
+    any text cleaning, and the free-text fields go through a memoized TextCleaner
+    (pass one in to share its cache and statistics across calls).
+
+    text_cache (incremental builds, see build_cache) maps str(sessionID) to a
+    row fingerprint and that row's cleaned text fields. Rows whose fingerprint
+    is unchanged reuse the cached fields; the dict is updated in place to hold
+    exactly the rows of this build.
+    Returns (sessions_json, valid_strand_session_ids, stats).
+    """
+    if cleaner is None:
+        cleaner = TextCleaner()
+
+    raw_ids = _csv_column(sessions_csv, 'sessionID')
+    valid_id = (raw_ids.notna() & raw_ids.astype(str).str.isdigit().fillna(False)).astype(bool)
+    skipped_due_to_id = int((~valid_id).sum())
+    for idx in sessions_csv.index[~valid_id]:
+        print(f"DEBUG: Skipping CSV row {idx+2} due to sessionID: '{raw_ids[idx]}'")
+
+    csv = sessions_csv[valid_id]
+    session_ids = csv['sessionID'].astype(str).astype(int)
+
+    # Strand number: 'Strand <n>' at the start of the (stripped) strand answer
+    strand_raw = _csv_column(csv, STRAND_COLUMN)
+    strand_text = strand_raw.fillna("").astype(str).str.strip()
+    strand_number = strand_text.str.extract(r'Strand\s*(\d+)', expand=False)
+    strand_number = strand_number.where(strand_text.str.startswith('Strand') & strand_number.notna(), '0')
+
+    # The schedule cross-check historically used a looser match ('Strand' anywhere, \s+)
+    loose_number = strand_raw.fillna("").astype(str).str.extract(r'Strand\s+(\d+)', expand=False)
+    valid_strand_session_ids = set(session_ids[loose_number.isin(INCLUDED_STRANDS)].tolist())
+
+    unscheduled = ~session_ids.isin(list(session_schedule.keys()))
+    for session_id in session_ids[unscheduled]:
+        print(f"WARNING: Session ID {session_id} from CSV not found in schedule_excel. Setting TBD.")
+
+    keep = strand_number.isin(INCLUDED_STRANDS)
+    skipped_due_to_strand = int((~keep).sum())
+    if skipped_due_to_strand:
+        print(f"DEBUG: Skipping {skipped_due_to_strand} rows outside strands {INCLUDED_STRANDS}: "
+              f"{session_ids[~keep].tolist()}")
+
+    csv = csv[keep]
+    session_ids = session_ids[keep]
+    strand_number = strand_number[keep]
+
+    # Small-cardinality columns: resolve each distinct value once, then map
+    strand_names = strand_number.map({n: get_strand_name(n) for n in strand_number.unique()})
+    format_raw = _csv_column(csv, FORMAT_COLUMN)
+    types = format_raw.map({v: normalize_session_type(v) for v in format_raw.dropna().unique()}).fillna("default")
+    format_text = format_raw.fillna('Workshop').astype(str)
+    type_names = format_text.map({v: get_type_name(v) for v in format_text.unique()})
+
+    # Incremental builds only clean the rows that changed since the cached build
+    if text_cache is not None:
+        fingerprints = row_fingerprints(csv)
+        fresh = np.array([text_cache.get(str(session_id), {}).get('fingerprint') != fingerprint
+                          for session_id, fingerprint in zip(session_ids.tolist(), fingerprints)], dtype=bool)
+    else:
+        fresh = np.ones(len(csv), dtype=bool)
+    to_clean = csv[fresh]
+
+    # Free text: one fused, memoized pass per value
+    titles = [cleaner.clean(v, 'title') for v in _csv_column(to_clean, 'Session Title').tolist()]
+    presenters = [cleaner.clean(v, 'presenter') for v in _csv_column(to_clean, 'Name2').tolist()]
+    organizations = [cleaner.clean(v, 'organization') for v in _csv_column(to_clean, 'School or Organization').tolist()]
+    descriptions, previews = [], []
+    for v in _csv_column(to_clean, 'Session Description').tolist():
+        description, preview = cleaner.clean_description(v)
+        descriptions.append(description)
+        previews.append(preview)
+
+    if identified_tags_col:
+        tags = [cleaner.tags(v) for v in to_clean[identified_tags_col].tolist()]
+    else:
+        tags = [[] for _ in range(len(to_clean))]
+
+    cleaned = zip(titles, presenters, organizations, descriptions, previews, tags)
+    if text_cache is None:
+        text_fields = list(cleaned)
+    else:
+        text_fields, kept = [], {}
+        for session_id, fingerprint, is_fresh in zip(session_ids.tolist(), fingerprints, fresh):
+            if is_fresh:
+                kept[str(session_id)] = {'fingerprint': fingerprint, 'fields': list(next(cleaned))}
+            else:
+                kept[str(session_id)] = text_cache[str(session_id)]
+            text_fields.append(kept[str(session_id)]['fields'])
+        text_cache.clear()
+        text_cache.update(kept)
+
+    sessions_json = []
+    columns = zip(session_ids.tolist(), strand_names.tolist(), strand_number.tolist(),
+                  types.tolist(), type_names.tolist(), text_fields)
+    for (session_id, strand_name, number, session_type, type_name,
+         (title, presenter, organization, description, preview, session_tags)) in columns:
+        occurrences = session_schedule.get(session_id, [])
+        sessions_json.append(Session(
+            id=session_id,
+            is_special_event=False,
+            strand=strand_name,
+            strand_number=number,
+            type=session_type,
+            type_name=type_name,
+            title=title,
+            presenter_name=presenter,
+            organization=organization,
+            description=description,
+            preview=preview,
+            tags=session_tags,
+            occurrences=occurrences,
+            location=occurrences[0]['location'] if occurrences else "TBD",
+            time_block=occurrences[0]['timeBlock'] if occurrences else "TBD",
+        ))
+
+    stats = {
+        'processed_session_ids': session_ids.tolist(),
+        'skipped_due_to_id': skipped_due_to_id,
+        'skipped_due_to_strand': skipped_due_to_strand,
+        'cleaned_rows': int(fresh.sum()),
+    }
+    return sessions_json, valid_strand_session_ids, stats
+
+def build_special_event_entries(special_events, first_index):
+    """Turn the non-numeric schedule cells into sessions.json entries"""
+    entries = []
+    for event in special_events:
+        entries.append(SpecialEvent(
+            id=f"special_{first_index + len(entries) + 1}_{event['title'].replace(' ','_')[:20]}", # Generate a more unique ID
+            strand='special',
+            strand_name='Special Event',
+            type='special',
+            type_name='Special Event',
+            title=event['title'],
+            presenter_name='',
+            email='',
+            organization='',
+            description=f"Special event: {event['title']}",
+            preview=f"Special event: {event['title']}",
+            time_block=event['timeBlock'], # Direct timeBlock for special events
+            start_minutes=event['startMinutes'],
+            end_minutes=event['endMinutes'],
+            day=event['day'],
+            location=event['location'],   # Direct location for special events
+            tags=['Special Event'],
+            is_special_event=True
+            # No occurrences for special events by default, they are single events
+        ))
+    return entries
+
+# Streaming ingestion: rows per CSV chunk, and the most values each TextCleaner memo keeps
+DEFAULT_CHUNK_SIZE = 10000
+STREAM_MEMO_ENTRIES = 50000
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where the resource module is missing"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def format_rss(peak):
+    return "n/a" if peak is None else f"{peak:.1f} MB"
+
+def stream_regular_sessions(csv_chunks, session_schedule, cleaner, totals):
+    """
+    Yield the regular session entries chunk by chunk.
+
+    Each chunk goes through build_sessions_columnar on its own; nothing but
+    the counters in totals and the schedule IDs not yet matched to a CSV row
+    is kept between chunks.
+    """
+    identified_tags_col = None
+    for number, chunk in enumerate(csv_chunks, 1):
+        if number == 1:
+            print(f"CSV Columns as read by pandas: {chunk.columns.tolist()}")
+            identified_tags_col = find_tags_column(chunk)
+        entries, valid_strand_session_ids, stats = build_sessions_columnar(
+            chunk, session_schedule, identified_tags_col, cleaner)
+        totals['rows'] += len(chunk)
+        totals['skipped_due_to_id'] += stats['skipped_due_to_id']
+        totals['skipped_due_to_strand'] += stats['skipped_due_to_strand']
+        totals['unknown_schedule_ids'] -= valid_strand_session_ids
+        print(f"Chunk {number}: {len(chunk)} rows, {len(entries)} sessions "
+              f"(peak RSS {format_rss(peak_rss_mb())})")
+        yield from entries
+
+def generate_streaming(chunk_size):
+    """
+    Build sessions.json from sessions.csv in chunks of chunk_size rows.
+
+    Produces the same file as the columnar path, but records are written as
+    they are built and the debug lists of every processed ID are replaced by
+    counts, so memory stays flat however large the export is.
+    """
+    schedule_excel = input_cache.read_excel('schedule_by_id.xlsx')
+    print(f"Read {len(schedule_excel)} schedule rows from Excel")
+    session_schedule, special_events = parse_schedule_grid(schedule_excel)
+
+    cleaner = TextCleaner(max_entries=STREAM_MEMO_ENTRIES)
+    totals = {'rows': 0, 'skipped_due_to_id': 0, 'skipped_due_to_strand': 0,
+              'unknown_schedule_ids': set(session_schedule.keys())}
+    regular_count = special_count = scheduled_regular = scheduled_special = 0
+    unscheduled_count, unscheduled_examples = 0, []
+
+    stream, encoding = open_decoded('sessions.csv')
+    print(f"INFO: sessions.csv decoded as {encoding}")
+    with stream, SessionsWriter('sessions.json') as writer:
+        csv_chunks = pd.read_csv(stream, chunksize=chunk_size, on_bad_lines='warn')
+        for session in stream_regular_sessions(csv_chunks, session_schedule, cleaner, totals):
+            writer.write(session)
+            regular_count += 1
+            if session.occurrences:
+                scheduled_regular += 1
             else:
-                print(f"DEBUG: Row {idx+2}, ID {session_id}: strand_text ('{strand_text}') not string or not starts with 'Strand'.")
+                unscheduled_count += 1
+                if len(unscheduled_examples) < 5:
+                    unscheduled_examples.append((session.id, session.title))
+        for event in build_special_event_entries(special_events, regular_count):
+            writer.write(event)
+            special_count += 1
+            if event.time_block and event.location:
+                scheduled_special += 1
+    cleaner.report()
+
+    print(f"Read {totals['rows']} sessions from CSV in chunks of {chunk_size}")
+    print(f"Skipped {totals['skipped_due_to_id']} rows due to ID issues.")
+    print(f"DEBUG: Rows skipped due to strand issues: {totals['skipped_due_to_strand']}")
+    if unscheduled_count:
+        print(f"Warning: {unscheduled_count} regular sessions (Strands 1 & 2) are unscheduled or have no occurrence data:")
+        for sid, title in unscheduled_examples:
+            print(f"  ID: {sid}, Title: {title}")
+        if unscheduled_count > 5:
+            print(f"  ... and {unscheduled_count - 5} more")
+    unknown_schedule_ids = totals['unknown_schedule_ids']
+    if unknown_schedule_ids:
+        print(f"Warning: {len(unknown_schedule_ids)} schedule entries have IDs not in the processed sessions CSV (e.g., wrong strand or missing from CSV):")
+        for sid in list(unknown_schedule_ids)[:5]:
+            first_occurrence = session_schedule[sid][0]
+            print(f"  ID: {sid}, First Occurrence: Location: {first_occurrence['location']}, Time: {first_occurrence['timeBlock']}")
+        if len(unknown_schedule_ids) > 5:
+            print(f"  ... and {len(unknown_schedule_ids) - 5} more")
+
+    print(f"\nSuccessfully wrote {writer.count} entries to sessions.json")
+    print(f"\nSummary:")
+    print(f"- Regular session entries (Strands 1 & 2 only): {regular_count}")
+    print(f"- Special event entries: {special_count}")
+    print(f"- Scheduled regular sessions (with occurrences): {scheduled_regular}")
+    print(f"- Scheduled special events (with time/location): {scheduled_special}")
+    print(f"- Total scheduled entries in JSON: {scheduled_regular + scheduled_special}")
+    print(f"- Unscheduled regular sessions (Strands 1 & 2 without occurrences): {unscheduled_count}")
+    print(f"- Peak RSS: {format_rss(peak_rss_mb())}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate sessions.json from sessions.csv and schedule_by_id.xlsx")
+    parser.add_argument('--ingest', choices=['columnar', 'rows', 'stream'], default='columnar',
+                        help="columnar (default) builds every field as a whole-column operation; "
+                             "rows is the original per-row loop with a debug trace for each row; "
+                             "stream runs the columnar path over chunks of the CSV and writes "
+                             "sessions.json as it goes, for exports too large to hold in memory")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"CSV rows per chunk with --ingest stream (default {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument('--incremental', action='store_true',
+                        help="skip the build when no input changed, and only re-clean the CSV rows "
+                             "that changed since the last incremental build (columnar ingestion only)")
+    args = parser.parse_args(argv)
+    if args.incremental and args.ingest != 'columnar':
+        parser.error("--incremental requires --ingest columnar")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    build_cache = None
+    if args.incremental:
+        build_cache = BuildCache(['sessions.csv', 'schedule_by_id.xlsx'], 'sessions.json')
+        if build_cache.up_to_date():
+            print("sessions.json is up to date: no input has changed since the last build.")
+            # The cache only covers sessions.json; the derived files may be stale or missing
+            print("Build artifacts:")
+            build_artifacts.print_report(build_artifacts.build('sessions.json'))
+            return 0
 
-            session['strand'] = get_strand_name(strand_number) # Store full strand name
-            session['strand_number_debug'] = strand_number # Store raw extracted number for debugging
+    print("Processing session data...")
+    
+    try:
+        if args.ingest == 'stream':
+            generate_streaming(args.chunk_size)
+            # The derived files the pages fetch must follow the new sessions.json too
+            print("Build artifacts:")
+            build_artifacts.print_report(build_artifacts.build('sessions.json'))
+            return 0
+
+        sessions_csv = read_csv_decoded('sessions.csv', on_bad_lines='warn')
+        schedule_excel = input_cache.read_excel('schedule_by_id.xlsx')
+        
+        print(f"CSV Columns as read by pandas: {sessions_csv.columns.tolist()}")
+        print(f"Read {len(sessions_csv)} sessions from CSV")
+        print(f"Read {len(schedule_excel)} schedule rows from Excel")
 
-            # Extract session type
-            _raw_session_type_for_type = row.get('What is the format of your session?')
-            session['type'] = normalize_session_type(_raw_session_type_for_type)
-            
-            _raw_session_type_for_typeName = row.get('What is the format of your session?', 'Workshop')
-            session['typeName'] = get_type_name(str(_raw_session_type_for_typeName) if pd.notna(_raw_session_type_for_typeName) else 'Workshop')
-
-            # Title
-            _title_val = row.get('Session Title')
-            _title_val = fix_common_mojibake(str(_title_val)) if pd.notna(_title_val) else None
-            session['title'] = None if _title_val is None or str(_title_val).strip() == "" else html_encode_but_preserve_quotes(_title_val)
-
-            # Presenter
-            _presenter_val = row.get('Name2')
-            _presenter_val = fix_common_mojibake(str(_presenter_val)) if pd.notna(_presenter_val) else None
-            session['presenter'] = None if _presenter_val is None or str(_presenter_val).strip() == "" else html_encode_but_preserve_quotes(_presenter_val)
-
-            # Organization
-            _organization_val = row.get('School or Organization')
-            _organization_val = fix_common_mojibake(str(_organization_val)) if pd.notna(_organization_val) else None
-            session['organization'] = None if _organization_val is None or str(_organization_val).strip() == "" else html_encode_but_preserve_quotes(_organization_val)
-
-            # Description
-            _description_val = row.get('Session Description')
-            _description_val = fix_common_mojibake(str(_description_val)) if pd.notna(_description_val) else None
-            session['description'] = None if _description_val is None or str(_description_val).strip() == "" else html_encode_but_preserve_quotes(_description_val)
-            
-            session['descriptionPreview'] = get_preview(session['description'])
+        # Determine the actual tags column name
+        identified_tags_col = find_tags_column(sessions_csv)
 
-            # Tags
-            if identified_tags_col: # Check if the tags column was found
-                tags_text = row.get(identified_tags_col, '') # Use the identified column name
-                session['tags'] = extract_tags(fix_common_mojibake(str(tags_text)) if pd.notna(tags_text) else '')
-            else:
-                session['tags'] = [] # Default to empty list if tags column wasn\'t found
-                print(f"DEBUG: Row {idx+2}, ID {session_id}: No identified_tags_col. Tags set to [].")
-
-            # Schedule information (location and time)
-            if session_id in session_schedule:
-                session['occurrences'] = session_schedule[session_id]
-                # For simplicity, take the first occurrence\'s time and location for top-level fields
-                # These might be overridden or handled differently in the JS rendering logic
-                session['location'] = session_schedule[session_id][0]['location']
-                session['timeBlock'] = session_schedule[session_id][0]['timeBlock']
-            else:
-                session['occurrences'] = []
-                session['location'] = "TBD"
-                session['timeBlock'] = "TBD"
-                print(f"WARNING: Session ID {session_id} from CSV not found in schedule_excel. Setting TBD.")
-
-            # MODIFICATION: Filter for Strand 1 and Strand 2 only - MOVED HERE
-            if strand_number not in ['1', '2']:
-                print(f"DEBUG: Row {idx+2}, ID {session_id}, Title '{session.get('title', 'N/A')}': SKIPPING due to final strand_number='{strand_number}' (after session object creation)")
-                skipped_due_to_strand += 1
-                continue
-            
-            sessions_json.append(session)
-            processed_session_ids.append(session_id) # Keep track of processed IDs
+        session_schedule, special_events = parse_schedule_grid(schedule_excel)
         
-        print(f"Skipped {skipped_due_to_id} rows due to ID issues.")
-        print(f"DEBUG: Total CSV rows processed for session data: {len(processed_session_ids)}")
-        print(f"DEBUG: Session IDs processed: {processed_session_ids}")
-        print(f"DEBUG: Rows skipped due to sessionID issues: {skipped_due_to_id}")
-        print(f"DEBUG: Rows skipped due to strand issues: {skipped_due_to_strand}")
+        # Create the sessions JSON structure, starting with regular sessions from CSV
+        if args.ingest == 'columnar':
+            cleaner = TextCleaner()
+            text_cache = build_cache.text_cache(sessions_csv.columns) if build_cache else None
+            sessions_json, valid_strand_session_ids, stats = build_sessions_columnar(
+                sessions_csv, session_schedule, identified_tags_col, cleaner, text_cache)
+            cleaner.report()
+            if build_cache:
+                moved = build_cache.changed_schedule(session_schedule)
+                print(f"Incremental build: cleaned {stats['cleaned_rows']} of "
+                      f"{len(stats['processed_session_ids'])} session rows; "
+                      f"schedule cells changed for {len(moved)} sessions")
+        else:
+            sessions_json, valid_strand_session_ids, stats = build_sessions_rowwise(
+                sessions_csv, session_schedule, identified_tags_col)
         
-        # Then, add special events (structure remains unchanged for special events)
-        for event in special_events:
-            session = {
-                'id': f"special_{len(sessions_json) + 1}_{event['title'].replace(' ','_')[:20]}", # Generate a more unique ID
-                'strand': 'special',
-                'strandName': 'Special Event',
-                'type': 'special',
-                'typeName': 'Special Event',
-                'title': event['title'],
-                'presenter': '',
-                'email': '',
-                'organization': '',
-                'description': f"Special event: {event['title']}",
-                'preview': f"Special event: {event['title']}",
-                'timeBlock': event['timeBlock'], # Direct timeBlock for special events
-                'location': event['location'],   # Direct location for special events
-                'tags': ['Special Event'],
-                'isSpecialEvent': True
-                # No 'occurrences' field for special events by default, they are single events
-            }
-            sessions_json.append(session)
+        print(f"Skipped {stats['skipped_due_to_id']} rows due to ID issues.")
+        print(f"DEBUG: Total CSV rows processed for session data: {len(stats['processed_session_ids'])}")
+        print(f"DEBUG: Session IDs processed: {stats['processed_session_ids']}")
+        print(f"DEBUG: Rows skipped due to sessionID issues: {stats['skipped_due_to_id']}")
+        print(f"DEBUG: Rows skipped due to strand issues: {stats['skipped_due_to_strand']}")
         
+        # Then, add special events (structure remains unchanged for special events)
+        sessions_json.extend(build_special_event_entries(special_events, len(sessions_json)))
         # MODIFICATION: Update check for unscheduled sessions
-        unscheduled_sessions_ids = [s['id'] for s in sessions_json 
-                                   if not s.get('isSpecialEvent') and (not s.get('occurrences') or len(s['occurrences']) == 0)]
+        unscheduled_sessions_ids = [s.id for s in sessions_json
+                                   if not s.is_special_event and not s.occurrences]
         if unscheduled_sessions_ids:
             print(f"Warning: {len(unscheduled_sessions_ids)} regular sessions (Strands 1 & 2) are unscheduled or have no occurrence data:")
             for sid in unscheduled_sessions_ids[:5]:
-                session_details = next((s for s in sessions_json if s['id'] == sid), None)
+                session_details = next((s for s in sessions_json if s.id == sid), None)
                 if session_details:
-                    print(f"  ID: {sid}, Title: {session_details['title']}")
+                    print(f"  ID: {sid}, Title: {session_details.title}")
             if len(unscheduled_sessions_ids) > 5:
                 print(f"  ... and {len(unscheduled_sessions_ids) - 5} more")
         
         # MODIFICATION: Update check for sessions in schedule but not in CSV (or filtered out)
-        all_csv_session_ids = set(int(r['sessionID']) for _, r in sessions_csv.iterrows() 
-                                  if pd.notna(r.get('sessionID')) and str(r.get('sessionID')).isdigit())
-        
-        # REVERT valid_strand_session_ids TO ORIGINAL LOGIC
-        valid_strand_session_ids = set()
-        for _, r_csv in sessions_csv.iterrows(): # Use r_csv to avoid conflict with outer 'row'
-            if pd.notna(r_csv.get('sessionID')) and str(r_csv.get('sessionID')).isdigit():
-                s_text = r_csv.get('Which strand will your presentation be in?', '') # s_text for strand_text
-                s_number = '0' # s_number for strand_number
-                if isinstance(s_text, str) and 'Strand' in s_text:
-                    m = re.search(r'Strand\s+(\d+)', s_text) # Changed to raw string
-                    if m:
-                        s_number = m.group(1)
-                if s_number in ['1', '2']:
-                    valid_strand_session_ids.add(int(r_csv['sessionID']))
-
         scheduled_ids_from_excel = set(session_schedule.keys())
         unknown_schedule_ids = scheduled_ids_from_excel - valid_strand_session_ids
         
@@ -416,24 +706,28 @@ def main():
                 print(f"  ... and {len(unknown_schedule_ids) - 5} more")
         
         # Write the output JSON
-        with open('sessions.json', 'w', encoding='utf-8') as f:
-            json.dump(sessions_json, f, ensure_ascii=False, indent=2)
+        dump_sessions(sessions_json, 'sessions.json')
+        # The minified copy, the listing index and the description shards the pages fetch
+        print("Build artifacts:")
+        build_artifacts.print_report(build_artifacts.build('sessions.json'))
+        if build_cache:
+            build_cache.save(sessions_csv.columns, text_cache, session_schedule)
             
         print(f"\\nSuccessfully wrote {len(sessions_json)} entries to sessions.json")
         
         # MODIFICATION: Update summary statistics
-        regular_sessions_count = sum(1 for s in sessions_json if not s.get('isSpecialEvent', False))
-        special_events_count = sum(1 for s in sessions_json if s.get('isSpecialEvent', False))
+        regular_sessions_count = sum(1 for s in sessions_json if not s.is_special_event)
+        special_events_count = sum(1 for s in sessions_json if s.is_special_event)
         
         # Scheduled regular sessions have non-empty occurrences. Special events have timeBlock.
-        scheduled_regular_with_occurrences = sum(1 for s in sessions_json if 
-                                                 not s.get('isSpecialEvent', False) and s.get('occurrences') and len(s['occurrences']) > 0)
-        scheduled_special_events = sum(1 for s in sessions_json if 
-                                       s.get('isSpecialEvent', False) and s.get('timeBlock') and s.get('location'))
+        scheduled_regular_with_occurrences = sum(1 for s in sessions_json if
+                                                 not s.is_special_event and s.occurrences)
+        scheduled_special_events = sum(1 for s in sessions_json if
+                                       s.is_special_event and s.time_block and s.location)
         total_scheduled_entries = scheduled_regular_with_occurrences + scheduled_special_events
         
-        unscheduled_regular_count = sum(1 for s in sessions_json if 
-                                        not s.get('isSpecialEvent', False) and (not s.get('occurrences') or len(s['occurrences']) == 0))
+        unscheduled_regular_count = sum(1 for s in sessions_json if
+                                        not s.is_special_event and not s.occurrences)
 
         print(f"\\nSummary:")
         print(f"- Regular session entries (Strands 1 & 2 only): {regular_sessions_count}")
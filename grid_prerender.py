@@ -0,0 +1,242 @@
+"""
+Prerendered schedule.html and calendar.html grids
+
+Both pages used to start empty: they downloaded the session data, grouped
+every occurrence by time block and room, sorted rooms and slots and only then
+built the grid in the browser. This module does the same grouping and sorting
+at build time and writes the grids into the pages, between the
+<!-- schedule-grid:start/end --> and <!-- calendar-grid:start/end -->
+comments, so a kiosk or phone shows the schedule on first paint. The markup
+is what renderTimeView() and renderCalendarGrid() build, plus data-*
+attributes the pages use to check that the prerendered grid matches the data
+they load. When it does, the script only attaches the modal to it; when it
+doesn't (sessions.json changed and the pages were not rebuilt), the page
+renders the grid itself as before.
+
+The orderings follow the page scripts: time slots by the startMinutes the
+build writes next to each label (see time_slots.py), or, for data without
+them, by parsing the label with 1:00 to 7:59 read as afternoon; schedule
+cards by room, then title; calendar rooms alphabetically, ignoring case and
+accents.
+"""
+
+import re
+import unicodedata
+
+from card_renderer import Template, write_region
+
+SCHEDULE_START = '<!-- schedule-grid:start -->'
+SCHEDULE_END = '<!-- schedule-grid:end -->'
+CALENDAR_START = '<!-- calendar-grid:start -->'
+CALENDAR_END = '<!-- calendar-grid:end -->'
+
+# Sorts last, like Number.MAX_SAFE_INTEGER in schedule.html
+UNPARSED_TIME = float('inf')
+
+def schedule_slot_minutes(time_slot):
+    """Sort key of a schedule.html time slot: minutes after midnight of its start ('1:30 - 2:30' -> 810)"""
+    if not isinstance(time_slot, str) or ' - ' not in time_slot or ':' not in time_slot:
+        return UNPARSED_TIME
+    parts = time_slot.split(' - ')[0].split(':')
+    if len(parts) != 2:
+        return UNPARSED_TIME
+    try:
+        hours, minutes = int(parts[0]), int(parts[1])
+    except ValueError:
+        return UNPARSED_TIME
+    if 1 <= hours <= 7:
+        hours += 12
+    return hours * 60 + minutes
+
+def calendar_block_minutes(time_block):
+    """Sort key of a calendar.html time block; an hour before 8 without am/pm is afternoon"""
+    time, _, modifier = time_block.split(' - ')[0].partition(' ')
+    try:
+        hours, minutes = (int(part) for part in time.split(':'))
+    except ValueError:
+        return UNPARSED_TIME
+    modifier = modifier.lower()
+    if modifier == 'pm' and hours != 12:
+        hours += 12
+    if modifier == 'am' and hours == 12:
+        hours = 0
+    if not modifier and hours < 8:
+        hours += 12
+    return hours * 60 + minutes
+
+def time_block_starts(sessions):
+    """timeBlock -> startMinutes, the first one found, as timeBlockStarts() in the pages collects them"""
+    starts = {}
+    for session in sessions:
+        for placement in [session] if session.get('isSpecialEvent') else session.get('occurrences') or []:
+            start = placement.get('startMinutes')
+            if isinstance(start, (int, float)) and not isinstance(start, bool):
+                starts.setdefault(placement.get('timeBlock'), start)
+    return starts
+
+def room_sort_key(room):
+    """Close to String.localeCompare: accents and case only break ties"""
+    folded = ''.join(c for c in unicodedata.normalize('NFKD', room) if not unicodedata.combining(c))
+    return folded.casefold(), room.casefold(), room
+
+def type_class(value):
+    return re.sub(r'[^a-z0-9]', '-', value.lower())
+
+def strand_key(strand):
+    """calendar.html's getCanonicalStrandFilterKey"""
+    if not strand or not isinstance(strand, str):
+        return 'unknown-strand'
+    match = re.match(r'(\d+):', strand) or re.search(r'(?i:Strand)\s*(\d+)', strand)
+    if match:
+        return f"strand{match.group(1)}"
+    return re.sub(r'[^a-z0-9-]', '', re.sub(r'\s+', '-', strand.lower())) or 'unknown-strand'
+
+# --- schedule.html time view ---
+
+def schedule_slots(sessions):
+    """[(time slot, [(session, location)])] in the order renderTimeView() shows them"""
+    slots = {}
+    for session in sessions:
+        if session.get('isPlaceholder'):
+            continue
+        if session.get('isSpecialEvent') and session.get('timeBlock'):
+            slots.setdefault(session['timeBlock'], []).append((session, session.get('location') or 'N/A'))
+        elif session.get('occurrences'):
+            for occurrence in session['occurrences']:
+                if occurrence.get('timeBlock') and occurrence.get('location'):
+                    slots.setdefault(occurrence['timeBlock'], []).append((session, occurrence['location']))
+    for entries in slots.values():
+        entries.sort(key=lambda entry: (entry[1] or '', entry[0].get('title') or ''))
+    starts = time_block_starts(sessions)
+    return sorted(slots.items(), key=lambda item: starts.get(item[0], schedule_slot_minutes(item[0])))
+
+TIME_BLOCK_OPEN = Template('<div class="time-block" data-time-block={time_slot:attr}><h2>{time_slot:text}</h2>'
+                           '<div class="sessions-container">')
+TIME_BLOCK_CLOSE = '</div></div>'
+SCHEDULE_CARD_OPEN = Template('<div class={card_class:attr} data-strand={strand:attr} data-type={type:attr} '
+                              'data-session-id={id:attr} data-location={location:attr}>')
+STRAND_INDICATOR = '<div class="strand-indicator"></div>'
+SCHEDULE_CARD_BODY = Template('<div class="session-room">{room:text}</div><div class="session-title">{title:text}</div>')
+SCHEDULE_PRESENTER = Template('<div class="session-presenter">{presenter:text}</div>')
+SCHEDULE_TYPE = Template('<div class={type_class:attr}>{type_name:text}</div>')
+
+def schedule_card(session, location):
+    special = bool(session.get('isSpecialEvent'))
+    strand_name = session.get('strand') or ('special' if special else '')
+    strand_class = re.sub(r'\s+', '', strand_name.lower())
+    pieces = [SCHEDULE_CARD_OPEN.render({
+        'card_class': f"session-card {strand_class}", 'strand': strand_class,
+        'type': type_class(session.get('type') or 'session'), 'id': session.get('id'), 'location': location,
+    })]
+    if not special and strand_name and strand_name != 'special':
+        pieces.append(STRAND_INDICATOR)
+    pieces.append(SCHEDULE_CARD_BODY.render({'room': location or ('' if special else 'N/A'),
+                                             'title': session.get('title') or 'Untitled Session'}))
+    if not special:
+        presenter = session.get('presenter') or session.get('organization') or ''
+        if presenter:
+            pieces.append(SCHEDULE_PRESENTER.render({'presenter': presenter}))
+        pieces.append(SCHEDULE_TYPE.render({
+            'type_class': f"session-type type-{type_class(session.get('type') or 'default')}",
+            'type_name': session.get('typeName') or session.get('type') or 'Session',
+        }))
+    pieces.append('</div>')
+    return ''.join(pieces)
+
+def render_schedule(sessions):
+    """Yield the time view HTML, one time block at a time"""
+    for time_slot, entries in schedule_slots(sessions):
+        yield (TIME_BLOCK_OPEN.render({'time_slot': time_slot})
+               + ''.join(schedule_card(session, location) for session, location in entries)
+               + TIME_BLOCK_CLOSE)
+
+# --- calendar.html grid ---
+
+def calendar_cells(sessions):
+    """(sorted time blocks, sorted rooms, {(time block, room): [session]}) as renderCalendarGrid() groups them"""
+    cells = {}
+    for session in sessions:
+        if session.get('isSpecialEvent'):
+            continue
+        for occurrence in session.get('occurrences') or []:
+            if occurrence.get('timeBlock') and occurrence.get('location'):
+                cells.setdefault((occurrence['timeBlock'], occurrence['location']), []).append(session)
+    starts = time_block_starts(session for session in sessions if not session.get('isSpecialEvent'))
+    time_blocks = sorted(dict.fromkeys(time_block for time_block, _ in cells),
+                         key=lambda time_block: starts.get(time_block, calendar_block_minutes(time_block)))
+    rooms = sorted({room for _, room in cells}, key=room_sort_key)
+    return time_blocks, rooms, cells
+
+CALENDAR_TABLE_OPEN = ('<div style="overflow-x: auto; max-height: 70vh; overflow-y: auto;">'
+                       '<table class="table table-bordered mt-3"><thead><tr>'
+                       '<th class="position-sticky start-0" style="width: 120px; min-width: 120px; '
+                       'background-color: var(--pelican-light); z-index: 2;">Time</th>')
+ROOM_HEADER = Template('<th style="min-width: 200px;">{room:text}</th>')
+CALENDAR_TABLE_CLOSE = '</tbody></table></div>'
+# The light time block colours are dark enough for white text (calendar.html computes the same)
+CALENDAR_ROW_OPEN = Template('<tr class={row_class:attr}><td class="fw-bold position-sticky start-0" '
+                             'style={style:attr}>{time_block:text}</td>')
+CELL_OPEN = '<td class="align-top" style="min-height: 120px;">'
+CALENDAR_CARD = Template(
+    '<div class={card_class:attr} data-session-id={id:attr} data-time-block={time_block:attr} '
+    'data-location={location:attr} style="width: 100%; min-height: 100px; cursor: pointer; '
+    'border: 1px solid #eee; box-shadow: 0 1px 3px rgba(0,0,0,0.05);"><div class="strand-indicator"></div>'
+    '<div class="session-block-body p-2"><h5 class="session-block-title mb-1" '
+    'style="-webkit-line-clamp: 2; font-size: 0.9rem;">{title:text}</h5>')
+CALENDAR_PRESENTER = Template('<p class="session-block-presenter mb-1" '
+                              'style="font-size: 0.75rem; -webkit-line-clamp: 1;">{presenter:text}</p>')
+TYPE_BADGE = Template('<span class="tag tag-more mt-1" style={style:attr}>{type_name:text}</span></div></div>')
+
+def type_badge_colors(session_type):
+    session_type = (session_type or '').lower()
+    if 'workshop' in session_type:
+        return 'var(--lc-red)', 'white'
+    if 'presentation' in session_type:
+        return 'var(--meadow)', 'var(--lc-gray)'
+    if 'discussion' in session_type:
+        return 'var(--brick)', 'white'
+    return 'var(--pelican)', 'var(--lc-gray)'
+
+def calendar_card(session, time_block, location):
+    pieces = [CALENDAR_CARD.render({
+        'card_class': f"session-block mb-2 {strand_key(session.get('strand'))}", 'id': session.get('id'),
+        'time_block': time_block, 'location': location, 'title': session.get('title') or '',
+    })]
+    if session.get('presenter'):
+        pieces.append(CALENDAR_PRESENTER.render({'presenter': session['presenter']}))
+    background, color = type_badge_colors(session.get('type'))
+    pieces.append(TYPE_BADGE.render({
+        'style': f"font-size: 0.65rem; background-color: {background}; color: {color};",
+        'type_name': session.get('typeName') or session.get('type') or '',
+    }))
+    return ''.join(pieces)
+
+def render_calendar(sessions):
+    """Yield the calendar table HTML, one row at a time; nothing when no session is scheduled"""
+    time_blocks, rooms, cells = calendar_cells(sessions)
+    if not time_blocks:
+        return
+    yield CALENDAR_TABLE_OPEN + ''.join(ROOM_HEADER.render({'room': room}) for room in rooms) + '</tr></thead><tbody>'
+    for index, time_block in enumerate(time_blocks):
+        shade = index % 3 + 1
+        row = [CALENDAR_ROW_OPEN.render({
+            'row_class': f"tb-{shade}", 'time_block': time_block,
+            'style': f"background-color: var(--time-block-{shade}-light); z-index: 1; color: white;",
+        })]
+        for room in rooms:
+            row.append(CELL_OPEN)
+            row.extend(calendar_card(session, time_block, room) for session in cells.get((time_block, room), []))
+            row.append('</td>')
+        row.append('</tr>')
+        yield ''.join(row)
+    yield CALENDAR_TABLE_CLOSE
+
+def write_schedule(page_path, sessions):
+    """Prerender the schedule.html time view; returns the number of cards"""
+    write_region(page_path, render_schedule(sessions), SCHEDULE_START, SCHEDULE_END)
+    return sum(len(entries) for _, entries in schedule_slots(sessions))
+
+def write_calendar(page_path, sessions):
+    """Prerender the calendar.html grid; returns the number of cards"""
+    write_region(page_path, render_calendar(sessions), CALENDAR_START, CALENDAR_END)
+    return sum(len(entries) for entries in calendar_cells(sessions)[2].values())
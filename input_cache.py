@@ -0,0 +1,165 @@
+"""
+Sidecar cache for the parsed Excel and CSV inputs
+
+Reading schedule_by_id.xlsx or session_schedule_by_slot.xlsx goes through
+openpyxl every time, and almost every script reads one of them. The first
+read of a file with a given reader and set of options stores the parsed
+DataFrame in .input_cache/ as a pickle (pandas keeps the column blocks and
+dtypes as they are, so the next load is a copy out of the file rather than a
+parse). Each sidecar has a small JSON entry recording the source's path,
+size, modification time and SHA-256.
+
+A later read trusts the sidecar when size and mtime are unchanged. When
+they differ the file is hashed: the same content (a fresh checkout, a
+re-saved workbook) keeps the sidecar and only updates its entry; different
+content evicts it and parses the file again. The key also carries a digest
+of the source file that defines the parse function (text_encoding.py for
+read_csv_decoded), so a change to the parsing code parses again instead of
+serving the output of the old code. Sidecars of files that no longer
+exist are removed whenever a new one is written. Set NO_INPUT_CACHE=1 to
+always parse, or delete the directory to start over.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+import pandas as pd
+
+CACHE_DIR = '.input_cache'
+
+# Bump when the sidecar layout changes; older entries are then treated as stale
+CACHE_VERSION = 1
+
+_lock = threading.Lock()
+
+def enabled():
+    return not os.environ.get('NO_INPUT_CACHE')
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+_code_digests = {}
+
+def code_digest(parse):
+    """SHA-256 of the source file that defines parse, or None if it can't be read"""
+    source = getattr(getattr(parse, '__code__', None), 'co_filename', None)
+    if source not in _code_digests:
+        try:
+            _code_digests[source] = file_sha256(source)
+        except (OSError, TypeError):
+            _code_digests[source] = None
+    return _code_digests[source]
+
+def _entry_key(path, reader, options, code=None):
+    """Sidecar name for one source file read by one reader (whose code has digest code) with one set of options"""
+    spec = json.dumps([os.path.abspath(path), reader, options, code, pd.__version__, CACHE_VERSION],
+                      sort_keys=True, default=repr)
+    return hashlib.sha1(spec.encode('utf-8')).hexdigest()
+
+def _read_entry(entry_path):
+    try:
+        with open(entry_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def _remove(*paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def prune(cache_dir=CACHE_DIR):
+    """Remove the sidecars whose source file is gone; returns how many were removed"""
+    removed = 0
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return 0
+    for name in names:
+        if not name.endswith('.json'):
+            continue
+        entry_path = os.path.join(cache_dir, name)
+        entry = _read_entry(entry_path)
+        if entry is None or not os.path.exists(entry['source']):
+            _remove(entry_path, entry_path[:-len('.json')] + '.pkl')
+            removed += 1
+    return removed
+
+def cached_parse(path, reader, options, parse, cache_dir=CACHE_DIR):
+    """
+    Return parse() for the file at path, from its sidecar when the file is unchanged.
+
+    Args:
+        path: the source file
+        reader: name of the parsing function, part of the cache key
+        options: the keyword arguments parse() uses, part of the cache key
+        parse: parses the file; called on a miss. The source file defining it is
+            part of the cache key, so edits to the parsing code invalidate the sidecar
+    """
+    if not enabled():
+        return parse()
+
+    stat = os.stat(path)
+    key = _entry_key(path, reader, options, code_digest(parse))
+    entry_path = os.path.join(cache_dir, f"{key}.json")
+    sidecar_path = os.path.join(cache_dir, f"{key}.pkl")
+    entry = _read_entry(entry_path)
+
+    if entry is not None:
+        digest = None
+        if (entry['size'], entry['mtime_ns']) != (stat.st_size, stat.st_mtime_ns):
+            digest = file_sha256(path)
+        if digest is None or digest == entry['sha256']:
+            try:
+                frame = pd.read_pickle(sidecar_path)
+            except Exception:
+                frame = None
+            if frame is not None:
+                if digest is not None:
+                    # Same bytes, new timestamp: keep the sidecar, remember the new stat
+                    entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                    with _lock:
+                        _write_json(entry_path, entry)
+                return frame
+        # The file changed (or the sidecar is unreadable): evict before parsing again
+        _remove(entry_path, sidecar_path)
+
+    digest = file_sha256(path)
+    frame = parse()
+    try:
+        with _lock:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{sidecar_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            frame.to_pickle(tmp_path)
+            os.replace(tmp_path, sidecar_path)
+            _write_json(entry_path, {'source': os.path.abspath(path), 'reader': reader,
+                                     'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest})
+            prune(cache_dir)
+    except OSError as e:
+        # A read-only checkout still works, it just parses every time
+        print(f"Warning: could not write the input cache for {path}: {e}")
+    return frame
+
+def read_excel(path, **read_excel_kwargs):
+    """pd.read_excel through the sidecar cache"""
+    return cached_parse(path, 'read_excel', read_excel_kwargs,
+                        lambda: pd.read_excel(path, **read_excel_kwargs))
+
+def read_csv(path, **read_csv_kwargs):
+    """pd.read_csv through the sidecar cache"""
+    return cached_parse(path, 'read_csv', read_csv_kwargs,
+                        lambda: pd.read_csv(path, **read_csv_kwargs))
@@ -0,0 +1,152 @@
+"""
+Streaming JSON output for sessions.json and schedule.json
+
+json.dump() needs the whole document in memory, and it hands the file one
+small piece after another only once the full object graph exists. dump()
+here writes the same text, but walks the large containers itself: a list, a
+generator or a dict holding one of those is written member by member, and
+only the members (one session, one schedule cell) are encoded with a single
+json.dumps() call. A document built from generators is therefore written as
+it is produced, and memory holds one member at a time.
+
+Pretty output (indent=2, the default) is byte-for-byte what
+json.dump(value, indent=2) writes; indent=None gives compact output with no
+whitespace at all.
+"""
+
+import json
+import os
+from collections.abc import Iterator
+
+# Lists up to this length are encoded in one json.dumps() call
+SMALL_LIST = 64
+
+def _separators(indent):
+    return (',', ': ') if indent is not None else (',', ':')
+
+def _key(key):
+    """A dict key as JSON text, coerced the way json.dumps() does"""
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return 'true'
+    if key is False:
+        return 'false'
+    if key is None:
+        return 'null'
+    if isinstance(key, (int, float)):
+        return json.dumps(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+def _streamed(value):
+    """True for the containers dump() writes member by member"""
+    if isinstance(value, Iterator):
+        return True
+    if isinstance(value, (list, tuple)):
+        return len(value) > SMALL_LIST
+    if isinstance(value, dict):
+        return any(_streamed(member) for member in value.values())
+    return False
+
+def iterencode(value, indent=2, ensure_ascii=False, default=None, sort_keys=False, _level=0):
+    """Yield the JSON text of value in pieces (see dump)"""
+    item_separator, key_separator = _separators(indent)
+    if default is not None and not isinstance(value, (dict, list, tuple, Iterator, str, int, float,
+                                                       bool, type(None))):
+        value = default(value)
+    if not _streamed(value):
+        text = json.dumps(value, ensure_ascii=ensure_ascii, indent=indent,
+                          separators=(item_separator, key_separator), default=default, sort_keys=sort_keys)
+        yield text if indent is None or not _level else text.replace('\n', '\n' + ' ' * (indent * _level))
+        return
+
+    if indent is None:
+        newline = inner = ''
+    else:
+        newline = '\n' + ' ' * (indent * _level)
+        inner = '\n' + ' ' * (indent * (_level + 1))
+
+    if isinstance(value, dict):
+        members = iter(sorted(value.items()) if sort_keys else value.items())
+        opening, closing = '{', '}'
+    else:
+        members = iter(value)
+        opening, closing = '[', ']'
+
+    first = True
+    for member in members:
+        yield (opening if first else item_separator) + inner
+        first = False
+        if closing == '}':
+            key, member = member
+            yield json.dumps(_key(key), ensure_ascii=ensure_ascii) + key_separator
+        yield from iterencode(member, indent, ensure_ascii, default, sort_keys, _level + 1)
+    yield opening + closing if first else newline + closing
+
+def dump(value, fp, indent=2, ensure_ascii=False, default=None, sort_keys=False):
+    """
+    Write value to the open text file fp as JSON.
+
+    Lists, tuples and any iterator (a generator, map(), ...) become arrays;
+    default converts other objects (see session_model.to_json). sort_keys
+    orders every object's keys, as in json.dump().
+    """
+    for piece in iterencode(value, indent=indent, ensure_ascii=ensure_ascii, default=default,
+                            sort_keys=sort_keys):
+        fp.write(piece)
+
+def write_json(path, value, indent=2, ensure_ascii=False, default=None, sort_keys=False):
+    """dump() to path through a temporary file that replaces path once the document is complete"""
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            dump(value, f, indent=indent, ensure_ascii=ensure_ascii, default=default, sort_keys=sort_keys)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+class ArrayWriter:
+    """
+    Push-style JSON array output, for loops that produce one member at a time.
+
+        with ArrayWriter('sessions.json') as out:
+            for record in records:
+                out.write(record)
+
+    The text is the same as dump() of the list of members. Like write_json,
+    the file only replaces path when the block finishes without an error.
+    """
+
+    def __init__(self, path, indent=2, ensure_ascii=False, default=None):
+        self.path = path
+        self.indent = indent
+        self.ensure_ascii = ensure_ascii
+        self.default = default
+        self.count = 0
+        self._file = None
+
+    def __enter__(self):
+        self._tmp_path = f"{self.path}.tmp"
+        self._file = open(self._tmp_path, 'w', encoding='utf-8')
+        return self
+
+    def write(self, member):
+        item_separator, _ = _separators(self.indent)
+        inner = '' if self.indent is None else '\n' + ' ' * self.indent
+        self._file.write(('[' if self.count == 0 else item_separator) + inner)
+        for piece in iterencode(member, self.indent, self.ensure_ascii, self.default, False, 1):
+            self._file.write(piece)
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.count:
+            self._file.write('' if self.indent is None else '\n')
+        self._file.write(']' if self.count else '[]')
+        self._file.close()
+        if exc_type is None:
+            os.replace(self._tmp_path, self.path)
+        else:
+            os.remove(self._tmp_path)
+        return False
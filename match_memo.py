@@ -0,0 +1,99 @@
+"""
+Persistent memo of fuzzy title matches
+
+update_all.sh runs the same title matching on every invocation even though
+almost nothing changes between runs. MatchMemo remembers each resolved match
+in .match_memo.json, keyed by the normalized source title, together with the
+normalized target title it resolved to, the session id, the score and the
+version of the matcher that produced it.
+
+An entry is only reused while it still describes the current data:
+
+- the source title is the key, so editing it is simply a miss
+- a match is dropped once its target title is no longer among the targets
+- a "no match" result is dropped as soon as the set of targets changes
+- every entry is dropped when the matcher version changes
+
+Entries that are not looked up during a run are not written back, so the
+file only ever holds matches for the current titles.
+"""
+
+import hashlib
+import json
+import os
+
+MEMO_PATH = '.match_memo.json'
+
+def _fingerprint(titles):
+    digest = hashlib.sha1()
+    for title in sorted(titles):
+        digest.update(title.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+class MatchMemo:
+    """
+    One script's section of the match memo.
+
+    Args:
+        namespace: section of the memo file, usually the script name
+        targets: the normalized titles matches can resolve to in this run
+        version: identifies the matcher; entries from other versions are ignored
+        path: memo file location
+    """
+
+    def __init__(self, namespace, targets, version, path=MEMO_PATH):
+        self.namespace = namespace
+        self.targets = set(targets)
+        self.version = version
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._fingerprint = _fingerprint(self.targets)
+        self._entries = self._load().get(namespace, {})
+        self._kept = {}
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, source):
+        """
+        Return the remembered entry for source, or None if it has to be matched again.
+
+        The entry's 'target' is None when the source is known to match nothing.
+        """
+        entry = self._entries.get(source)
+        valid = (entry is not None and entry.get('version') == self.version and
+                 (entry['target'] in self.targets if entry['target'] is not None
+                  else entry.get('targets') == self._fingerprint))
+        if not valid:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._kept[source] = entry
+        return entry
+
+    def put(self, source, target, session_id=None, score=None):
+        """Remember that source resolved to target (None for no match)"""
+        entry = {'target': target, 'id': session_id, 'score': score, 'version': self.version}
+        if target is None:
+            entry['targets'] = self._fingerprint
+        self._kept[source] = entry
+
+    def save(self):
+        """Write this namespace back, keeping only entries used in this run"""
+        data = self._load()
+        if data.get(self.namespace) == self._kept:
+            return
+        data[self.namespace] = self._kept
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def report(self):
+        return f"Match memo: {self.hits} reused, {self.misses} matched again"
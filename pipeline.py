@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+In-process runner for the update_all.sh steps
+
+update_all.sh used to start a Python interpreter for every step, and each
+step re-imported pandas and re-read the sessions.json/schedule.json the
+previous step had just written. This runner imports the steps instead and
+declares them as a dependency graph over in-memory data:
+
+    sessions, slot_grid -> schedule -> rooms -> session_fixes --+
+    email_presenters -------------------------------------------+-> session_info -> sync -> nurenberg -> times -> verify
+    sessions -> schedule_assignments ---------------------------+                                        |        |
+    data_sources ----------------------------------------------------------------------------------------|--------+
+                                                                                                         +-> conflicts
+
+Stages whose dependencies are done run concurrently in a thread pool, and
+each stage's output is printed as one block when it finishes. sessions.json
+and schedule.json are written once, at the end, and only if every stage
+succeeded. The times stage recomputes startMinutes, endMinutes and day from
+the final time blocks once the stages that move sessions are done, so the
+conflicts check and the written files use the final slots. The conflicts
+stage fails when a room or presenter is double booked (see
+booking_conflicts.py).
+
+Two steps of the old script have no stage: csv_to_json.py no longer exists
+(generate_master_sessions.py builds sessions.json, which is used as it is),
+and update_schedule.py wrote a schedule.json from the same workbook that
+excel_to_schedule.py overwrote straight after.
+"""
+
+import argparse
+import io
+import json
+import sys
+import threading
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import booking_conflicts
+import build_artifacts
+import excel_to_schedule
+import fix_nurenberg_session
+import fix_session_info_comprehensive
+import grid_prerender
+import input_cache
+import json_stream
+import session_model
+import sync_session_data
+import time_slots
+import update_rooms
+import update_sessions
+import verify_data_consistency
+
+# run(state) reads and writes the shared in-memory data; after names the stages it waits for
+Stage = namedtuple('Stage', ['name', 'title', 'after', 'run'])
+
+class StageFailed(Exception):
+    """Raised by a stage to fail with a message rather than a traceback"""
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def write_json(path, data):
+    """Write data the way the last step of the old pipeline did, replacing the file atomically"""
+    json_stream.write_json(path, data, ensure_ascii=False, default=session_model.to_json)
+
+def load_sessions(state):
+    state['sessions'] = session_model.load_sessions('sessions.json')
+    print(f"Loaded {len(state['sessions'])} sessions from sessions.json")
+
+def load_slot_grid(state):
+    state['slot_grid'] = input_cache.read_excel('session_schedule_by_slot.xlsx')
+
+def build_schedule(state):
+    state['schedule'] = excel_to_schedule.build_schedule(state['slot_grid'], state['sessions'])
+    print(f"Built the schedule: {len(state['schedule']['sessions'])} sessions")
+
+def assign_rooms(state):
+    update_rooms.assign_rooms(state['schedule'], state['sessions'])
+
+def fix_sessions(state):
+    update_sessions.update_session_info(state['sessions'])
+
+def load_email_presenters(state):
+    state['email_presenters'] = fix_session_info_comprehensive.load_csv_sessions()
+    print(f"Loaded {len(state['email_presenters'])} email-to-presenter mappings from CSV")
+
+def load_schedule_assignments(state):
+    # Only reads titles and presenters, which no stage before session_info changes
+    state['schedule_assignments'] = fix_session_info_comprehensive.load_schedule_assignments(state['sessions'])
+
+def fix_session_info(state):
+    schedule_assignments, time_slots = state['schedule_assignments']
+    fix_session_info_comprehensive.fix_session_info(state['sessions'], state['email_presenters'],
+                                                    schedule_assignments, time_slots)
+    fix_session_info_comprehensive.update_schedule_presenters(state['sessions'], state['schedule'])
+
+def sync(state):
+    sync_session_data.sync_sessions(state['sessions'], state['schedule'])
+
+def fix_nurenberg(state):
+    if not fix_nurenberg_session.fix_nurenberg_data(state['sessions'], state['schedule']):
+        print("Failed to fix David Nurenberg's session")
+
+def annotate_times(state):
+    time_slots.annotate(state['sessions'])
+
+def check_data_sources(state):
+    state['data_source_issues'] = verify_data_consistency.check_data_sources()
+
+def check_conflicts(state):
+    conflicts, unparsed = booking_conflicts.find_conflicts(state['sessions'])
+    booking_conflicts.print_conflicts(conflicts, unparsed)
+    if conflicts:
+        raise StageFailed(f"{len(conflicts)} double bookings; fix the schedule grid and rerun")
+
+def verify(state):
+    state['validation'] = verify_data_consistency.check_all(state['sessions'], state['data_source_issues'])
+
+UPDATE_ALL_STAGES = [
+    Stage('sessions', "Loading sessions.json", (), load_sessions),
+    Stage('slot_grid', "Reading session_schedule_by_slot.xlsx", (), load_slot_grid),
+    Stage('email_presenters', "Loading presenter names from sessions.csv", (), load_email_presenters),
+    Stage('data_sources', "Checking sessions.csv against schedule_by_id.xlsx", (), check_data_sources),
+    Stage('schedule_assignments', "Loading schedule_temp.csv assignments", ('sessions',),
+          load_schedule_assignments),
+    Stage('schedule', "Updating calendar schedule data", ('sessions', 'slot_grid'), build_schedule),
+    Stage('rooms', "Updating room assignments", ('schedule',), assign_rooms),
+    Stage('session_fixes', "Updating sessions with schedule information", ('rooms',), fix_sessions),
+    Stage('session_info', "Running comprehensive fixes for consistency",
+          ('session_fixes', 'email_presenters', 'schedule_assignments'), fix_session_info),
+    Stage('sync', "Synchronizing sessions with the schedule", ('session_info',), sync),
+    Stage('nurenberg', "Applying specific fixes for David Nurenberg's session", ('sync',), fix_nurenberg),
+    Stage('times', "Recomputing the numeric session times", ('nurenberg',), annotate_times),
+    Stage('verify', "Running verification checks", ('times', 'data_sources'), verify),
+    Stage('conflicts', "Checking rooms and presenters for double bookings", ('times',), check_conflicts),
+]
+
+class StageOutput(io.TextIOBase):
+    """Stand-in for sys.stdout/sys.stderr that collects each stage thread's output separately"""
+
+    _local = threading.local()
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    @classmethod
+    def start(cls):
+        cls._local.buffer = io.StringIO()
+
+    @classmethod
+    def stop(cls):
+        text = cls._local.buffer.getvalue()
+        cls._local.buffer = None
+        return text
+
+    def write(self, text):
+        buffer = getattr(self._local, 'buffer', None)
+        return (self.stream if buffer is None else buffer).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+def run_stage(stage, state):
+    """Run one stage; returns (ok, seconds, output)"""
+    StageOutput.start()
+    started = time.perf_counter()
+    try:
+        stage.run(state)
+        ok = True
+    except StageFailed as e:
+        print(f"FAILED: {e}")
+        ok = False
+    except Exception:
+        traceback.print_exc(file=sys.stdout)
+        ok = False
+    return ok, time.perf_counter() - started, StageOutput.stop()
+
+def run_stages(stages, state, jobs=4):
+    """
+    Run stages in dependency order, concurrently where their dependencies allow.
+
+    Stages must be listed after the stages they wait for. A stage that raises
+    is reported as failed and the stages depending on it are skipped.
+    Returns {stage name: 'ok', 'failed' or 'skipped'} and {stage name: seconds}.
+    """
+    seen = set()
+    for stage in stages:
+        unknown = [name for name in stage.after if name not in seen]
+        if unknown:
+            raise ValueError(f"Stage '{stage.name}' waits for {unknown}, which are not listed before it")
+        seen.add(stage.name)
+
+    status, seconds = {}, {}
+    pending = list(stages)
+    running = {}
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = StageOutput(stdout), StageOutput(stderr)
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            while pending or running:
+                for stage in list(pending):
+                    if any(status.get(name) in ('failed', 'skipped') for name in stage.after):
+                        status[stage.name] = 'skipped'
+                        pending.remove(stage)
+                    elif all(status.get(name) == 'ok' for name in stage.after):
+                        running[pool.submit(run_stage, stage, state)] = stage
+                        pending.remove(stage)
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    ok, seconds[stage.name], output = future.result()
+                    status[stage.name] = 'ok' if ok else 'failed'
+                    print(f"\n--- {stage.title} [{stage.name}, {seconds[stage.name]:.2f}s] ---")
+                    print(output, end='')
+    finally:
+        sys.stdout, sys.stderr = stdout, stderr
+    return status, seconds
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the update_all.sh steps in one process")
+    parser.add_argument('--jobs', type=int, default=4,
+                        help="number of stages that may run at the same time (default 4)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    state = {}
+    status, seconds = run_stages(UPDATE_ALL_STAGES, state, jobs=args.jobs)
+
+    print("\n=== Stage timings ===")
+    for stage in UPDATE_ALL_STAGES:
+        timing = f"{seconds[stage.name]:.2f}s" if stage.name in seconds else '-'
+        print(f"  {stage.name:<22} {status[stage.name]:<8} {timing}")
+
+    if any(result != 'ok' for result in status.values()):
+        failed = [name for name, result in status.items() if result == 'failed']
+        print(f"\nPipeline stopped at {', '.join(failed)}; sessions.json and schedule.json were not written")
+        return 1
+
+    write_json('sessions.json', state['sessions'])
+    write_json('schedule.json', state['schedule'])
+    print("\nBuild artifacts:")
+    build_artifacts.print_report(build_artifacts.build('sessions.json'))
+    print("\nPrerendered grids:")
+    print(f"  schedule.html  {grid_prerender.write_schedule('schedule.html', state['sessions'])} session cards")
+    print(f"  calendar.html  {grid_prerender.write_calendar('calendar.html', state['sessions'])} session cards")
+    print(f"\nWrote sessions.json and schedule.json ({time.perf_counter() - started:.2f}s in total)")
+    return state['validation']
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+Typo-tolerant presenter surname lookups
+
+The "Lastname: Title" schedule grids name each session by its presenter's
+surname, typed by hand: "Napirowska" for Napiorkowska, "Hojinicki" for
+Hojnicki. PresenterIndex parses the surnames out of the sessions' presenter
+field (the Name2 column of the form export) and keeps them in a BK-tree, so
+a misspelt surname finds its presenter within a bounded edit distance
+without comparing it to every name. The presenter's sessions (usually just
+one) are then the only titles the cell's title is compared with.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+# Lowest title similarity accepted once the surname has narrowed the candidates
+MIN_TITLE_SCORE = 0.6
+
+HONORIFICS = {'dr', 'mr', 'mrs', 'ms', 'mx', 'prof', 'jr', 'sr', 'phd', 'edd', 'ii', 'iii'}
+
+def surname_key(name):
+    """Comparable form of a surname: no accents, apostrophes or periods, casefolded"""
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(char for char in name if not unicodedata.combining(char))
+    return re.sub(r"['’.]", '', name).strip().casefold()
+
+def parse_surnames(presenters):
+    """
+    Return the surname keys in a presenter field.
+
+    "Heidi Hojnicki, Dr. Rachel Heffner-Burns" -> ['hojnicki', 'heffner-burns']
+    """
+    surnames = []
+    if not isinstance(presenters, str):
+        return surnames
+    for person in re.split(r',|;|&|\band\b', presenters):
+        words = [word for word in person.split() if surname_key(word) not in HONORIFICS]
+        if words:
+            key = surname_key(words[-1])
+            if key and key not in surnames:
+                surnames.append(key)
+    return surnames
+
+def levenshtein(a, b):
+    """Edit distance between two strings"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+class BKTree:
+    """Burkhard-Keller tree over words for bounded edit-distance search"""
+
+    def __init__(self, words=()):
+        self._root = None
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        if self._root is None:
+            self._root = (word, {})
+            return
+        node = self._root
+        while True:
+            distance = levenshtein(word, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                return
+            node = child
+
+    def search(self, word, max_distance):
+        """Return (distance, word) for every stored word within max_distance, closest first"""
+        found = []
+        pending = [self._root] if self._root is not None else []
+        while pending:
+            node_word, children = pending.pop()
+            distance = levenshtein(word, node_word)
+            if distance <= max_distance:
+                found.append((distance, node_word))
+            # Triangle inequality: only subtrees at distance d +/- max_distance can hold matches
+            for edge, child in children.items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    pending.append(child)
+        return sorted(found)
+
+def default_max_distance(surname):
+    """Edits tolerated in a surname: one per four letters, at least one, at most three"""
+    return min(3, max(1, len(surname) // 4))
+
+class PresenterIndex:
+    """
+    Session lookups by presenter surname.
+
+    Args:
+        items: the records to index, usually session dicts
+        normalize: applied to each stored title (not to queries; normalize those yourself)
+        key: returns an item's presenter field; defaults to item.get('presenter')
+    """
+
+    def __init__(self, items, normalize=None, key=None):
+        self.items = list(items)
+        normalize = normalize or (lambda title: title)
+        key = key or (lambda item: item.get('presenter'))
+        self.titles = [normalize(item.get('title') or '') for item in self.items]
+
+        self._by_surname = defaultdict(list)
+        for ordinal, item in enumerate(self.items):
+            for surname in parse_surnames(key(item)):
+                self._by_surname[surname].append(ordinal)
+        self._tree = BKTree(self._by_surname)
+
+    def candidates(self, surname, max_distance=None):
+        """Ordinals of the items whose presenters have the closest surname within max_distance"""
+        query = surname_key(surname)
+        if not query:
+            return []
+        ordinals = self._by_surname.get(query)
+        if ordinals:
+            return list(ordinals)
+        if max_distance is None:
+            max_distance = default_max_distance(query)
+        found = self._tree.search(query, max_distance)
+        if not found:
+            return []
+        closest = found[0][0]
+        return sorted({ordinal for distance, word in found if distance == closest
+                       for ordinal in self._by_surname[word]})
+
+    def match(self, surname, title, min_score=MIN_TITLE_SCORE):
+        """
+        Return the item presented by surname whose title is closest to title, or None.
+
+        Titles are compared only within the presenter's sessions: an equal or
+        truncated title scores 1, anything else its SequenceMatcher ratio.
+        """
+        query = title.strip().casefold()
+        best, best_score = None, min_score
+        for ordinal in self.candidates(surname):
+            candidate = self.titles[ordinal].strip().casefold()
+            if query and candidate and (query in candidate or candidate in query):
+                score = 1.0
+            else:
+                score = SequenceMatcher(None, query, candidate).ratio()
+            if score > best_score or (best is None and score >= min_score):
+                best, best_score = self.items[ordinal], score
+        return best
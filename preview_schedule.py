@@ -1,8 +1,8 @@
-import pandas as pd
+import input_cache
 
 # Load the Excel file
 try:
-    df = pd.read_excel('/workspaces/symposium/session_schedule_by_slot.xlsx')
+    df = input_cache.read_excel('/workspaces/symposium/session_schedule_by_slot.xlsx')
     
     # Print the column names
     print("Column names:")
@@ -1,8 +1,10 @@
 import pandas as pd
 
+import input_cache
+
 # Read the Excel files
 try:
-    schedule_by_id = pd.read_excel('schedule_by_id.xlsx')
+    schedule_by_id = input_cache.read_excel('schedule_by_id.xlsx')
     print("=== schedule_by_id.xlsx ===")
     print(schedule_by_id.head())
     print("\nColumns:", schedule_by_id.columns.tolist())
@@ -10,7 +12,7 @@ except Exception as e:
     print(f"Error reading schedule_by_id.xlsx: {e}")
 
 try:
-    session_schedule_by_slot = pd.read_excel('session_schedule_by_slot.xlsx')
+    session_schedule_by_slot = input_cache.read_excel('session_schedule_by_slot.xlsx')
     print("\n=== session_schedule_by_slot.xlsx ===")
     print(session_schedule_by_slot.head())
     print("\nColumns:", session_schedule_by_slot.columns.tolist())
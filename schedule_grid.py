@@ -0,0 +1,155 @@
+"""
+Shared parser for the slot x room schedule grids
+
+All of our schedule sources use the same layout: a first column of time slot
+labels and one column per room. What goes in the cells differs:
+
+- schedule_by_id.xlsx: session IDs, plus text for plenary events
+- session_schedule_by_slot.xlsx / schedule_temp.csv: "Lastname: Title" text
+
+melt_schedule_grid() turns any of these into one long table with a row per
+filled cell, in reading order (slot by slot, room by room), and classifies
+each cell so the callers don't have to re-parse the text themselves.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+import input_cache
+
+# Cell kinds in the long table
+SESSION_ID = 'session_id'          # numeric cell in an ID grid
+PRESENTER_TITLE = 'presenter_title'  # "Lastname: Title"
+TITLE = 'title'                    # plain session title
+EVENT = 'event'                    # registration, keynote, closing, ...
+
+# Grid formats, as returned by detect_grid_format()
+ID_GRID = 'id'
+PRESENTER_TITLE_GRID = 'presenter_title'
+TITLE_GRID = 'title'
+
+# A presenter prefix is a short name before the first colon ("Cotton", "Conrau-Lewis", "Le Guin")
+PRESENTER_PREFIX_RE = r"^\s*[^\W\d][\w'’.\-]*(?: [^\W\d][\w'’.\-]*)?\s*:"
+
+CELL_COLUMNS = ['row', 'slot', 'room', 'kind', 'payload', 'session_id', 'presenter', 'title']
+
+def split_presenter_prefix(text):
+    """
+    Split a "Lastname: Title" cell at its first colon.
+
+    Returns (presenter, title), or (None, text) when the text doesn't start
+    with a presenter prefix. Colons inside the title are kept.
+    """
+    if isinstance(text, str) and re.match(PRESENTER_PREFIX_RE, text):
+        presenter, title = text.split(':', 1)
+        return presenter.strip(), title.strip()
+    return None, text
+
+def read_schedule_grid(path):
+    """Read a schedule grid from an .xlsx/.xls workbook or a .csv export"""
+    if path.lower().endswith(('.xlsx', '.xls')):
+        return input_cache.read_excel(path)
+    # Only empty cells are missing; don't let pandas turn "NA"/"None" titles into NaN
+    return input_cache.read_csv(path, encoding='utf-8', keep_default_na=False, na_values=[''])
+
+def grid_slots(grid):
+    """Return the time slot label of every grid row that has one, in order"""
+    slots = grid[grid.columns[0]]
+    slots = slots[slots.notna()].astype(str).str.strip()
+    return slots[slots != ''].tolist()
+
+def grid_rooms(grid):
+    """Return the room names (every column after the time slot column)"""
+    return [str(room).strip() for room in grid.columns[1:]]
+
+def _filled_cells(grid):
+    """Return (row positions, column positions, values) of the non-empty room cells, row-major"""
+    slots = grid[grid.columns[0]]
+    rooms = grid[grid.columns[1:]]
+    filled = rooms.notna() & rooms.apply(lambda column: column.astype(str).str.strip() != '')
+    # Rows without a slot label are never part of the schedule
+    has_slot = slots.notna() & (slots.astype(str).str.strip() != '')
+    filled = filled.to_numpy(dtype=bool) & has_slot.to_numpy(dtype=bool)[:, None]
+    rows, cols = np.nonzero(filled)  # np.nonzero walks the grid row by row
+    return rows, cols, rooms.to_numpy(dtype=object)[rows, cols]
+
+def detect_grid_format(grid):
+    """
+    Work out what the grid cells contain.
+
+    Returns ID_GRID when most filled cells are numbers, PRESENTER_TITLE_GRID
+    when most text cells start with a short "Lastname:" prefix, else TITLE_GRID.
+    """
+    _, _, values = _filled_cells(grid)
+    if len(values) == 0:
+        return TITLE_GRID
+    cells = pd.Series(values, dtype=object)
+    numeric = pd.to_numeric(cells, errors='coerce').notna()
+    if numeric.mean() > 0.5:
+        return ID_GRID
+    text = cells[~numeric].astype(str)
+    if text.str.contains(PRESENTER_PREFIX_RE, regex=True).mean() > 0.5:
+        return PRESENTER_TITLE_GRID
+    return TITLE_GRID
+
+def melt_schedule_grid(grid, grid_format=None):
+    """
+    Convert a slot x room grid into a long table of filled cells.
+
+    Args:
+        grid: DataFrame with the time slot labels in the first column and one column per room
+        grid_format: ID_GRID, PRESENTER_TITLE_GRID or TITLE_GRID; detected when omitted
+
+    Returns:
+        DataFrame with one row per filled cell, in reading order, and the columns
+        row (grid row position), slot, room, kind, payload (stripped cell text),
+        session_id (for SESSION_ID cells), presenter and title (for text cells).
+    """
+    if grid_format is None:
+        grid_format = detect_grid_format(grid)
+
+    rows, cols, values = _filled_cells(grid)
+    if len(values) == 0:
+        return pd.DataFrame(columns=CELL_COLUMNS)
+
+    slot_labels = grid[grid.columns[0]].astype(str).str.strip().to_numpy()
+    room_labels = np.array(grid_rooms(grid), dtype=object)
+    cells = pd.DataFrame({
+        'row': rows,
+        'slot': slot_labels[rows],
+        'room': room_labels[cols],
+        'kind': TITLE,
+        'payload': pd.Series(values, dtype=object).astype(str).str.strip().to_numpy(dtype=object),
+        'session_id': pd.array([None] * len(values), dtype='Int64'),
+        'presenter': None,
+        'title': None,
+    })
+
+    if grid_format == ID_GRID:
+        numbers = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce')
+        is_id = numbers.notna().to_numpy()
+        cells.loc[is_id, 'kind'] = SESSION_ID
+        cells.loc[is_id, 'session_id'] = numbers[is_id].astype('int64').to_numpy()
+        cells.loc[~is_id, 'kind'] = EVENT
+        cells.loc[~is_id, 'title'] = cells.loc[~is_id, 'payload']
+        return cells
+
+    # Text grids: a plenary event is the only cell filled in its row
+    sole_in_row = cells.groupby('row')['row'].transform('size').to_numpy() == 1
+    if grid_format == PRESENTER_TITLE_GRID:
+        parts = cells['payload'].str.split(':', n=1, expand=True)
+        if parts.shape[1] == 1:
+            parts[1] = None
+        has_prefix = parts[1].notna().to_numpy()
+        cells.loc[has_prefix, 'kind'] = PRESENTER_TITLE
+        cells.loc[has_prefix, 'presenter'] = parts.loc[has_prefix, 0].str.strip()
+        cells.loc[has_prefix, 'title'] = parts.loc[has_prefix, 1].str.strip()
+        plain = ~has_prefix
+    else:
+        plain = np.ones(len(cells), dtype=bool)
+
+    cells.loc[plain, 'title'] = cells.loc[plain, 'payload']
+    cells.loc[plain & sole_in_row, 'kind'] = EVENT
+    return cells
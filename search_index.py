@@ -0,0 +1,59 @@
+"""
+Full-text search index for the index.html search box
+
+The search box used to lowercase and substring-scan the title, presenter,
+tags and description of every session on each keystroke, and with the
+descriptions split into shards (see build_artifacts.py) that meant loading
+all of them first. build_search_index() does the text work at build time
+instead: each field is normalized and cut into tokens, and every token gets a
+posting list of the sessions that contain it, with a score from the fields
+it appears in (FIELD_WEIGHTS). The page loads the index on the first search
+and matches each query word as a prefix of the sorted terms.
+
+Layout ({'count', 'fields', 'terms', 'postings'}):
+
+- terms: the distinct tokens, sorted
+- postings: for each term, a flat [gap, score, gap, score, ...] list, where
+  gap is the session's position in sessions.json minus the previous one in
+  the list (the first gap is the position itself)
+
+tokenize() must stay in step with searchTokens() in index.html: NFKD, drop
+the combining accents, lowercase, then runs of [a-z0-9].
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+
+FIELD_WEIGHTS = {'title': 4, 'presenter': 3, 'tags': 2, 'description': 1}
+
+_ACCENTS = re.compile('[\u0300-\u036f]')
+_TOKEN = re.compile('[a-z0-9]+')
+
+def tokenize(text):
+    text = _ACCENTS.sub('', unicodedata.normalize('NFKD', str(text or '')))
+    return _TOKEN.findall(text.lower())
+
+def field_text(session, field):
+    value = session.get(field)
+    if isinstance(value, list):
+        return ' '.join(str(item) for item in value)
+    return value
+
+def build_search_index(sessions):
+    """The search index document for a list of sessions (in sessions.json order)"""
+    scores = defaultdict(dict)      # term -> {ordinal: score}
+    for ordinal, session in enumerate(sessions):
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in set(tokenize(field_text(session, field))):
+                scores[term][ordinal] = scores[term].get(ordinal, 0) + weight
+
+    terms = sorted(scores)
+    postings = []
+    for term in terms:
+        flat, previous = [], 0
+        for ordinal, score in sorted(scores[term].items()):
+            flat += [ordinal - previous, score]
+            previous = ordinal
+        postings.append(flat)
+    return {'count': len(sessions), 'fields': FIELD_WEIGHTS, 'terms': terms, 'postings': postings}
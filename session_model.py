@@ -0,0 +1,320 @@
+"""
+Compact in-memory model of sessions.json
+
+The scripts used to pass sessions around as loose dicts, one per record
+with its own copy of every room, strand, type and tag string. Session,
+SpecialEvent, Occurrence and Presenter keep their fields in __slots__
+attributes instead, intern the strings that repeat across records (strands,
+types, rooms, time blocks, tags, organizations) and share one Presenter
+object per person.
+
+Each JSON key maps to exactly one attribute and back; keys that look alike
+stay apart (a regular session's descriptionPreview is not a special event's
+preview, and schedule.json's room and timeSlot are not sessions.json keys).
+Every class writes its keys back in the order generate_master_sessions.py
+has always written them, so a sessions.json that is loaded and dumped again
+is unchanged.
+
+Records also answer the dict protocol by JSON key (record.get('title'),
+record['location'] = ...), so code written against the dicts keeps working.
+"""
+
+import json
+import sys
+import weakref
+
+import json_stream
+
+class _Missing:
+    """Marks a field the record doesn't have (as opposed to one that is null)"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'MISSING'
+
+    def __bool__(self):
+        return False
+
+MISSING = _Missing()
+
+def intern(value):
+    """sys.intern for strings; anything else is returned as it is"""
+    return sys.intern(value) if type(value) is str else value
+
+_tag_tuples = {}
+
+def intern_tags(tags):
+    """Tags as one shared tuple of interned strings per distinct tag list"""
+    if tags is MISSING or tags is None:
+        return tags
+    key = tuple(intern(tag) for tag in tags)
+    return _tag_tuples.setdefault(key, key)
+
+class Presenter:
+    """A presenter; shared by all the sessions with the same name, email and organization"""
+
+    __slots__ = ('name', 'email', 'organization', '__weakref__')
+
+    _people = weakref.WeakValueDictionary()
+
+    def __init__(self, name=MISSING, email=MISSING, organization=MISSING):
+        self.name = name
+        self.email = intern(email)
+        self.organization = intern(organization)
+
+    @classmethod
+    def of(cls, name=MISSING, email=MISSING, organization=MISSING):
+        """The shared Presenter for these fields"""
+        key = (name, email, organization)
+        presenter = cls._people.get(key)
+        if presenter is None:
+            presenter = cls._people[key] = cls(name, email, organization)
+        return presenter
+
+    def __repr__(self):
+        return f"Presenter({self.name!r}, {self.email!r}, {self.organization!r})"
+
+class Record:
+    """
+    Base for the sessions.json record types.
+
+    FIELDS lists (JSON key, attribute) in output order; INTERNED names the
+    attributes whose strings are interned. Keys the model doesn't know are
+    kept, in order, in extra and written after the known ones.
+    """
+
+    __slots__ = ('extra',)
+
+    FIELDS = ()
+    INTERNED = frozenset()
+
+    def __init__(self, **fields):
+        for attribute in type(self).__slots__:
+            setattr(self, attribute, MISSING)
+        self.extra = None
+        self._assign(fields)
+
+    def _assign(self, fields):
+        for attribute, value in fields.items():
+            self._set(attribute, value)
+
+    @classmethod
+    def _keys(cls):
+        keys = cls.__dict__.get('_key_map')
+        if keys is None:
+            keys = cls._key_map = dict(cls.FIELDS)
+        return keys
+
+    def _set(self, attribute, value):
+        if attribute in self.INTERNED:
+            value = intern(value)
+        elif attribute == 'tags':
+            value = intern_tags(value)
+        elif attribute == 'occurrences' and value is not MISSING and value is not None:
+            value = [occurrence if isinstance(occurrence, Occurrence) else Occurrence.from_dict(occurrence)
+                     for occurrence in value]
+        setattr(self, attribute, value)
+
+    @classmethod
+    def from_dict(cls, data):
+        keys = cls._keys()
+        fields, extra = {}, None
+        for key, value in data.items():
+            attribute = keys.get(key)
+            if attribute is None:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+            else:
+                fields[attribute] = value
+        record = cls(**fields)
+        record.extra = extra
+        return record
+
+    def to_dict(self):
+        """The record as a JSON-ready dict, keys in this class's output order"""
+        data = {}
+        for key, attribute in self.FIELDS:
+            value = getattr(self, attribute)
+            if value is MISSING:
+                continue
+            if type(value) is tuple:
+                value = list(value)
+            elif attribute == 'occurrences' and value is not None:
+                value = [occurrence.to_dict() for occurrence in value]
+            data[key] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    # The dict protocol, by JSON key
+
+    def __getitem__(self, key):
+        attribute = self._keys().get(key)
+        if attribute is None:
+            if self.extra and key in self.extra:
+                return self.extra[key]
+            raise KeyError(key)
+        value = getattr(self, attribute)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __setitem__(self, key, value):
+        attribute = self._keys().get(key)
+        if attribute is None:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+        else:
+            self._set(attribute, value)
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+class Occurrence(Record):
+    """One scheduled time and place of a session (a sessions.json occurrence or a schedule.json cell)"""
+
+    __slots__ = ('location', 'time_block', 'start_minutes', 'end_minutes', 'day', 'occurrence_id',
+                 'time_slot_group')
+
+    FIELDS = (('location', 'location'), ('timeBlock', 'time_block'), ('startMinutes', 'start_minutes'),
+              ('endMinutes', 'end_minutes'), ('day', 'day'), ('occurrenceId', 'occurrence_id'),
+              ('timeSlotGroup', 'time_slot_group'))
+    INTERNED = frozenset({'location', 'time_block', 'time_slot_group'})
+
+class _PresenterFields:
+    """The presenter, email and organization keys, stored on a shared Presenter"""
+
+    __slots__ = ()
+
+    PRESENTER_ATTRIBUTES = {'presenter_name': 'name', 'email': 'email', 'organization': 'organization'}
+
+    def _assign(self, fields):
+        # Set the presenter fields together, so only the final Presenter is created
+        people = {self.PRESENTER_ATTRIBUTES[attribute]: fields.pop(attribute)
+                  for attribute in list(fields) if attribute in self.PRESENTER_ATTRIBUTES}
+        if people:
+            self._replace_presenter(**people)
+        super()._assign(fields)
+
+    def _presenter_field(self, name):
+        presenter = self.presenter
+        return MISSING if presenter is MISSING else getattr(presenter, name)
+
+    def _replace_presenter(self, **changes):
+        fields = {name: self._presenter_field(name) for name in ('name', 'email', 'organization')}
+        fields.update(changes)
+        self.presenter = Presenter.of(**fields)
+
+    @property
+    def presenter_name(self):
+        return self._presenter_field('name')
+
+    @presenter_name.setter
+    def presenter_name(self, value):
+        self._replace_presenter(name=value)
+
+    @property
+    def email(self):
+        return self._presenter_field('email')
+
+    @email.setter
+    def email(self, value):
+        self._replace_presenter(email=value)
+
+    @property
+    def organization(self):
+        return self._presenter_field('organization')
+
+    @organization.setter
+    def organization(self, value):
+        self._replace_presenter(organization=value)
+
+class Session(_PresenterFields, Record):
+    """A regular session from sessions.csv"""
+
+    __slots__ = ('id', 'is_special_event', 'strand', 'strand_number', 'type', 'type_name', 'title',
+                 'presenter', 'description', 'preview', 'tags', 'occurrences', 'location', 'time_block',
+                 'strand_name')
+
+    FIELDS = (('id', 'id'), ('isSpecialEvent', 'is_special_event'), ('strand', 'strand'),
+              ('strand_number_debug', 'strand_number'), ('type', 'type'), ('typeName', 'type_name'),
+              ('title', 'title'), ('presenter', 'presenter_name'), ('email', 'email'),
+              ('organization', 'organization'), ('description', 'description'),
+              ('descriptionPreview', 'preview'), ('tags', 'tags'), ('occurrences', 'occurrences'),
+              ('location', 'location'), ('timeBlock', 'time_block'), ('strandName', 'strand_name'))
+    INTERNED = frozenset({'strand', 'strand_number', 'type', 'type_name', 'location', 'time_block',
+                          'strand_name'})
+
+class SpecialEvent(_PresenterFields, Record):
+    """A non-session schedule entry: registration, keynote, lunch, ..."""
+
+    __slots__ = ('id', 'strand', 'strand_name', 'type', 'type_name', 'title', 'presenter', 'description',
+                 'preview', 'time_block', 'start_minutes', 'end_minutes', 'day', 'location', 'tags',
+                 'is_special_event', 'occurrences')
+
+    FIELDS = (('id', 'id'), ('strand', 'strand'), ('strandName', 'strand_name'), ('type', 'type'),
+              ('typeName', 'type_name'), ('title', 'title'), ('presenter', 'presenter_name'),
+              ('email', 'email'), ('organization', 'organization'), ('description', 'description'),
+              ('preview', 'preview'), ('timeBlock', 'time_block'), ('startMinutes', 'start_minutes'),
+              ('endMinutes', 'end_minutes'), ('day', 'day'), ('location', 'location'), ('tags', 'tags'),
+              ('isSpecialEvent', 'is_special_event'), ('occurrences', 'occurrences'))
+    INTERNED = frozenset({'strand', 'strand_name', 'type', 'type_name', 'location', 'time_block'})
+
+def record_from_dict(data):
+    """A Session or SpecialEvent for one sessions.json entry"""
+    return (SpecialEvent if data.get('isSpecialEvent') else Session).from_dict(data)
+
+def to_json(value):
+    """json.dump default= hook that writes model objects nested in other data as dicts"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def load_sessions(path='sessions.json'):
+    """Read sessions.json into Session and SpecialEvent records"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [record_from_dict(data) for data in json.load(f)]
+
+def dump_sessions(records, path='sessions.json', ensure_ascii=False):
+    """Write records (model objects or plain dicts) as sessions.json, one record at a time"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json_stream.dump(iter(records), f, ensure_ascii=ensure_ascii, default=to_json)
+
+class SessionsWriter(json_stream.ArrayWriter):
+    """
+    Write sessions.json one record at a time, in the layout dump_sessions() produces.
+
+    Used as a context manager; the file is written next to path and only
+    replaces it when the block finishes without an error.
+    """
+
+    def __init__(self, path='sessions.json', ensure_ascii=False):
+        super().__init__(path, ensure_ascii=ensure_ascii, default=to_json)
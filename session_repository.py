@@ -0,0 +1,153 @@
+"""
+Indexed queries over sessions.json
+
+The ad-hoc tools (check_sessions.py, view_sessions.py, the sessions.json
+checks in verify_data_consistency.py, fix_nurenberg_session.py) each walked
+the whole sessions list to find one thing: the "Ungrading" session, the
+Writing Center occurrences, David Nurenberg's session. SessionRepository
+reads the list once and keeps hash indexes on id and email, a TitleIndex on
+the title, and multi-maps from room, time slot, tag and presenter to the
+entries, so those questions cost a lookup plus the size of the answer.
+
+Answers come back in sessions.json order. The indexes describe the entries
+as they were when the repository was built; call reindex() after moving
+sessions between rooms or slots if later queries need to see the change.
+"""
+
+import re
+from collections import defaultdict
+
+from presenter_index import HONORIFICS, surname_key
+from session_model import load_sessions
+from title_index import TitleIndex
+
+def person_key(name):
+    """Comparable form of one presenter's name: no honorifics, accents or periods, casefolded"""
+    words = [surname_key(word) for word in name.split()]
+    return ' '.join(word for word in words if word and word not in HONORIFICS)
+
+def split_presenters(presenters):
+    """The individual names in a presenter field ("A, B and C")"""
+    if not isinstance(presenters, str):
+        return []
+    return [name.strip() for name in re.split(r',|;|&|\band\b', presenters) if name.strip()]
+
+def placements(session):
+    """
+    The occurrences of an entry: its occurrences list, or, for entries without
+    one (special events), the entry itself, which carries timeBlock and location
+    """
+    occurrences = session.get('occurrences')
+    if occurrences:
+        return occurrences
+    if session.get('timeBlock') or session.get('location'):
+        return [session]
+    return []
+
+class SessionRepository:
+    """
+    sessions.json entries with secondary indexes.
+
+    Args:
+        sessions: the entries, Session/SpecialEvent records or plain dicts
+        normalize: applied to stored titles by the title index (see TitleIndex)
+    """
+
+    def __init__(self, sessions, normalize=None):
+        self.sessions = list(sessions)
+        self.normalize = normalize
+        self.reindex()
+
+    @classmethod
+    def load(cls, path='sessions.json', normalize=None):
+        """Read sessions.json into a repository"""
+        return cls(load_sessions(path), normalize=normalize)
+
+    def reindex(self):
+        """(Re)build every index from the current entries"""
+        self.title_index = TitleIndex(self.sessions, normalize=self.normalize)
+        self._ordinals = {}
+        self._positions = {}                # id(occurrence) -> (entry ordinal, occurrence number)
+        self._ids = {}
+        self._emails = defaultdict(list)
+        self._presenters = defaultdict(list)
+        self._tags = defaultdict(list)
+        self._rooms = defaultdict(list)     # location -> [(session, occurrence)]
+        self._slots = defaultdict(list)     # timeBlock -> [(session, occurrence)]
+
+        for ordinal, session in enumerate(self.sessions):
+            self._ordinals[id(session)] = ordinal
+            session_id = session.get('id')
+            if session_id is not None:
+                self._ids.setdefault(str(session_id), session)
+            email = session.get('email')
+            if email:
+                self._emails[email.strip().casefold()].append(session)
+            for key in dict.fromkeys(person_key(name) for name in split_presenters(session.get('presenter'))):
+                if key:
+                    self._presenters[key].append(session)
+            for tag in dict.fromkeys(session.get('tags') or ()):
+                self._tags[tag].append(session)
+            for number, occurrence in enumerate(placements(session)):
+                self._positions[id(occurrence)] = (ordinal, number)
+                location, time_block = occurrence.get('location'), occurrence.get('timeBlock')
+                if location:
+                    self._rooms[location].append((session, occurrence))
+                if time_block:
+                    self._slots[time_block].append((session, occurrence))
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def __iter__(self):
+        return iter(self.sessions)
+
+    def ordinal(self, session):
+        """Position of an entry in sessions.json"""
+        return self._ordinals[id(session)]
+
+    def in_order(self, sessions):
+        """Entries without duplicates, in sessions.json order"""
+        unique = {id(session): session for session in sessions}
+        return sorted(unique.values(), key=self.ordinal)
+
+    def get(self, session_id):
+        """The entry with this id, or None"""
+        return self._ids.get(str(session_id))
+
+    def by_email(self, email):
+        return list(self._emails.get(email.strip().casefold(), ()))
+
+    def by_presenter(self, name):
+        """Entries that list this person among their presenters"""
+        return list(self._presenters.get(person_key(name), ()))
+
+    def with_tag(self, tag):
+        return list(self._tags.get(tag, ()))
+
+    def by_title(self, title):
+        """Exact title match first, then the substring fallback (see TitleIndex.find)"""
+        return self.title_index.find(title)
+
+    def titles_containing(self, text):
+        """Entries whose title contains text"""
+        return self.title_index.containing(text)
+
+    def rooms(self):
+        return list(self._rooms)
+
+    def slots(self):
+        return list(self._slots)
+
+    def in_room(self, room):
+        """(entry, occurrence) pairs held in room"""
+        return list(self._rooms.get(room, ()))
+
+    def in_slot(self, time_block):
+        """(entry, occurrence) pairs held in time slot time_block"""
+        return list(self._slots.get(time_block, ()))
+
+    def in_rooms_matching(self, text):
+        """(entry, occurrence) pairs held in any room whose name contains text"""
+        pairs = [pair for room, held in self._rooms.items() if text in room for pair in held]
+        return sorted(pairs, key=lambda pair: self._positions[id(pair[1])])
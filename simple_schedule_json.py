@@ -1,9 +1,9 @@
-import json
+import json_stream
+from session_model import load_sessions
 
 # Load sessions.json
 try:
-    with open('sessions.json', 'r', encoding='utf-8') as f:
-        sessions = json.load(f)
+    sessions = load_sessions('sessions.json')
     print(f"Successfully loaded sessions.json with {len(sessions)} sessions")
 except Exception as e:
     print(f"Error loading sessions.json: {e}")
@@ -46,7 +46,7 @@ try:
     
     # Save the schedule.json
     with open('schedule.json', 'w', encoding='utf-8') as f:
-        json.dump(schedule_data, f, ensure_ascii=False, indent=2)
+        json_stream.dump(schedule_data, f, ensure_ascii=False)
     
     print(f"Successfully created schedule.json with {len(schedule_data['sessions'])} sessions")
 except Exception as e:
@@ -0,0 +1,165 @@
+"""
+Fused, memoized cleaning of the sessions.csv text fields
+
+Every text field used to go through fix_common_mojibake, then
+html_encode_but_preserve_quotes, then (for descriptions) get_preview, each
+stage building a new string. TextCleaner does the mojibake repair and the
+HTML escaping in a single regex pass, derives the preview from the result,
+and remembers the answer for each raw value: organization names, strand
+labels and tag strings repeat heavily across an export, so most of them are
+only ever cleaned once.
+"""
+
+import re
+from collections import Counter
+
+# Mojibake sequences and their intended characters, applied in order.
+# Order of replacements can matter if one mojibake is a substring of another,
+# but for these specific patterns, it should be fine.
+MOJIBAKE_REPLACEMENTS = [
+    # More complex (double-encoded) mojibakes first
+    ("Ã¢â¬â¢", "’"),  # U+2019 RIGHT SINGLE QUOTATION MARK
+    ("Ã¢â¬Ëœ", "‘"),  # U+2018 LEFT SINGLE QUOTATION MARK
+    ("Ã¢â¬Â", "”"),  # U+201D RIGHT DOUBLE QUOTATION MARK (corrected from Âť)
+    ("Ã¢â¬Å“", "“"),  # U+201C LEFT DOUBLE QUOTATION MARK
+    ("Ã¢â¬â", "–"),  # U+2013 EN DASH
+    ("Ã¢â¬â", "—"),  # U+2014 EM DASH
+    ("Ã¢â¬Â¦", "…"),  # U+2026 HORIZONTAL ELLIPSIS
+
+    # Simpler mojibakes (UTF-8 bytes misread as single-byte encoding)
+    ("â€™", "’"),
+    ("â€˜", "‘"),
+    ("â€", "”"), # Common for right double quote
+    ("â€ś", "“"), # Common for left double quote
+    ("â€“", "–"),
+    ("â€”", "—"),
+    ("â€¦", "…"),
+    ("â‚¬", "€"), # Euro sign, just in case
+
+    # Special case for "Ő" and "Ń" from user's calendar.html example if they appear mangled
+    # Example: If "Ő" (U+0150) became "Å" (UTF-8 bytes C5 90 misread as latin1/cp1252)
+    ("Å", "Ő"),
+    # Example: If "Ń" (U+0143) became "Å" (UTF-8 bytes C5 83 misread as latin1/cp1252)
+    ("Å", "Ń"),
+]
+
+
+# html.escape followed by un-escaping the quotes only ever touches &, < and >
+HTML_ESCAPES = [("&", "&amp;"), ("<", "&lt;"), (">", "&gt;")]
+
+_MOJIBAKE = dict(MOJIBAKE_REPLACEMENTS)
+_CLEAN = dict(MOJIBAKE_REPLACEMENTS + HTML_ESCAPES)
+
+def _alternation(table):
+    # Longest first, so a sequence is never cut short by one of its prefixes
+    return re.compile('|'.join(re.escape(key) for key in sorted(table, key=len, reverse=True)))
+
+_MOJIBAKE_RE = _alternation(_MOJIBAKE)
+_CLEAN_RE = _alternation(_CLEAN)
+
+def _substitute(pattern, table, text):
+    return pattern.sub(lambda match: table[match.group()], text)
+
+def _is_missing(value):
+    # NaN is the only value that is not equal to itself
+    return value is None or value != value
+
+def truncate_preview(text, max_length=150):
+    """The truncation rule of generate_master_sessions.get_preview"""
+    if len(text) <= max_length:
+        return text
+    # Try to truncate at a sentence or period
+    last_period = text[:max_length].rfind('.')
+    if last_period > max_length * 0.5:  # Only use period if it's not too short
+        return text[:last_period + 1]
+    # Otherwise truncate at a word boundary
+    last_space = text[:max_length].rfind(' ')
+    if last_space != -1:
+        return text[:last_space] + "..."
+    return text[:max_length] + "..."
+
+class TextCleaner:
+    """
+    Clean CSV text values in one pass each, memoized on the raw value.
+
+    clean() gives the same result as fix_common_mojibake followed by
+    html_encode_but_preserve_quotes (blank values become None),
+    clean_description() adds the get_preview preview, and tags() matches
+    extract_tags(fix_common_mojibake(...)). Hit counts are kept per field
+    name so report() can show where the memo pays off.
+    """
+
+    def __init__(self, preview_length=150, max_entries=None):
+        self.preview_length = preview_length
+        # Streaming ingestion bounds each memo; a full memo is emptied and starts over
+        self.max_entries = max_entries
+        self._text = {}
+        self._descriptions = {}
+        self._tags = {}
+        self.calls = Counter()
+        self.hits = Counter()
+        self.cleaned = 0
+
+    def _lookup(self, memo, raw, field, compute):
+        self.calls[field] += 1
+        try:
+            result = memo[raw]
+        except KeyError:
+            if self.max_entries is not None and len(memo) >= self.max_entries:
+                memo.clear()
+            result = memo[raw] = compute(raw)
+            self.cleaned += 1
+        else:
+            self.hits[field] += 1
+        return result
+
+    @staticmethod
+    def _clean(raw):
+        text = str(raw)
+        if text.strip() == "":
+            return None
+        return _substitute(_CLEAN_RE, _CLEAN, text)
+
+    def clean(self, raw, field='text'):
+        """Mojibake-fixed, HTML-escaped text, or None for missing/blank values"""
+        if _is_missing(raw):
+            return None
+        return self._lookup(self._text, raw, field, self._clean)
+
+    def clean_description(self, raw, field='description'):
+        """(cleaned description, preview) for a description value"""
+        if _is_missing(raw):
+            return None, ""
+
+        def compute(value):
+            description = self._clean(value)
+            # Escaping has already turned any markup into entities, so there are
+            # no tags left for get_preview's tag stripping to remove
+            return description, truncate_preview(description, self.preview_length) if description else ""
+
+        return self._lookup(self._descriptions, raw, field, compute)
+
+    def tags(self, raw, field='tags'):
+        """List of tags in a comma-separated tags value"""
+        if _is_missing(raw):
+            return []
+
+        def compute(value):
+            text = _substitute(_MOJIBAKE_RE, _MOJIBAKE, str(value))
+            return tuple(tag.strip() for tag in text.split(',') if tag.strip())
+
+        # Each session gets its own list; the memo keeps an immutable tuple
+        return list(self._lookup(self._tags, raw, field, compute))
+
+    def report(self):
+        """Print the memo hit rate for each field and overall"""
+        total_calls = sum(self.calls.values())
+        if not total_calls:
+            return
+        print("Text cleaning cache:")
+        for field, calls in self.calls.items():
+            hits = self.hits[field]
+            print(f"  {field:<14} {calls:>8} values, {hits:>8} cache hits ({hits / calls:.1%})")
+        total_hits = sum(self.hits.values())
+        print(f"  {'total':<14} {total_calls:>8} values, {total_hits:>8} cache hits ({total_hits / total_calls:.1%}), "
+              f"{self.cleaned} distinct values cleaned")
@@ -0,0 +1,216 @@
+"""
+Encoding detection for the form exports
+
+sessions.csv arrives either as clean UTF-8, as a single-byte Windows export
+(cp1252), or as UTF-8 that was decoded as cp1252 and re-encoded somewhere
+along the way ("experiencesâ€”such as"). Rather than patching the mojibake
+string by string after parsing, read_csv_decoded() looks at the raw bytes
+once, picks the right decoding for the whole file and repairs any
+double-encoded runs before pandas sees the text.
+"""
+
+import codecs
+import io
+import re
+
+import pandas as pd
+
+import input_cache
+
+SAMPLE_SIZE = 64 * 1024
+
+def _cp1252_char(byte):
+    """The character a byte shows up as when UTF-8 is misread as cp1252"""
+    try:
+        return bytes([byte]).decode('cp1252')
+    except UnicodeDecodeError:
+        # 0x81, 0x8D, 0x8F, 0x90 and 0x9D are undefined in cp1252 and pass through as latin-1
+        return chr(byte)
+
+_CHAR_TO_BYTE = {_cp1252_char(byte): byte for byte in range(0x80, 0x100)}
+
+def _char_class(first, last):
+    return '[' + ''.join(re.escape(_cp1252_char(byte)) for byte in range(first, last + 1)) + ']'
+
+_LEAD_2 = _char_class(0xC2, 0xDF)
+_LEAD_3 = _char_class(0xE0, 0xEF)
+_LEAD_4 = _char_class(0xF0, 0xF4)
+_CONTINUATION = _char_class(0x80, 0xBF)
+
+# A complete UTF-8 multibyte sequence spelled out as cp1252 characters
+DOUBLE_ENCODED_RE = re.compile(
+    f'{_LEAD_2}{_CONTINUATION}|{_LEAD_3}{_CONTINUATION}{{2}}|{_LEAD_4}{_CONTINUATION}{{3}}'
+)
+
+# Cheap screen: a lead character followed by a continuation character.
+# Every entry in text_cleaning.MOJIBAKE_REPLACEMENTS starts this way.
+MOJIBAKE_HINT_RE = re.compile(f'(?:{_LEAD_2}|{_LEAD_3}|{_LEAD_4}){_CONTINUATION}')
+
+# The same screen on the raw bytes: the UTF-8 form of a lead character (U+00C2-U+00F4,
+# C3 82..C3 B4) followed by that of a continuation character (U+00A0-U+00BF as C2 xx,
+# € ‘ ’ “ ” – — ™ ... as E2 80-84 xx, Š Œ Ž ƒ ˆ ˜ ... as C5/C6/CB xx)
+_DOUBLE_ENCODED_BYTES_RE = re.compile(
+    rb'\xc3[\x82-\xb4](?:\xc2[\x80-\xbf]|\xe2[\x80-\x84][\x80-\xbf]|[\xc5\xc6\xcb][\x80-\xbf])'
+)
+
+def looks_mojibaked(text):
+    """Return True if text may still contain UTF-8 that was misread as cp1252"""
+    return isinstance(text, str) and MOJIBAKE_HINT_RE.search(text) is not None
+
+def repair_double_encoding(text, max_rounds=3):
+    """
+    Undo UTF-8 -> cp1252 -> UTF-8 double encoding in the runs where it occurred.
+
+    Only complete multibyte sequences are touched, so correctly encoded text
+    next to them (curly quotes, accented names) is left alone. Repeats for
+    text that went through the round trip more than once.
+    """
+    def undo(match):
+        try:
+            return bytes(_CHAR_TO_BYTE[char] for char in match.group()).decode('utf-8')
+        except UnicodeDecodeError:
+            return match.group()
+
+    for _ in range(max_rounds):
+        repaired = DOUBLE_ENCODED_RE.sub(undo, text)
+        if repaired == text:
+            break
+        text = repaired
+    return text
+
+def detect_encoding(raw, sample_size=SAMPLE_SIZE):
+    """
+    Classify raw file bytes from a sample.
+
+    Returns one of 'utf-8-sig', 'utf-8', 'utf-8+double' (UTF-8 containing
+    double-encoded runs) or 'cp1252'.
+    """
+    if raw.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    sample = raw[:sample_size]
+    try:
+        sample.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # A sequence cut off by the end of the sample is still valid UTF-8
+        if e.start < len(sample) - 3:
+            return 'cp1252'
+    if _DOUBLE_ENCODED_BYTES_RE.search(raw):
+        return 'utf-8+double'
+    return 'utf-8'
+
+def decode_bytes(raw):
+    """Decode raw file bytes with the detected encoding; returns (text, encoding)"""
+    encoding = detect_encoding(raw)
+    if encoding == 'cp1252':
+        return raw.decode('cp1252', errors='replace'), encoding
+    try:
+        text = raw.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        # The sample looked like UTF-8 but the rest of the file is not
+        return raw.decode('cp1252', errors='replace'), 'cp1252'
+    if encoding == 'utf-8+double':
+        text = repair_double_encoding(text)
+    return text, encoding
+
+def detect_file_encoding(path, block_size=1 << 20):
+    """
+    detect_encoding() for a file, without holding the whole file in memory.
+
+    The first SAMPLE_SIZE bytes decide BOM and cp1252 as before; the rest is
+    read block by block to look for double-encoded runs and to catch a file
+    that stops being valid UTF-8 after the sample (read as cp1252, like
+    decode_bytes() does).
+    """
+    with open(path, 'rb') as f:
+        head = f.read(SAMPLE_SIZE)
+        encoding = detect_encoding(head)
+        if encoding in ('utf-8-sig', 'cp1252'):
+            return encoding
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        double = False
+        tail = b''
+        block = head
+        while block:
+            try:
+                decoder.decode(block)
+            except UnicodeDecodeError:
+                return 'cp1252'
+            # Keep a few bytes so a run split across two blocks is still seen
+            window = tail + block
+            double = double or _DOUBLE_ENCODED_BYTES_RE.search(window) is not None
+            tail = window[-8:]
+            block = f.read(block_size)
+        try:
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            return 'cp1252'
+    return 'utf-8+double' if double else 'utf-8'
+
+class _RepairingReader:
+    """File-like text reader that repairs double-encoded runs one line at a time"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._buffer = ''
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            text, self._buffer = self._buffer + repair_double_encoding(self._stream.read()), ''
+            return text
+        while len(self._buffer) < size:
+            line = self._stream.readline()
+            if not line:
+                break
+            # A double-encoded sequence never spans a line break
+            self._buffer += repair_double_encoding(line)
+        text, self._buffer = self._buffer[:size], self._buffer[size:]
+        return text
+
+    def __iter__(self):
+        for line in self._stream:
+            yield repair_double_encoding(line)
+
+    def close(self):
+        self._stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def open_decoded(path):
+    """
+    Open a text file for streaming with the encoding detected for the whole file.
+
+    Returns (stream, encoding). The stream yields the same text read_text()
+    would return, without reading the file into memory first.
+    """
+    encoding = detect_file_encoding(path)
+    if encoding == 'cp1252':
+        return open(path, 'r', encoding='cp1252', errors='replace', newline=''), encoding
+    stream = open(path, 'r', encoding='utf-8-sig', newline='')
+    if encoding == 'utf-8+double':
+        stream = _RepairingReader(stream)
+    return stream, encoding
+
+def read_text(path):
+    """Read a text file, decoding it once with the detected encoding"""
+    with open(path, 'rb') as f:
+        text, encoding = decode_bytes(f.read())
+    print(f"INFO: {path} decoded as {encoding}")
+    return text
+
+def _parse_csv_decoded(path, read_csv_kwargs):
+    with open(path, 'rb') as f:
+        text, encoding = decode_bytes(f.read())
+    frame = pd.read_csv(io.StringIO(text), **read_csv_kwargs)
+    frame.attrs['encoding'] = encoding
+    return frame
+
+def read_csv_decoded(path, **read_csv_kwargs):
+    """pd.read_csv on a file decoded once with the detected encoding (through the input cache)"""
+    frame = input_cache.cached_parse(path, 'read_csv_decoded', read_csv_kwargs,
+                                     lambda: _parse_csv_decoded(path, read_csv_kwargs))
+    print(f"INFO: {path} decoded as {frame.attrs.get('encoding')}")
+    return frame
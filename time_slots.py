@@ -0,0 +1,83 @@
+"""
+Numeric time model for the schedule slots
+
+The time blocks are display strings ("10:15 - 11:15", "1:30 - 2:30",
+"2:35-3:00") written on a 12-hour clock without am/pm. block_interval()
+turns one into (start, end) minutes after midnight so blocks can be
+compared and overlapped. As on the pages, an hour from 1 to 7 without am/pm
+is read as afternoon; an explicit am/pm is honoured.
+
+resolve_slot() maps a schedule grid slot name to its label and resolves it
+once into a TimeSlot. The build writes the numbers next to every timeBlock,
+as startMinutes, endMinutes and day (time_fields()), so the pages sort and
+compare integers instead of parsing the labels again.
+"""
+
+import re
+from collections import namedtuple
+
+BLOCK_RE = re.compile(r'^\s*(\d{1,2}):(\d{2})\s*([ap]\.?m\.?)?\s*[-–]\s*(\d{1,2}):(\d{2})\s*([ap]\.?m\.?)?\s*$',
+                      re.IGNORECASE)
+
+def clock_minutes(hours, minutes, modifier=None):
+    """Minutes after midnight of a 12-hour clock time"""
+    if modifier:
+        is_pm = modifier[0].lower() == 'p'
+        hours = hours % 12 + (12 if is_pm else 0)
+    elif 1 <= hours <= 7:
+        hours += 12
+    return hours * 60 + minutes
+
+def block_interval(time_block):
+    """(start, end) minutes of a time block label, or None if it is not a 'h:mm - h:mm' range"""
+    match = BLOCK_RE.match(time_block) if isinstance(time_block, str) else None
+    if not match:
+        return None
+    start_hours, start_minutes, start_modifier, end_hours, end_minutes, end_modifier = match.groups()
+    start = clock_minutes(int(start_hours), int(start_minutes), start_modifier)
+    end = clock_minutes(int(end_hours), int(end_minutes), end_modifier)
+    if end <= start:
+        return None
+    return start, end
+
+# Slot names used in the schedule grids and the time block label each one is shown as
+SLOT_LABELS = {
+    "Slot 1 (10:15-11:15)": "10:15 - 11:15",
+    "Slot 2 (11:30-12:30)": "11:30 - 12:30",
+    "Slot 3 (1:30-2:30)": "1:30 - 2:30",
+    "Slot 4 (2:45-3:45)": "2:45 - 3:45",
+    "8:00-9:00": "8:00 - 9:00",
+    "9:00-10:00": "9:00 - 10:00",
+    "3:45-4:30": "3:45 - 4:30"
+}
+
+# The symposium runs on one day; day numbers the days of a longer schedule
+DEFAULT_DAY = 1
+
+# start and end are minutes after midnight, or None when the label is not a time range (TBD)
+TimeSlot = namedtuple('TimeSlot', ['label', 'day', 'start', 'end'])
+
+def resolve_slot(slot_name, day=DEFAULT_DAY):
+    """The TimeSlot of a grid slot name or time block label"""
+    label = SLOT_LABELS.get(slot_name, slot_name)
+    start, end = block_interval(label) or (None, None)
+    return TimeSlot(label, day, start, end)
+
+def time_fields(time_slot):
+    """The sessions.json keys written next to a timeBlock"""
+    return {'startMinutes': time_slot.start, 'endMinutes': time_slot.end, 'day': time_slot.day}
+
+def annotate(sessions, day=DEFAULT_DAY):
+    """
+    Set startMinutes, endMinutes and day from the timeBlock of every occurrence
+    and special event, resolving each distinct label once. Used after steps
+    that move sessions between slots, so the numbers match the labels.
+    """
+    resolved = {}
+    for session in sessions:
+        for placement in [session] if session.get('isSpecialEvent') else session.get('occurrences') or []:
+            label = placement.get('timeBlock')
+            if label not in resolved:
+                resolved[label] = time_fields(resolve_slot(label, day))
+            for key, value in resolved[label].items():
+                placement[key] = value
@@ -0,0 +1,99 @@
+"""
+Title lookup index shared by the grid converters
+
+The converters used to resolve every grid cell with two scans of the whole
+sessions list: one for an exact title match, then one for a substring match
+in either direction (the Excel titles are sometimes truncated, sometimes
+carry extra text). TitleIndex is built once per run and answers both
+questions from hash maps: a dict on the normalized title for exact hits, and
+trigram posting lists for the substring case. Results are the same as the
+linear scans, including which entry wins when several match (the first one
+in list order).
+"""
+
+from collections import defaultdict
+
+GRAM = 3
+
+def _grams(text):
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+class TitleIndex:
+    """
+    Exact and substring title lookups over a list of items.
+
+    Args:
+        items: the records to index, usually session dicts
+        normalize: applied to each stored title (not to queries; normalize those yourself)
+        key: returns an item's title; defaults to item.get('title')
+    """
+
+    def __init__(self, items, normalize=None, key=None):
+        self.items = list(items)
+        self.normalize = normalize or (lambda title: title)
+        key = key or (lambda item: item.get('title'))
+
+        self.titles = [self.normalize(key(item) or '') for item in self.items]
+        self._exact = {}
+        self._postings = defaultdict(list)      # trigram -> ordinals of titles containing it
+        self._first_gram = defaultdict(list)    # leading trigram -> ordinals
+        self._short = []                        # ordinals of non-empty titles shorter than a trigram
+
+        for ordinal, title in enumerate(self.titles):
+            if not title:
+                continue
+            self._exact.setdefault(title, ordinal)
+            if len(title) < GRAM:
+                self._short.append(ordinal)
+                continue
+            self._first_gram[title[:GRAM]].append(ordinal)
+            for gram in _grams(title):
+                self._postings[gram].append(ordinal)
+
+    def __len__(self):
+        return len(self.items)
+
+    def exact(self, title):
+        """Return the first item whose title equals title, or None"""
+        ordinal = self._exact.get(title)
+        return None if ordinal is None else self.items[ordinal]
+
+    def _containing_query(self, query):
+        """Ordinals of titles that contain query"""
+        if len(query) < GRAM:
+            return [i for i, title in enumerate(self.titles) if title and query in title]
+        postings = sorted((self._postings.get(gram, []) for gram in _grams(query)), key=len)
+        if not postings[0]:
+            return []
+        # The rarest trigram gives a short candidate list; the substring test settles the rest
+        return [i for i in postings[0] if query in self.titles[i]]
+
+    def _contained_in_query(self, query):
+        """Ordinals of titles that are substrings of query"""
+        found = [i for i in self._short if self.titles[i] in query]
+        for gram in _grams(query):
+            found.extend(i for i in self._first_gram.get(gram, ()) if self.titles[i] in query)
+        return found
+
+    def containing(self, text):
+        """Return every item whose title contains text, in list order"""
+        if not text:
+            return []
+        return [self.items[i] for i in sorted(self._containing_query(text))]
+
+    def substring(self, title):
+        """
+        Return the first item whose title contains title or is contained in it, or None.
+
+        This is the "title might be truncated in Excel" fallback of the old
+        find_session_by_title scans.
+        """
+        if not title:
+            return None
+        candidates = self._containing_query(title) + self._contained_in_query(title)
+        return self.items[min(candidates)] if candidates else None
+
+    def find(self, title):
+        """Exact match first, then the substring fallback"""
+        match = self.exact(title)
+        return match if match is not None else self.substring(title)
@@ -5,10 +5,10 @@
 echo "=== Master Update Process ==="
 
 echo "Step 1: Generating sessions.json from CSV and Excel data..."
-python3 generate_master_sessions.py
+python3 generate_master_sessions.py --incremental
 
 echo ""
-echo "Step 2: Verifying sessions.json (schedule, index, calendar scripts now only verify)..."
+echo "Step 2: Writing the prerendered schedule grid, index cards and calendar grid into the pages..."
 python3 update_schedule_from_json.py
 python3 update_index_from_json.py
 python3 update_calendar_from_json.py
@@ -16,6 +16,7 @@ python3 update_calendar_from_json.py
 echo ""
 echo "Step 3: Verifying data consistency across sources (optional but recommended)..."
 python3 verify_data_consistency.py
+python3 booking_conflicts.py
 
 echo ""
 echo "Master update process complete. sessions.json is the single source of truth for HTML pages."
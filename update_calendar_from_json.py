@@ -1,16 +1,17 @@
 """
-Update calendar.html based on the master sessions.json file
+Prerender the calendar.html grid from sessions.json.
+
+calendar.html fetches sessions.json (or its listing index) itself; this
+writes the time block x room grid it would build into the page as well, so
+the calendar is there on first paint (see grid_prerender.py).
 """
 
-import json
 import os
+from grid_prerender import CALENDAR_END, CALENDAR_START, write_calendar
+from session_model import load_sessions
 
 def main():
-    print("Ensuring calendar.html uses sessions.json directly.")
-    # This script previously generated calendar_data.json and modified calendar.html
-    # to use it. Since calendar.html has been updated to use sessions.json directly,
-    # this script's main role in generating calendar_data.json is no longer needed.
-    # We will remove the parts that create calendar_data.json and modify HTML.
+    print("Prerendering the calendar.html grid from sessions.json...")
 
     try:
         # Verify sessions.json exists
@@ -18,12 +19,16 @@ def main():
             print("Error: sessions.json not found. Please run generate_master_sessions.py first.")
             return 1
         
-        with open('sessions.json', 'r', encoding='utf-8') as f:
-            sessions = json.load(f)
+        sessions = load_sessions('sessions.json')
         print(f"Verified sessions.json. It contains {len(sessions)} sessions.")
 
-        print("Successfully verified that calendar.html should use sessions.json.")
-        print("The script update_calendar_from_json.py no longer generates calendar_data.json or modifies calendar.html.")
+        try:
+            count = write_calendar('calendar.html', sessions)
+        except ValueError:
+            print(f"Error: Could not find the {CALENDAR_START} ... {CALENDAR_END} region in calendar.html")
+            return 1
+
+        print(f"Successfully prerendered the calendar.html grid ({count} session cards)")
         
     except Exception as e:
         print(f"Error in update_calendar_from_json.py: {e}")
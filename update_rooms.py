@@ -1,6 +1,14 @@
 import json
 import re
 
+from match_memo import MatchMemo
+from schedule_grid import split_presenter_prefix
+from title_index import TitleIndex
+from session_model import load_sessions, dump_sessions
+
+# Version of the partial-match rules below, stored with remembered matches
+MATCH_VERSION = 'substring-1'
+
 def normalize_title(title):
     """
     Normalize session titles by converting HTML entities and handling different quote types
@@ -14,9 +22,13 @@ def normalize_title(title):
                       .replace('"', '"'))
     return normalized
 
-def find_session_by_title(sessions, schedule_title):
+def find_session_by_title(title_index, schedule_title, presenter_index=None):
     """
     Find a session by title, accounting for variations in formatting
+
+    title_index (and presenter_index, if given) are built over the sessions with
+    normalize=normalize_title. A "Lastname: Title" prefix is resolved through
+    presenter_index first.
     """
     # Handle special events
     if isinstance(schedule_title, str) and ("arrival" in schedule_title.lower() or 
@@ -25,29 +37,129 @@ def find_session_by_title(sessions, schedule_title):
         # These don't need to be matched against regular sessions
         return None
         
+    # "Lastname: Title" cells: the surname narrows the search to that presenter's sessions
+    presenter, cell_title = split_presenter_prefix(schedule_title)
+    if presenter and presenter_index is not None:
+        session = presenter_index.match(presenter, normalize_title(cell_title))
+        if session is not None:
+            return session
+    
     # Remove any presenter prefix (e.g., "Cotton: ")
     clean_title = re.sub(r'(.+?):\s*', '', schedule_title).strip() if isinstance(schedule_title, str) else ""
     normalized_schedule_title = normalize_title(clean_title)
     
-    # First try exact match with normalized titles
-    for session in sessions:
-        session_title = session.get('title', '')
-        normalized_session_title = normalize_title(session_title)
+    # Exact match with normalized titles first, then partial match
+    return title_index.find(normalized_schedule_title)
+
+def assign_rooms(schedule_data, sessions_data):
+    """
+    Fill in the locations (and TBD time blocks) of sessions_data from schedule_data
+
+    Returns the number of sessions updated.
+    """
+    # Create mapping of session title to room and time slot
+    session_info = {}
+    for session in schedule_data['sessions']:
+        title = session.get('title', '')
+        room = session.get('room', '')
+        time_slot = session.get('timeSlot', '')
         
-        if normalized_session_title == normalized_schedule_title:
-            return session
+        if title and room:
+            # Handle duplicate sessions (same session in multiple time slots)
+            if title in session_info:
+                # If we already have this session, append the time slot
+                existing_room = session_info[title]['room']
+                existing_time = session_info[title]['time_slot']
+                
+                # If rooms match, just update the time slot
+                if existing_room == room:
+                    # Only append if it's a different time slot
+                    if time_slot != existing_time and time_slot not in existing_time:
+                        session_info[title]['time_slot'] = f"{existing_time} and {time_slot}"
+                else:
+                    # If rooms don't match, specify room per time slot
+                    combined_info = f"{existing_time} in {existing_room} and {time_slot} in {room}"
+                    session_info[title] = {
+                        'room': f"{existing_room}/{room}",
+                        'time_slot': combined_info
+                    }
+            else:
+                session_info[title] = {
+                    'room': room,
+                    'time_slot': time_slot
+                }
     
-    # Then try partial match
-    for session in sessions:
+    # Index the schedule titles once for the partial-match fallback below
+    schedule_title_index = TitleIndex(session_info.items(), normalize=normalize_title,
+                                      key=lambda item: item[0])
+    memo = MatchMemo('update_rooms', session_info, version=MATCH_VERSION)
+    
+    # Update session locations
+    updated_count = 0
+    special_cases = ["Student Buy-In", "Deeper Dive"]
+    
+    for session in sessions_data:
         session_title = session.get('title', '')
-        normalized_session_title = normalize_title(session_title)
+        normalized_title = normalize_title(session_title)
         
-        if (normalized_schedule_title and normalized_session_title and 
-            (normalized_schedule_title in normalized_session_title or 
-             normalized_session_title in normalized_schedule_title)):
-            return session
+        # Handle special cases by name
+        special_case = False
+        for case in special_cases:
+            if case in session_title:
+                special_case = True
+                break
+        
+        # Skip sessions that already have locations and aren't special cases
+        if session.get('location') and not special_case:
+            continue
+            
+        # Check for special venues for keynote, arrival, etc.
+        if "keynote" in session_title.lower() or "arrival" in session_title.lower() or "closing" in session_title.lower():
+            session['location'] = "Hubbard Auditorium"
+            updated_count += 1
+            continue
+            
+        # Direct lookup by title
+        if normalized_title in session_info:
+            session['location'] = session_info[normalized_title]['room']
+            if session.get('timeBlock') == 'TBD':
+                session['timeBlock'] = session_info[normalized_title]['time_slot']
+            updated_count += 1
+            continue
+        
+        # Fuzzy matching for harder-to-match titles
+        found_session = False
+        entry = memo.get(normalized_title)
+        if entry is not None:
+            match = (entry['target'], session_info[entry['target']]) if entry['target'] is not None else None
+        else:
+            match = schedule_title_index.substring(normalized_title)
+            memo.put(normalized_title, match[0] if match is not None else None,
+                     session_id=session.get('id'))
+        if match is not None:
+            schedule_title, info = match
+            session['location'] = info['room']
+            if session.get('timeBlock') == 'TBD':
+                session['timeBlock'] = info['time_slot']
+            updated_count += 1
+            found_session = True
+        
+        if not found_session and special_case:
+            # Handle known special cases
+            if "Student Buy-In" in session_title and "Ungrading" in session_title:
+                session['location'] = "Room G"
+                session['timeBlock'] = "Slot 1 (10:15-11:15) and Slot 2 (11:30-12:30)"
+                updated_count += 1
+            elif "Deeper Dive" in session_title:
+                session['location'] = "Room A"
+                session['timeBlock'] = "Slot 1 (10:15-11:15)"
+                updated_count += 1
     
-    return None
+    memo.save()
+    
+    print(f"Updated {updated_count} sessions with room assignments.")
+    print(memo.report())
+    return updated_count
 
 def update_calendar_with_rooms():
     """
@@ -58,105 +170,14 @@ def update_calendar_with_rooms():
         with open('schedule.json', 'r') as f:
             schedule_data = json.load(f)
         
-        # Create mapping of session title to room and time slot
-        session_info = {}
-        for session in schedule_data['sessions']:
-            title = session.get('title', '')
-            room = session.get('room', '')
-            time_slot = session.get('timeSlot', '')
-            
-            if title and room:
-                # Handle duplicate sessions (same session in multiple time slots)
-                if title in session_info:
-                    # If we already have this session, append the time slot
-                    existing_room = session_info[title]['room']
-                    existing_time = session_info[title]['time_slot']
-                    
-                    # If rooms match, just update the time slot
-                    if existing_room == room:
-                        # Only append if it's a different time slot
-                        if time_slot != existing_time and time_slot not in existing_time:
-                            session_info[title]['time_slot'] = f"{existing_time} and {time_slot}"
-                    else:
-                        # If rooms don't match, specify room per time slot
-                        combined_info = f"{existing_time} in {existing_room} and {time_slot} in {room}"
-                        session_info[title] = {
-                            'room': f"{existing_room}/{room}",
-                            'time_slot': combined_info
-                        }
-                else:
-                    session_info[title] = {
-                        'room': room,
-                        'time_slot': time_slot
-                    }
-        
         # Load session data
-        with open('sessions.json', 'r') as f:
-            sessions_data = json.load(f)
-        
-        # Update session locations
-        updated_count = 0
-        special_cases = ["Student Buy-In", "Deeper Dive"]
+        sessions_data = load_sessions('sessions.json')
         
-        for session in sessions_data:
-            session_title = session.get('title', '')
-            normalized_title = normalize_title(session_title)
-            
-            # Handle special cases by name
-            special_case = False
-            for case in special_cases:
-                if case in session_title:
-                    special_case = True
-                    break
-            
-            # Skip sessions that already have locations and aren't special cases
-            if session.get('location') and not special_case:
-                continue
-                
-            # Check for special venues for keynote, arrival, etc.
-            if "keynote" in session_title.lower() or "arrival" in session_title.lower() or "closing" in session_title.lower():
-                session['location'] = "Hubbard Auditorium"
-                updated_count += 1
-                continue
-                
-            # Direct lookup by title
-            if normalized_title in session_info:
-                session['location'] = session_info[normalized_title]['room']
-                if session.get('timeBlock') == 'TBD':
-                    session['timeBlock'] = session_info[normalized_title]['time_slot']
-                updated_count += 1
-                continue
-            
-            # Fuzzy matching for harder-to-match titles
-            found_session = False
-            for schedule_title, info in session_info.items():
-                normalized_schedule_title = normalize_title(schedule_title)
-                if (normalized_title and normalized_schedule_title and
-                    (normalized_title in normalized_schedule_title or 
-                     normalized_schedule_title in normalized_title)):
-                    session['location'] = info['room']
-                    if session.get('timeBlock') == 'TBD':
-                        session['timeBlock'] = info['time_slot']
-                    updated_count += 1
-                    found_session = True
-                    break
-            
-            if not found_session and special_case:
-                # Handle known special cases
-                if "Student Buy-In" in session_title and "Ungrading" in session_title:
-                    session['location'] = "Room G"
-                    session['timeBlock'] = "Slot 1 (10:15-11:15) and Slot 2 (11:30-12:30)"
-                    updated_count += 1
-                elif "Deeper Dive" in session_title:
-                    session['location'] = "Room A"
-                    session['timeBlock'] = "Slot 1 (10:15-11:15)"
-                    updated_count += 1
+        assign_rooms(schedule_data, sessions_data)
         
         # Save updated sessions data
-        with open('sessions.json', 'w') as f:
-            json.dump(sessions_data, f, indent=2)
+        dump_sessions(sessions_data, 'sessions.json', ensure_ascii=True)
         
-        print(f"Updated {updated_count} sessions with room assignments.")
         return True
         
     except Exception as e:
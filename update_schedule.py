@@ -2,13 +2,26 @@
 This script updates the schedule.json file based on the session_schedule_by_slot.xlsx file
 """
 
-import pandas as pd
-import json
 import os
 import re
 
-def find_session_by_title(sessions, title):
-    """Find a session in the sessions list by title (or partial title match)"""
+import input_cache
+import json_stream
+from presenter_index import PresenterIndex
+from schedule_grid import melt_schedule_grid, grid_rooms, grid_slots, split_presenter_prefix
+from title_index import TitleIndex
+from session_model import load_sessions
+
+def normalize_entities(title):
+    """Normalize HTML entities like &quot; to actual quotes"""
+    return title.replace('&quot;', '"').replace('&#x27;', "'")
+
+def find_session_by_title(title_index, title, presenter_index=None):
+    """
+    Find a session by presenter surname and title, or by title (or partial title match) alone
+
+    title_index and presenter_index are built over the sessions with normalize=normalize_entities.
+    """
     # For special events like arrival, keynote, closing
     if "arrival" in title.lower() or "keynote" in title.lower() or "closing" in title.lower():
         # Create a special session object for these events
@@ -24,28 +37,23 @@ def find_session_by_title(sessions, title):
         }
         
     # Normal session matching logic
+    # "Lastname: Title" cells: the surname narrows the search to that presenter's sessions
+    presenter, cell_title = split_presenter_prefix(title)
+    if presenter and presenter_index is not None:
+        session = presenter_index.match(presenter, normalize_entities(cell_title))
+        if session is not None:
+            return session
+    
     # Remove any presenter or custom notation from the title
     clean_title = re.sub(r'(.+?):\s*', '', title).strip()
     
     # Normalize quotes - replace different types of quotes with simple double quotes
     clean_title = clean_title.replace('"', '"').replace('"', '"')
     
-    # First try exact match with normalized quotes
-    for session in sessions:
-        session_title = session.get('title', '')
-        # Normalize HTML entities like &quot; to actual quotes
-        normalized_title = session_title.replace('&quot;', '"').replace('&#x27;', "'")
-        
-        if normalized_title == clean_title:
-            return session
-    
-    # Then try partial match (title might be truncated in Excel)
-    for session in sessions:
-        session_title = session.get('title', '')
-        normalized_title = session_title.replace('&quot;', '"').replace('&#x27;', "'")
-        
-        if clean_title and normalized_title and (clean_title in normalized_title or normalized_title in clean_title):
-            return session
+    # Exact match with normalized quotes first, then partial match (title might be truncated in Excel)
+    session = title_index.find(clean_title)
+    if session is not None:
+        return session
     
     # If no match, return a placeholder
     return {
@@ -69,23 +77,22 @@ def excel_to_schedule_json(excel_file, sessions_json_file, output_file='schedule
     """
     try:
         # Load Excel file
-        df = pd.read_excel(excel_file)
+        df = input_cache.read_excel(excel_file)
         
         # Load sessions data
-        with open(sessions_json_file, 'r') as f:
-            sessions_data = json.load(f)
+        sessions_data = load_sessions(sessions_json_file)
+        title_index = TitleIndex(sessions_data, normalize=normalize_entities)
+        presenter_index = PresenterIndex(sessions_data, normalize=normalize_entities)
         
         # Create schedule structure
         schedule = {
             "timeSlots": [],
-            "rooms": df.columns[1:].tolist(),  # Skip the first column (Time Slot)
+            "rooms": grid_rooms(df),  # Skip the first column (Time Slot)
             "sessions": []
         }
         
         # Process each row (time slot)
-        for _, row in df.iterrows():
-            time_slot = row['Time Slot']
-            
+        for time_slot in grid_slots(df):
             # Extract time range from slot name, e.g., "Slot 1 (10:15-11:15)" -> "10:15-11:15"
             time_range = re.search(r'\((.*?)\)', time_slot)
             time_range = time_range.group(1) if time_range else time_slot
@@ -95,36 +102,31 @@ def excel_to_schedule_json(excel_file, sessions_json_file, output_file='schedule
                 "name": time_slot,
                 "timeRange": time_range
             })
+        
+        # Process every filled cell, slot by slot and room by room
+        cells = melt_schedule_grid(df)
+        for time_slot, room, session_title in zip(cells['slot'], cells['room'], cells['payload']):
+            # Find session details
+            session_details = find_session_by_title(title_index, session_title, presenter_index)
             
-            # Process sessions in this time slot
-            for room in df.columns[1:]:  # Skip the first column (Time Slot)
-                session_title = row[room]
-                
-                # Skip empty cells
-                if pd.isna(session_title) or session_title == '':
-                    continue
-                
-                # Find session details
-                session_details = find_session_by_title(sessions_data, session_title)
-                
-                # Add session to schedule
-                schedule["sessions"].append({
-                    "timeSlot": time_slot,
-                    "room": room,
-                    "sessionId": session_details.get("id", ""),
-                    "title": session_details.get("title", session_title),
-                    "presenter": session_details.get("presenter", ""),
-                    "description": session_details.get("description", ""),
-                    "strand": session_details.get("strand", ""),
-                    "strandName": session_details.get("strandName", ""),
-                    "type": session_details.get("type", ""),
-                    "typeName": session_details.get("typeName", ""),
-                    "tags": session_details.get("tags", [])
-                })
+            # Add session to schedule
+            schedule["sessions"].append({
+                "timeSlot": time_slot,
+                "room": room,
+                "sessionId": session_details.get("id", ""),
+                "title": session_details.get("title", session_title),
+                "presenter": session_details.get("presenter", ""),
+                "description": session_details.get("description", ""),
+                "strand": session_details.get("strand", ""),
+                "strandName": session_details.get("strandName", ""),
+                "type": session_details.get("type", ""),
+                "typeName": session_details.get("typeName", ""),
+                "tags": session_details.get("tags", [])
+            })
         
         # Write schedule to JSON file
         with open(output_file, 'w') as f:
-            json.dump(schedule, f, indent=2)
+            json_stream.dump(schedule, f, ensure_ascii=True)
         
         print(f"Schedule successfully converted to {output_file}")
         return True
@@ -1,16 +1,17 @@
 """
-This script previously updated schedule.html based on sessions.json and created schedule.json.
-It is now modified to reflect that schedule.html fetches sessions.json directly.
+Prerender the schedule.html time view from sessions.json.
+
+schedule.html fetches sessions.json (or its listing index) itself; this
+writes the time view it would build into the page as well, so the schedule
+is there on first paint (see grid_prerender.py).
 """
 
-import json
 import os
+from grid_prerender import SCHEDULE_END, SCHEDULE_START, write_schedule
+from session_model import load_sessions
 
 def main():
-    print("Ensuring schedule.html uses sessions.json directly.")
-    # This script previously generated schedule.json and modified schedule.html
-    # to use it. Since schedule.html has been updated to use sessions.json directly,
-    # this script's main role in generating schedule.json and modifying HTML is no longer needed.
+    print("Prerendering the schedule.html time view from sessions.json...")
 
     try:
         # Verify sessions.json exists
@@ -18,12 +19,16 @@ def main():
             print("Error: sessions.json not found. Please run generate_master_sessions.py first.")
             return 1
         
-        with open('sessions.json', 'r', encoding='utf-8') as f:
-            sessions = json.load(f)
+        sessions = load_sessions('sessions.json')
         print(f"Verified sessions.json. It contains {len(sessions)} sessions.")
 
-        print("Successfully verified that schedule.html should use sessions.json.")
-        print("The script update_schedule_from_json.py no longer generates schedule.json or modifies schedule.html.")
+        try:
+            count = write_schedule('schedule.html', sessions)
+        except ValueError:
+            print(f"Error: Could not find the {SCHEDULE_START} ... {SCHEDULE_END} region in schedule.html")
+            return 1
+
+        print(f"Successfully prerendered the schedule.html time view ({count} session cards)")
         
     except Exception as e:
         print(f"Error in update_schedule_from_json.py: {e}")
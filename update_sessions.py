@@ -1,24 +1,27 @@
-import json
+from session_model import load_sessions, dump_sessions
 
-# Load sessions data
-with open('sessions.json', 'r') as f:
-    sessions = json.load(f)
+def update_session_info(sessions):
+    """Apply the fixed time blocks and locations of the Ungrading and Deeper Dive sessions"""
+    for session in sessions:
+        title = session.get('title', '')
+        # Support both quoted and HTML-entity versions for backward compatibility
+        if '"Ungrading"' in title or '&quot;Ungrading&quot;' in title:
+            session['timeBlock'] = 'Slot 1 (10:15-11:15) and Slot 2 (11:30-12:30)'
+            session['location'] = 'Room G'
+            print(f"Updated session: {title}")
+        elif 'Deeper Dive' in title or 'Extended Mind' in title:
+            session['timeBlock'] = 'Slot 1 (10:15-11:15)'
+            session['location'] = 'Room A'
+            print(f"Updated session: {title}")
 
-# Update session information
-for session in sessions:
-    title = session.get('title', '')
-    # Support both quoted and HTML-entity versions for backward compatibility
-    if '"Ungrading"' in title or '&quot;Ungrading&quot;' in title:
-        session['timeBlock'] = 'Slot 1 (10:15-11:15) and Slot 2 (11:30-12:30)'
-        session['location'] = 'Room G'
-        print(f"Updated session: {title}")
-    elif 'Deeper Dive' in title or 'Extended Mind' in title:
-        session['timeBlock'] = 'Slot 1 (10:15-11:15)'
-        session['location'] = 'Room A'
-        print(f"Updated session: {title}")
+if __name__ == "__main__":
+    # Load sessions data
+    sessions = load_sessions('sessions.json')
 
-# Save updated sessions data
-with open('sessions.json', 'w') as f:
-    json.dump(sessions, f, indent=2)
+    # Update session information
+    update_session_info(sessions)
 
-print('Sessions updated successfully.')
+    # Save updated sessions data
+    dump_sessions(sessions, 'sessions.json', ensure_ascii=True)
+
+    print('Sessions updated successfully.')
@@ -0,0 +1,280 @@
+"""
+Rule engine behind verify_data_consistency.py
+
+The checks used to be loops. check_data_sources() rebuilt the CSV and Excel
+ID sets with iterrows() and looked up the title of every missing ID with a
+full-column comparison. check_sessions_json() walked sessions.json once for
+the TBD and 'anonymous' values, again for the missing titles and presenters,
+and again through the repository for the Writing Center rooms.
+
+Here the data is indexed once: SessionIndex in a single pass over
+sessions.json, SourceIndex with column operations over sessions.csv and the
+ID grid. Each check is a Rule whose check() is a set operation over one of
+those indexes and returns its findings, in sessions.json (or ID) order.
+run_rules() evaluates a list of rules and times each one, print_results()
+prints them in the lines the loops printed, and result_json() is the
+machine-readable form of a result (verify_data_consistency.py --report
+writes them).
+"""
+
+import time
+from collections import defaultdict, namedtuple
+
+import pandas as pd
+
+from schedule_grid import ID_GRID, SESSION_ID, melt_schedule_grid
+
+# Levels: issues count towards the validation result, info and ok are only reported
+ISSUE = 'issue'
+INFO = 'info'
+OK = 'ok'
+
+LABELS = {ISSUE: 'ISSUE', INFO: 'INFO', OK: 'OK'}
+
+# check(index) returns the findings, dicts with at least 'id' and 'message'
+# and, when it differs from the rule's, a 'level'. found and ok are the
+# summary lines for a rule with and without findings at its level (None for
+# no line). Findings are listed under the summary as '  - ' lines, or, for an
+# inline rule, printed with their level before it.
+Rule = namedtuple('Rule', ['name', 'level', 'found', 'ok', 'check', 'inline'], defaults=[False])
+RuleResult = namedtuple('RuleResult', ['rule', 'findings', 'seconds'])
+
+NOT_SET = ('', 'TBD')
+
+class SessionIndex:
+    """
+    The sessions.json facts the rules ask about, collected in one pass.
+
+    A placement is where an entry is held: each occurrence of a regular
+    session, or the entry itself for a special event (which carries its own
+    timeBlock and location). time_blocks and locations map each value, with
+    missing values as '', to the placements that have it.
+    """
+
+    def __init__(self, sessions):
+        self.sessions = list(sessions)
+        self.titles = []
+        self.special = set()                    # ordinals of special events
+        self.blank = defaultdict(set)           # 'title'/'presenter' -> ordinals where it is missing or ''
+        self.placements = []                    # (ordinal, occurrence number or None, placement)
+        self.time_blocks = defaultdict(set)     # timeBlock -> placement numbers
+        self.locations = defaultdict(set)       # location -> placement numbers
+
+        for ordinal, session in enumerate(self.sessions):
+            self.titles.append(session.get('title') or '')
+            for field in ('title', 'presenter'):
+                if session.get(field) in ('', None):
+                    self.blank[field].add(ordinal)
+            if session.get('isSpecialEvent'):
+                self.special.add(ordinal)
+                self._place(ordinal, None, session)
+            else:
+                for number, occurrence in enumerate(session.get('occurrences') or []):
+                    self._place(ordinal, number, occurrence)
+
+    def _place(self, ordinal, number, placement):
+        key = len(self.placements)
+        self.placements.append((ordinal, number, placement))
+        self.time_blocks[placement.get('timeBlock') or ''].add(key)
+        self.locations[placement.get('location') or ''].add(key)
+
+    def with_values(self, values, wanted):
+        """Placement numbers whose value (from time_blocks or locations) is one of wanted"""
+        return set().union(*(values.get(value, ()) for value in wanted))
+
+    def titles_containing(self, text):
+        return [ordinal for ordinal, title in enumerate(self.titles) if text in title]
+
+    def describe(self, ordinal, width=50):
+        session = self.sessions[ordinal]
+        title = session.get('title', 'Untitled Session') or ''
+        return f"ID {session.get('id', 'Unknown ID')}, {title[:width]}..."
+
+    def placement_finding(self, key, what):
+        ordinal, number, _ = self.placements[key]
+        where = 'Special Event' if number is None else f"Occurrence {number + 1}"
+        return {'id': self.sessions[ordinal].get('id'), 'occurrence': number,
+                'message': f"{what} ({where}): {self.describe(ordinal)}"}
+
+class SourceIndex:
+    """
+    The session IDs of sessions.csv and of the schedule_by_id.xlsx grid.
+
+    CSV IDs are the all-digit sessionID values, as generate_master_sessions.py
+    reads them; grid IDs are the numeric cells of the grid as
+    melt_schedule_grid() classifies them.
+    """
+
+    def __init__(self, sessions_csv, schedule_excel):
+        raw_ids = sessions_csv.get('sessionID', pd.Series(None, index=sessions_csv.index, dtype=object))
+        valid = (raw_ids.notna() & raw_ids.astype(str).str.isdigit().fillna(False)).astype(bool)
+        ids = raw_ids[valid].astype(str).astype(int)
+        if 'Session Title' in sessions_csv.columns:
+            titles = sessions_csv.loc[valid, 'Session Title']
+        else:
+            titles = pd.Series('Unknown', index=ids.index)
+        first = ~ids.duplicated()
+        self.csv_titles = dict(zip(ids[first], titles[first]))
+        self.csv_ids = set(self.csv_titles)
+
+        cells = melt_schedule_grid(schedule_excel, grid_format=ID_GRID)
+        self.excel_ids = set(cells.loc[cells['kind'] == SESSION_ID, 'session_id'].astype(int))
+
+# --- sessions.json rules ---
+
+def ungrading_session(index):
+    """
+    The first 'Ungrading' session needs Caitie Cotton and a time and room for
+    every occurrence. Each check passed is an ok finding.
+    """
+    matches = index.titles_containing("Ungrading")
+    if not matches:
+        return [{'id': None, 'level': INFO,
+                 'message': "Could not find 'Ungrading' session in sessions.json (this might be OK if not expected)."}]
+    session = index.sessions[matches[0]]
+    session_id = session.get('id')
+    presenter = session.get('presenter', '')
+    if "Caitie Cotton" not in (presenter or ''):
+        findings = [{'id': session_id, 'message': f"Ungrading session has incorrect presenter: {presenter}"}]
+    else:
+        findings = [{'id': session_id, 'level': OK, 'message': f"Ungrading session has correct presenter: {presenter}"}]
+    occurrences = session.get('occurrences') or []
+    if not occurrences:
+        findings.append({'id': session_id,
+                         'message': f"Ungrading session (ID: {session_id}) has no occurrences listed."})
+    else:
+        findings.append({'id': session_id, 'level': OK,
+                         'message': f"Ungrading session (ID: {session_id}) has {len(occurrences)} occurrence(s)."})
+    for number, occurrence in enumerate(occurrences):
+        for field, label in (('timeBlock', 'time block'), ('location', 'location')):
+            value = occurrence.get(field, '')
+            if (value or '') in NOT_SET:
+                finding = {'message': f"Ungrading session occurrence {number + 1} has missing/TBD {label}: {value}"}
+            else:
+                finding = {'level': OK, 'message': f"Ungrading session occurrence {number + 1} has {label}: {value}"}
+            findings.append({'id': session_id, 'occurrence': number, **finding})
+    return findings
+
+def writing_center_sessions(index):
+    """Regular sessions with an occurrence in a Writing Center room, each listed once"""
+    keys = index.with_values(index.locations, [room for room in index.locations if "Writing Center" in room])
+    held = defaultdict(list)        # ordinal -> its Writing Center occurrences
+    for key in sorted(keys):
+        ordinal, _, occurrence = index.placements[key]
+        if ordinal not in index.special:
+            held[ordinal].append(occurrence)
+    findings = []
+    for ordinal, occurrences in held.items():
+        session = index.sessions[ordinal]
+        details = '; '.join(f"{occ.get('timeBlock', 'No time')} at {occ.get('location', 'No location')}"
+                            for occ in occurrences)
+        title = (session.get('title') or '')[:50]
+        findings.append({'id': session.get('id'), 'message': f"ID: {session.get('id')}, Title: {title}... ({details})"})
+    return findings
+
+def unset_placements(index):
+    """Placements whose time block or location is missing or TBD"""
+    no_time = index.with_values(index.time_blocks, NOT_SET)
+    no_room = index.with_values(index.locations, NOT_SET)
+    findings = []
+    for key in sorted(no_time | no_room):
+        if key in no_time:
+            findings.append(index.placement_finding(key, "Time Block TBD/Missing"))
+        if key in no_room:
+            findings.append(index.placement_finding(key, "Location TBD/Missing"))
+    return findings
+
+def anonymous_locations(index):
+    keys = sorted(index.locations.get('anonymous', ()))
+    return [index.placement_finding(key, "Location is 'anonymous'") for key in keys]
+
+def missing_fields(index):
+    """Sessions without a title and regular sessions without a presenter, title first for each session"""
+    untitled = index.blank['title']
+    unpresented = index.blank['presenter'] - index.special
+    findings = []
+    for ordinal in sorted(untitled | unpresented):
+        session = index.sessions[ordinal]
+        session_id = session.get('id', 'Unknown ID')
+        if ordinal in untitled:
+            findings.append({'id': session_id, 'field': 'title',
+                             'message': f"Session ID {session_id} is missing a title."})
+        if ordinal in unpresented:
+            title = (session.get('title') or '')[:30]
+            findings.append({'id': session_id, 'field': 'presenter',
+                             'message': f"Regular Session ID {session_id} (Title: {title}...) is missing a presenter."})
+    return findings
+
+SESSION_RULES = [
+    Rule('ungrading_session', ISSUE, None, None, ungrading_session, inline=True),
+    Rule('writing_center_sessions', INFO,
+         "OK: Found {count} regular sessions with an occurrence in the Writing Center:",
+         "INFO: No regular sessions found with an occurrence in a Writing Center location (this might be OK).",
+         writing_center_sessions),
+    Rule('unset_placements', ISSUE, "ISSUE: Found {count} TBD or missing time/location values in sessions.json",
+         "OK: No TBD or missing time/location values found in relevant fields of sessions.json",
+         unset_placements),
+    Rule('anonymous_locations', ISSUE, "ISSUE: Found {count} 'anonymous' location values in sessions.json",
+         "OK: No 'anonymous' location values found in sessions.json", anonymous_locations),
+    Rule('missing_fields', ISSUE, "ISSUE: Found {count} missing essential fields (title/presenter).",
+         "OK: All sessions have titles, and regular sessions have presenters.", missing_fields, inline=True),
+]
+
+# --- sessions.csv / schedule_by_id.xlsx rules ---
+
+def csv_not_in_excel(index):
+    return [{'id': session_id, 'message': f"ID: {session_id}, Title: {index.csv_titles[session_id]}"}
+            for session_id in sorted(index.csv_ids - index.excel_ids)]
+
+def excel_not_in_csv(index):
+    return [{'id': session_id, 'message': f"ID: {session_id}"}
+            for session_id in sorted(index.excel_ids - index.csv_ids)]
+
+SOURCE_RULES = [
+    Rule('csv_not_in_excel', ISSUE, "WARNING: {count} sessions in CSV are not scheduled in Excel:", None,
+         csv_not_in_excel),
+    Rule('excel_not_in_csv', ISSUE, "WARNING: {count} session IDs in Excel don't exist in CSV:", None,
+         excel_not_in_csv),
+]
+
+def run_rules(rules, index):
+    """Evaluate each rule against index; returns a RuleResult per rule, in order"""
+    results = []
+    for rule in rules:
+        started = time.perf_counter()
+        findings = rule.check(index)
+        results.append(RuleResult(rule, findings, time.perf_counter() - started))
+    return results
+
+def level_of(rule, finding):
+    return finding.get('level', rule.level)
+
+def count(result):
+    """Findings of result at its rule's level"""
+    return sum(1 for finding in result.findings if level_of(result.rule, finding) == result.rule.level)
+
+def issue_count(results):
+    return sum(count(result) for result in results if result.rule.level == ISSUE)
+
+def print_results(results):
+    for result in results:
+        rule, findings = result.rule, result.findings
+        if rule.inline:
+            for finding in findings:
+                print(f"{LABELS[level_of(rule, finding)]}: {finding['message']}")
+        found = count(result)
+        summary = rule.found if found else rule.ok
+        if summary:
+            print(summary.format(count=found))
+        if not rule.inline:
+            for finding in findings:
+                print(f"  - {finding['message']}")
+
+def result_json(result):
+    return {
+        'rule': result.rule.name,
+        'level': result.rule.level,
+        'count': count(result),
+        'ms': round(result.seconds * 1000, 3),
+        'findings': result.findings,
+    }
@@ -1,8 +1,36 @@
+import argparse
 import json
+from session_model import to_json
+from session_repository import SessionRepository
 
-with open('sessions.json') as f:
-    data = json.load(f)
+parser = argparse.ArgumentParser(description="Show entries from sessions.json")
+parser.add_argument('--id', help="show the session with this id")
+parser.add_argument('--presenter', help="show the sessions this person presents")
+parser.add_argument('--tag', help="show the sessions with this tag")
+parser.add_argument('--room', help="show what is held in this room")
+parser.add_argument('--slot', help="show what is held in this time block")
+args = parser.parse_args()
+
+data = SessionRepository.load('sessions.json')
 
 print(f'Total sessions: {len(data)}')
-print('Sample entry:')
-print(json.dumps(data[0], indent=2))
+if args.id:
+    session = data.get(args.id)
+    found = [session] if session is not None else []
+elif args.presenter:
+    found = data.by_presenter(args.presenter)
+elif args.tag:
+    found = data.with_tag(args.tag)
+elif args.room or args.slot:
+    held = data.in_room(args.room) if args.room else data.in_slot(args.slot)
+    for session, occurrence in held:
+        print(f"  {occurrence.get('timeBlock')} | {occurrence.get('location')} | {session.get('id')}: {session.get('title')}")
+    found = None
+else:
+    print('Sample entry:')
+    found = data.sessions[:1]
+
+for session in found or []:
+    print(json.dumps(session, indent=2, default=to_json))
+if found == []:
+    print('No matching sessions')